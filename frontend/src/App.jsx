@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { onAuthStateChanged } from 'firebase/auth';
 import { auth } from './firebaseConfig';
 import Auth from './components/Auth/Auth';
@@ -17,6 +17,16 @@ function App() {
   const [suggestions, setSuggestions] = useState([]);
   const [isSettingsOpen, setIsSettingsOpen] = useState(false);
 
+  // Shared with Controls so replies can be reported over the same WebSocket
+  const socketRef = useRef(null);
+
+  // Let the backend add the user's reply to its conversation memory
+  const sendUserReply = (text) => {
+    if (socketRef.current && socketRef.current.readyState === WebSocket.OPEN) {
+      socketRef.current.send(JSON.stringify({ type: "user_reply", text }));
+    }
+  };
+
   useEffect(() => {
     const unsubscribe = onAuthStateChanged(auth, (currentUser) => {
       console.log("Auth state changed:", currentUser?.email || "No user");
@@ -64,6 +74,7 @@ function App() {
       console.log("App.jsx: Updated conversation after suggestion:", updated);
       return updated;
     });
+    sendUserReply(suggestionText);
     // Clear suggestions after one is selected
     setSuggestions([]);
   };
@@ -81,6 +92,7 @@ function App() {
       console.log("App.jsx: Updated conversation after user input:", updated);
       return updated;
     });
+    sendUserReply(messageText);
     // Clear suggestions, as the user has chosen their own path
     setSuggestions([]);
   };
@@ -113,6 +125,7 @@ function App() {
 
         <Controls
           user={user}
+          socketRef={socketRef}
           onNewTranscription={handleNewTranscriptPart}
           onNewSuggestions={handleNewSuggestions}
         />
@@ -1,58 +1,155 @@
 // frontend/src/components/Controls/Controls.jsx
 import React, { useState, useRef, useEffect } from 'react';
 import './Controls.css';
+import { MSGPACK_PROTOCOL, decodeFrame, msgpackSupported } from '../../services/wireProtocol';
 
-function Controls({ user, onNewTranscription, onNewSuggestions }) {
+// Offered WebSocket subprotocols, newest first; a server that echoes either
+// accepts raw binary audio frames, and with v3 it sends MessagePack frames.
+// Older servers ignore them and get base64-in-JSON audio instead.
+const BINARY_AUDIO_PROTOCOL = "signconnect.v2";
+// First frame of a reconnect that resumes the server-side session
+const RESUME_PREFIX = "resume:";
+const RECONNECT_DELAY_MS = 1000;
+// Audio chunks (1 s each) kept while reconnecting
+const MAX_PENDING_AUDIO_CHUNKS = 30;
+
+function Controls({ user, socketRef: sharedSocketRef, onNewTranscription, onNewSuggestions }) {
   const [isConnected, setIsConnected] = useState(false);
 
-  // Refs for the WebSocket, MediaRecorder, and audio stream
-  const socketRef = useRef(null);
+  // Refs for the WebSocket, MediaRecorder, and audio stream.
+  // The WebSocket ref may be owned by the parent so it can send messages too.
+  const ownSocketRef = useRef(null);
+  const socketRef = sharedSocketRef || ownSocketRef;
   const mediaRecorderRef = useRef(null);
   const audioStreamRef = useRef(null);
+  // Current interim text, rebuilt from delta-encoded interim messages
+  const interimRef = useRef("");
+  // True once the server agreed to push suggestions on final transcripts
+  const serverSuggestionsRef = useRef(false);
+  // Latest resume token from the server, and when the connection was lost
+  const resumeRef = useRef(null);
+  // Set when the user stops, so the close is not mistaken for a network drop
+  const stoppingRef = useRef(false);
+  // Audio recorded while reconnecting, sent once the session is resumed
+  const pendingAudioRef = useRef([]);
+  // Seconds to wait before retrying, when the server refused the session
+  const retryAfterRef = useRef(null);
 
   const handleStart = async () => {
     if (!user) return;
+    stoppingRef.current = false;
+    resumeRef.current = null;
+    retryAfterRef.current = null;
 
     // --- 1. Establish WebSocket Connection ---
     const token = await user.getIdToken();
+    openSocket(token, false);
+  };
+
+  const openSocket = (firstFrame, resuming) => {
     // Point directly to the backend's unsecured websocket for local dev
     const wsUrl = `ws://localhost:8000/api/ws`;
-    socketRef.current = new WebSocket(wsUrl);
+    const protocols = msgpackSupported()
+      ? [MSGPACK_PROTOCOL, BINARY_AUDIO_PROTOCOL]
+      : [BINARY_AUDIO_PROTOCOL];
+    const socket = new WebSocket(wsUrl, protocols);
+    socket.binaryType = "arraybuffer";
+    socketRef.current = socket;
 
-    socketRef.current.onopen = () => {
+    socket.onopen = () => {
       console.log("WebSocket connection established.");
-      socketRef.current.send(token);
+      socket.send(firstFrame);
       setIsConnected(true);
+      if (resuming) {
+        // Same server session and recorder: just catch up on the gap
+        const pending = pendingAudioRef.current;
+        pendingAudioRef.current = [];
+        pending.forEach(sendAudio);
+        return;
+      }
+      // Ask the server to push suggestions itself, saving a round trip per turn
+      serverSuggestionsRef.current = false;
+      socket.send(JSON.stringify({ type: "session_options", server_suggestions: true }));
 
       // --- 2. Start Audio Recording ---
       startRecording();
     };
 
-    socketRef.current.onmessage = (event) => {
+    const handleMessage = (message) => {
+      if (message.type === "final_transcript") {
+        console.log("Final transcript received:", message.data);
+        interimRef.current = "";
+        onNewTranscription(message.data); // Pass data up to App.jsx
+
+        // Request suggestions from backend, unless it pushes them itself
+        if (!serverSuggestionsRef.current && socketRef.current && socketRef.current.readyState === WebSocket.OPEN) {
+          socketRef.current.send(JSON.stringify({
+            type: "get_suggestions",
+            transcript: message.data
+          }));
+        }
+      } else if (message.type === "suggestions") {
+        console.log("Suggestions received:", message.data);
+        onNewSuggestions(message.data); // Pass data up to App.jsx
+      } else if (message.type === "heartbeat") {
+        // The server checks that the connection is still alive
+        if (socketRef.current && socketRef.current.readyState === WebSocket.OPEN) {
+          socketRef.current.send(JSON.stringify({ type: "heartbeat_ack" }));
+        }
+      } else if (message.type === "session_resume") {
+        // Lets a dropped connection pick up the same server session
+        resumeRef.current = { token: message.token, graceSeconds: message.grace_seconds, lostAt: null };
+      } else if (message.type === "reconnect") {
+        // The server is shutting down: move to a new connection
+        handOver(socket);
+      } else if (message.type === "overloaded") {
+        // The server is too busy for a new session; it says when to retry
+        retryAfterRef.current = message.retry_after_seconds;
+      } else if (message.type === "session_options") {
+        serverSuggestionsRef.current = Boolean(message.server_suggestions);
+      } else if (message.type === "flow_control") {
+        // The server's audio buffer is filling up (or has drained)
+        const recorder = mediaRecorderRef.current;
+        if (message.action === "pause" && recorder && recorder.state === "recording") {
+          recorder.pause();
+        } else if (message.action === "resume" && recorder && recorder.state === "paused") {
+          recorder.resume();
+        }
+      } else if (message.type === "interim_transcript") {
+        interimRef.current = message.data;
+        console.log("Interim transcript:", interimRef.current);
+        // You can handle interim transcripts here if needed
+      } else if (message.type === "interim_transcript_delta") {
+        // Keep the first `prefix` characters of the last interim, then append
+        interimRef.current = interimRef.current.slice(0, message.prefix) + message.data;
+        console.log("Interim transcript:", interimRef.current);
+      }
+    };
+
+    // Binary frames decode asynchronously; chained so they keep their order
+    let decoding = Promise.resolve();
+
+    socket.onmessage = (event) => {
+      if (event.data instanceof ArrayBuffer) {
+        // Protocol v3: MessagePack with short type codes, maybe compressed
+        decoding = decoding
+          .then(() => decodeFrame(event.data))
+          .then((messages) => messages.forEach(handleMessage))
+          .catch((e) => console.error("Failed to decode WebSocket frame:", e));
+        return;
+      }
       console.log("Raw WebSocket message received:", event.data);
 
       try {
         // Try to parse as JSON first (new backend format)
-        const message = JSON.parse(event.data);
-        console.log("Parsed WebSocket message:", message);
-
-        if (message.type === "final_transcript") {
-          console.log("Final transcript received:", message.data);
-          onNewTranscription(message.data); // Pass data up to App.jsx
+        const parsed = JSON.parse(event.data);
+        console.log("Parsed WebSocket message:", parsed);
 
-          // Request suggestions from backend
-          if (socketRef.current && socketRef.current.readyState === WebSocket.OPEN) {
-            socketRef.current.send(JSON.stringify({
-              type: "get_suggestions",
-              transcript: message.data
-            }));
-          }
-        } else if (message.type === "suggestions") {
-          console.log("Suggestions received:", message.data);
-          onNewSuggestions(message.data); // Pass data up to App.jsx
-        } else if (message.type === "interim_transcript") {
-          console.log("Interim transcript:", message.data);
-          // You can handle interim transcripts here if needed
+        // The server may send several queued messages in one "batch" frame
+        if (parsed.type === "batch") {
+          parsed.messages.forEach(handleMessage);
+        } else {
+          handleMessage(parsed);
         }
       } catch (e) {
         // Fallback: handle old string-based format
@@ -83,19 +180,86 @@ function Controls({ user, onNewTranscription, onNewSuggestions }) {
       }
     };
 
-    socketRef.current.onclose = () => {
-      console.log("WebSocket connection closed.");
+    socket.onclose = (event) => {
+      console.log("WebSocket connection closed.", event.code);
+      if (socketRef.current !== socket) {
+        return; // an older socket, already replaced by a reconnect
+      }
+      socketRef.current = null;
       setIsConnected(false);
+
+      if (event.code === 1013 && retryAfterRef.current !== null && !stoppingRef.current) {
+        // Refused while the server is overloaded: try again when it says
+        const delay = retryAfterRef.current * 1000;
+        resumeRef.current = null;
+        pendingAudioRef.current = [];
+        stopRecordingCleanup();
+        setTimeout(() => {
+          if (!stoppingRef.current) {
+            handleStart();
+          }
+        }, delay);
+        return;
+      }
+
+      const resume = resumeRef.current;
+      if (!stoppingRef.current && resume && mediaRecorderRef.current) {
+        resume.lostAt = resume.lostAt || Date.now();
+        const withinGrace = Date.now() - resume.lostAt < resume.graceSeconds * 1000;
+        // 1000: the server ended the session (e.g. idle); 1008: it has no session to resume
+        if (event.code !== 1000 && event.code !== 1008 && withinGrace) {
+          // Network drop: resume the session, keeping the recorder running
+          setTimeout(() => {
+            if (!stoppingRef.current) {
+              openSocket(RESUME_PREFIX + resume.token, true);
+            }
+          }, RECONNECT_DELAY_MS);
+          return;
+        }
+        if (event.code === 1008) {
+          // The server no longer has the session: start a fresh one
+          resumeRef.current = null;
+          pendingAudioRef.current = [];
+          stopRecordingCleanup();
+          handleStart();
+          return;
+        }
+      }
+      resumeRef.current = null;
+      pendingAudioRef.current = [];
       stopRecordingCleanup(); // Ensure recorder is stopped if connection closes
-      socketRef.current = null;
     };
 
-    socketRef.current.onerror = (error) => {
+    socket.onerror = (error) => {
       console.error("WebSocket error:", error);
       setIsConnected(false);
     };
   };
 
+  const handOver = (oldSocket) => {
+    const finish = () => {
+      // Our last audio went out on the old socket; the server finishes its
+      // transcripts there and closes it, while we start a new session
+      if (oldSocket.readyState === WebSocket.OPEN) {
+        oldSocket.send(JSON.stringify({ type: "reconnect_ack" }));
+      }
+      if (!stoppingRef.current) {
+        handleStart();
+      }
+    };
+    const recorder = mediaRecorderRef.current;
+    resumeRef.current = null;
+    pendingAudioRef.current = [];
+    if (recorder && recorder.state !== "inactive") {
+      // The new session needs a new recording (and WebM header)
+      recorder.addEventListener('stop', finish, { once: true });
+      stopRecordingCleanup();
+    } else {
+      stopRecordingCleanup();
+      finish();
+    }
+  };
+
   const startRecording = async () => {
     try {
       audioStreamRef.current = await navigator.mediaDevices.getUserMedia({ audio: true });
@@ -108,17 +272,22 @@ function Controls({ user, onNewTranscription, onNewSuggestions }) {
 
     mediaRecorderRef.current = new MediaRecorder(audioStreamRef.current, {
       mimeType: 'audio/webm;codecs=opus',
+      // A fixed variable bitrate lets the server tell silence from speech by
+      // chunk size (silence encodes to far fewer bytes).
+      audioBitsPerSecond: 32000,
+      audioBitrateMode: 'variable',
     });
 
     mediaRecorderRef.current.addEventListener('dataavailable', (event) => {
-      if (event.data.size > 0 && socketRef.current && socketRef.current.readyState === WebSocket.OPEN) {
-        const reader = new FileReader();
-        reader.onloadend = () => {
-          const base64String = reader.result.split(',')[1];
-          const message = JSON.stringify({ type: "audio", data: base64String });
-          socketRef.current.send(message);
-        };
-        reader.readAsDataURL(event.data);
+      if (event.data.size === 0) return;
+      if (socketRef.current && socketRef.current.readyState === WebSocket.OPEN) {
+        sendAudio(event.data);
+      } else if (resumeRef.current && !stoppingRef.current) {
+        // Reconnecting: keep the chunk for the resumed session
+        pendingAudioRef.current.push(event.data);
+        if (pendingAudioRef.current.length > MAX_PENDING_AUDIO_CHUNKS) {
+          pendingAudioRef.current.shift();
+        }
       }
     });
 
@@ -126,6 +295,22 @@ function Controls({ user, onNewTranscription, onNewSuggestions }) {
     console.log("MediaRecorder started.");
   };
 
+  const sendAudio = (chunk) => {
+    const socket = socketRef.current;
+    if (socket.protocol === BINARY_AUDIO_PROTOCOL || socket.protocol === MSGPACK_PROTOCOL) {
+      // Send the chunk as a binary frame, no encoding needed
+      socket.send(chunk);
+      return;
+    }
+    const reader = new FileReader();
+    reader.onloadend = () => {
+      const base64String = reader.result.split(',')[1];
+      const message = JSON.stringify({ type: "audio", data: base64String });
+      socket.send(message);
+    };
+    reader.readAsDataURL(chunk);
+  };
+
   const stopRecordingCleanup = () => {
     if (mediaRecorderRef.current && mediaRecorderRef.current.state !== "inactive") {
       mediaRecorderRef.current.stop();
@@ -140,17 +325,22 @@ function Controls({ user, onNewTranscription, onNewSuggestions }) {
   }
 
   const handleStop = () => {
+    stoppingRef.current = true;
+    resumeRef.current = null;
+    pendingAudioRef.current = [];
     stopRecordingCleanup();
     if (socketRef.current) {
-      socketRef.current.close();
+      // A normal closure tells the server not to keep the session for a resume
+      socketRef.current.close(1000);
     }
   };
 
   // Cleanup effect for when the component unmounts
   useEffect(() => {
     return () => {
+      stoppingRef.current = true;
       if (socketRef.current) {
-        socketRef.current.close();
+        socketRef.current.close(1000);
       }
       stopRecordingCleanup();
     };
@@ -0,0 +1,133 @@
+// frontend/src/services/wireProtocol.js
+// Decoding of protocol v3 frames: MessagePack with short type codes,
+// mirroring MESSAGE_CODES in src/signconnect/services/protocol.py.
+
+export const MSGPACK_PROTOCOL = "signconnect.v3";
+
+const GENERIC_CODE = 0;
+const BATCH_CODE = 1;
+// Type code -> [message type, positional fields]
+const MESSAGE_TYPES = {
+  2: ["interim_transcript", ["data"]],
+  3: ["interim_transcript_delta", ["prefix", "data"]],
+  4: ["final_transcript", ["data"]],
+  5: ["suggestions", ["data"]],
+  6: ["flow_control", ["action"]],
+  7: ["heartbeat", []],
+  8: ["session_resume", ["token", "grace_seconds"]],
+  9: ["session_options", ["server_suggestions"]],
+  10: ["pong", ["data"]],
+  11: ["reconnect", ["reason"]],
+};
+
+// Compressed frames need DecompressionStream; without it, stay on v2
+export const msgpackSupported = () => typeof DecompressionStream !== "undefined";
+
+const textDecoder = new TextDecoder();
+
+// Decodes the MessagePack value at the start of `bytes` (a Uint8Array).
+// Covers what the server sends: no extension types.
+const unpack = (bytes) => {
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  let offset = 0;
+
+  const take = (length) => {
+    const slice = bytes.subarray(offset, offset + length);
+    offset += length;
+    return slice;
+  };
+  const str = (length) => textDecoder.decode(take(length));
+  const array = (length) => {
+    const items = [];
+    for (let i = 0; i < length; i++) items.push(read());
+    return items;
+  };
+  const map = (length) => {
+    const result = {};
+    for (let i = 0; i < length; i++) {
+      const key = read();
+      result[key] = read();
+    }
+    return result;
+  };
+  const uint = (size) => {
+    const value = size === 1 ? view.getUint8(offset)
+      : size === 2 ? view.getUint16(offset)
+      : size === 4 ? view.getUint32(offset)
+      : Number(view.getBigUint64(offset));
+    offset += size;
+    return value;
+  };
+  const int = (size) => {
+    const value = size === 1 ? view.getInt8(offset)
+      : size === 2 ? view.getInt16(offset)
+      : size === 4 ? view.getInt32(offset)
+      : Number(view.getBigInt64(offset));
+    offset += size;
+    return value;
+  };
+
+  const read = () => {
+    const byte = bytes[offset++];
+    if (byte <= 0x7f) return byte;
+    if (byte <= 0x8f) return map(byte & 0x0f);
+    if (byte <= 0x9f) return array(byte & 0x0f);
+    if (byte <= 0xbf) return str(byte & 0x1f);
+    if (byte >= 0xe0) return byte - 0x100;
+    switch (byte) {
+      case 0xc0: return null;
+      case 0xc2: return false;
+      case 0xc3: return true;
+      case 0xc4: return take(uint(1));
+      case 0xc5: return take(uint(2));
+      case 0xc6: return take(uint(4));
+      case 0xca: { const value = view.getFloat32(offset); offset += 4; return value; }
+      case 0xcb: { const value = view.getFloat64(offset); offset += 8; return value; }
+      case 0xcc: return uint(1);
+      case 0xcd: return uint(2);
+      case 0xce: return uint(4);
+      case 0xcf: return uint(8);
+      case 0xd0: return int(1);
+      case 0xd1: return int(2);
+      case 0xd2: return int(4);
+      case 0xd3: return int(8);
+      case 0xd9: return str(uint(1));
+      case 0xda: return str(uint(2));
+      case 0xdb: return str(uint(4));
+      case 0xdc: return array(uint(2));
+      case 0xdd: return array(uint(4));
+      case 0xde: return map(uint(2));
+      case 0xdf: return map(uint(4));
+      default: throw new Error(`Unsupported MessagePack type 0x${byte.toString(16)}`);
+    }
+  };
+
+  return read();
+};
+
+const inflate = async (bytes) => {
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("deflate-raw"));
+  return new Uint8Array(await new Response(stream).arrayBuffer());
+};
+
+const toMessage = (value) => {
+  if (value[0] === GENERIC_CODE) return value[1];
+  const [type, fields] = MESSAGE_TYPES[value[0]];
+  const message = { type };
+  fields.forEach((field, i) => { message[field] = value[i + 1]; });
+  return message;
+};
+
+// Returns the messages in a binary frame (an ArrayBuffer), decompressing it
+// and unpacking batches.
+export const decodeFrame = async (data) => {
+  let value = unpack(new Uint8Array(data));
+  if (value instanceof Uint8Array) {
+    // Large frames arrive deflated, wrapped in a MessagePack bin
+    value = unpack(await inflate(value));
+  }
+  if (value[0] === BATCH_CODE) {
+    return value.slice(1).map(toMessage);
+  }
+  return [toMessage(value)];
+};
@@ -0,0 +1,37 @@
+"""Add precomputed suggestions to scenario questions
+
+Revision ID: 3f1c2a9d7e41
+Revises: b5e40b083a75
+Create Date: 2026-10-19 09:12:44.512093
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a9d7e41"
+down_revision: Union[str, Sequence[str], None] = "b5e40b083a75"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "scenario_questions",
+        sa.Column(
+            "precomputed_suggestions",
+            postgresql.ARRAY(sa.String()),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("scenario_questions", "precomputed_suggestions")
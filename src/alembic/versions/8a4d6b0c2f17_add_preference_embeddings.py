@@ -0,0 +1,38 @@
+"""Add embeddings to user preferences
+
+Revision ID: 8a4d6b0c2f17
+Revises: 3f1c2a9d7e41
+Create Date: 2026-10-19 10:31:07.884215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import pgvector.sqlalchemy
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4d6b0c2f17"
+down_revision: Union[str, Sequence[str], None] = "3f1c2a9d7e41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows are embedded lazily the first time they are read.
+    op.add_column(
+        "user_preferences",
+        sa.Column(
+            "preference_embedding",
+            pgvector.sqlalchemy.vector.VECTOR(dim=384),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("user_preferences", "preference_embedding")
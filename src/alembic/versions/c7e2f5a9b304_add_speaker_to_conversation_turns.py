@@ -0,0 +1,31 @@
+"""Add speaker to conversation turns
+
+Revision ID: c7e2f5a9b304
+Revises: 8a4d6b0c2f17
+Create Date: 2026-10-19 11:02:51.230418
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e2f5a9b304"
+down_revision: Union[str, Sequence[str], None] = "8a4d6b0c2f17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "conversation_turns", sa.Column("speaker", sa.String(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("conversation_turns", "speaker")
@@ -0,0 +1,36 @@
+"""Add silence gating settings to users
+
+Revision ID: d4f8a1b6e925
+Revises: c7e2f5a9b304
+Create Date: 2026-10-19 12:14:05.418270
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4f8a1b6e925"
+down_revision: Union[str, Sequence[str], None] = "c7e2f5a9b304"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users", sa.Column("silence_gating_enabled", sa.Boolean(), nullable=True)
+    )
+    op.add_column(
+        "users",
+        sa.Column("silence_threshold_bytes_per_second", sa.Float(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "silence_threshold_bytes_per_second")
+    op.drop_column("users", "silence_gating_enabled")
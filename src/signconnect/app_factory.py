@@ -13,8 +13,18 @@ from .core.config import Settings
 # Import the new logging configuration function
 from .core.logging import configure_logging
 from .dependencies import get_db as get_db_dependency
-from .routers import firebase, questions, scenarios, users, websockets
+from .routers import firebase, metrics, questions, scenarios, users, websockets
+from .llm.circuit_breaker import CircuitBreaker
 from .llm.client import GeminiClient
+from .llm.fake import FakeLLMClient
+from .services.speech_pool import SpeechClientPool
+from .services.admission import AdmissionController
+from .services.backplane import create_backplane
+from .services.drain import ShutdownDrain
+from .services.session_resume import ResumeRegistry
+from .services.websocket_manager import ConnectionManager
+from .stt.backends import create_speech_backend
+from .services.suggestion_pregen import SuggestionPregenerator
 
 
 # Configure logging right at the start
@@ -51,7 +61,18 @@ async def lifespan(app: FastAPI):
     Handles application startup and shutdown events.
     """
     logger.info("Application starting up...")
+    await app.state.speech_backend.start()
+    await app.state.suggestion_pregenerator.start()
+    await app.state.connection_manager.start()
+    await app.state.admission.start()
+    app.state.shutdown_drain.install()
     yield
+    # Normally done on SIGTERM already, before uvicorn closed the websockets
+    await app.state.shutdown_drain.drain()
+    await app.state.admission.close()
+    await app.state.connection_manager.close()
+    await app.state.suggestion_pregenerator.stop()
+    await app.state.speech_backend.close()
     logger.info("Application shutting down.")
 
 
@@ -71,7 +92,13 @@ def create_app(settings: Settings, testing: bool = False) -> FastAPI:
     # Base.metadata.create_all(bind=engine) MOVING TO ALEMCIB
 
     # Initialize the LLM client
-    llm_client = GeminiClient(api_key=settings.GEMINI_API_KEY.get_secret_value())
+    if settings.LLM_BACKEND == "fake":
+        llm_client = FakeLLMClient(latency_seconds=settings.FAKE_LLM_LATENCY_SECONDS)
+    else:
+        llm_client = GeminiClient(api_key=settings.GEMINI_API_KEY.get_secret_value())
+
+    if settings.LOAD_TEST_AUTH_TOKEN is not None:
+        logger.warning("Load-test websocket authentication is enabled.")
 
     app = FastAPI(
         lifespan=None if testing else lifespan, title="SignConnect API", version="0.1.0"
@@ -79,6 +106,55 @@ def create_app(settings: Settings, testing: bool = False) -> FastAPI:
 
     # Store the client on the app state for easy access via dependencies
     app.state.llm_client = llm_client
+    app.state.settings = settings
+    # Session factory for work running outside a request's DB session
+    app.state.session_factory = SessionLocal
+    # Shared by every connection on this worker: provider health is global
+    app.state.llm_breaker = CircuitBreaker(
+        window_size=settings.LLM_BREAKER_WINDOW_SIZE,
+        failure_rate_threshold=settings.LLM_BREAKER_FAILURE_RATE,
+        latency_slo_seconds=settings.LLM_BREAKER_LATENCY_SLO_SECONDS,
+        open_seconds=settings.LLM_BREAKER_OPEN_SECONDS,
+        probe_interval_seconds=settings.LLM_BREAKER_PROBE_INTERVAL_SECONDS,
+    )
+
+    # Registry of this worker's websocket connections and their outbound
+    # queues, linked to the other workers through the backplane
+    app.state.connection_manager = ConnectionManager.from_settings(
+        settings, backplane=create_backplane(settings)
+    )
+
+    # Refuses new sessions while this worker is overloaded. Parked sessions
+    # stay registered with the manager, so they count too.
+    connection_manager = app.state.connection_manager
+    app.state.admission = AdmissionController.from_settings(
+        settings, session_count=lambda: len(connection_manager)
+    )
+
+    # Sessions waiting for their client to reconnect
+    app.state.resume_registry = ResumeRegistry(
+        grace_seconds=settings.SESSION_RESUME_GRACE_SECONDS
+    )
+
+    # Hands sessions over to other workers before this one shuts down
+    app.state.shutdown_drain = ShutdownDrain.from_settings(
+        settings,
+        connection_manager,
+        app.state.resume_registry,
+        app.state.admission,
+    )
+
+    # Speech clients shared by all connections; channels open in the lifespan
+    app.state.speech_pool = SpeechClientPool(size=settings.SPEECH_CLIENT_POOL_SIZE)
+    # Speech-to-text engine selected by settings (Google, offline or fake)
+    app.state.speech_backend = create_speech_backend(settings, pool=app.state.speech_pool)
+
+    # Background job that pre-generates suggestions for stored questions
+    app.state.suggestion_pregenerator = SuggestionPregenerator(
+        session_factory=SessionLocal,
+        llm_client=llm_client,
+        requests_per_minute=settings.SUGGESTION_PREGEN_RATE_PER_MINUTE,
+    )
 
     def get_db_override():
         """Dependency override for getting a DB session."""
@@ -111,5 +187,6 @@ def create_app(settings: Settings, testing: bool = False) -> FastAPI:
     app.include_router(questions.router)
     app.include_router(websockets.router)
     app.include_router(firebase.router)
+    app.include_router(metrics.router)
 
     return app
@@ -3,7 +3,7 @@ from functools import lru_cache
 
 from pydantic import PostgresDsn, computed_field, SecretStr, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -39,6 +39,193 @@ class Settings(BaseSettings):
     # Environment identifier for Sentry (e.g., "development", "production")
     SENTRY_ENVIRONMENT: str = "development"
 
+    # --- Suggestion Pre-generation ---
+    # Upper bound on Gemini calls per minute made by the background job that
+    # pre-generates suggestions for stored scenario questions.
+    SUGGESTION_PREGEN_RATE_PER_MINUTE: int = 30
+    # Maximum pgvector L2 distance between a transcript and a stored question
+    # for the question's pre-generated suggestions to be served directly.
+    SUGGESTION_PREGEN_MATCH_DISTANCE: float = 0.6
+
+    # --- Preference Selection ---
+    # Maximum number of preferences injected into a suggestion prompt.
+    PREFERENCE_TOP_K: int = 5
+    # Approximate token budget for the injected preferences.
+    PREFERENCE_TOKEN_BUDGET: int = 200
+    # How long a connection reuses its cached preference embeddings before
+    # reloading them, so edits made mid-session are picked up.
+    PREFERENCE_CACHE_TTL_SECONDS: float = 60.0
+
+    # --- Conversation Memory ---
+    # Number of recent turns kept verbatim in a session's prompt context.
+    CONVERSATION_MEMORY_TURNS: int = 6
+    # Approximate token cap for the rolling summary of older turns.
+    CONVERSATION_SUMMARY_MAX_TOKENS: int = 150
+    # Evicted turns folded into the summary per summarizer call.
+    CONVERSATION_SUMMARY_BATCH_TURNS: int = 4
+
+    # --- Prompt Caching ---
+    # Smallest stable prompt prefix, in estimated tokens, for which a session
+    # creates a provider-side context cache. Gemini rejects smaller caches, and
+    # a typical profile is a few hundred tokens, so explicit caching is in
+    # effect opt-in for very large profiles; everyone else relies on the
+    # stable prefix layout for the provider's implicit caching.
+    PROMPT_CACHE_MIN_TOKENS: int = 4096
+    # Provider-side lifetime of a session's cache if it is never deleted.
+    PROMPT_CACHE_TTL_SECONDS: int = 3600
+
+    # --- LLM Latency Budget and Circuit Breaker ---
+    # Hard limit on how long a user waits for live suggestions before the
+    # local fallback is sent instead.
+    SUGGESTION_TIMEOUT_SECONDS: float = 4.0
+    # Calls slower than this count as failures for the circuit breaker.
+    LLM_BREAKER_LATENCY_SLO_SECONDS: float = 2.5
+    # Failure fraction over the rolling window at which the breaker opens.
+    LLM_BREAKER_FAILURE_RATE: float = 0.5
+    LLM_BREAKER_WINDOW_SIZE: int = 20
+    # Cool-down before an open breaker starts probing, and probe spacing.
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0
+    LLM_BREAKER_PROBE_INTERVAL_SECONDS: float = 5.0
+
+    # --- Audio Buffering ---
+    # Per-connection cap on audio waiting for speech-to-text, in bytes and in
+    # seconds the oldest chunk has been waiting.
+    AUDIO_BUFFER_MAX_BYTES: int = 512 * 1024
+    AUDIO_BUFFER_MAX_SECONDS: float = 10.0
+    # What to do when the cap is hit: drop the oldest audio, or ask the
+    # client to pause (dropping only past twice the cap).
+    AUDIO_OVERFLOW_POLICY: Literal["drop_oldest", "pause"] = "drop_oldest"
+
+    # --- Speech-to-Text ---
+    # Engine used for transcription: Google Cloud streaming, the offline
+    # Vosk recognizer (needs `vosk`, a model and ffmpeg), or a scripted fake.
+    STT_BACKEND: Literal["google", "local", "fake"] = "google"
+    STT_LANGUAGE_CODE: str = "en-US"
+    # Vosk model directory and the PCM sample rate it expects.
+    STT_LOCAL_MODEL_PATH: Optional[str] = None
+    STT_LOCAL_SAMPLE_RATE: int = 16000
+    # Text the fake backend reveals word by word, and the delay per word.
+    STT_FAKE_TRANSCRIPT: str = "hello how are you doing today"
+    STT_FAKE_WORD_INTERVAL_SECONDS: float = 0.2
+    # Number of shared Speech clients (one gRPC channel each) per worker.
+    SPEECH_CLIENT_POOL_SIZE: int = 2
+    # A streaming call is rotated to a fresh one after this long, safely
+    # under Google's ~5 minute per-stream limit.
+    STT_STREAM_MAX_SECONDS: float = 280.0
+    # Recent audio kept for replay into a new stream after a rotation or error.
+    STT_REPLAY_SECONDS: float = 10.0
+    # Consecutive stream failures tolerated before transcription gives up.
+    STT_MAX_CONSECUTIVE_ERRORS: int = 5
+    # Audio chunks already queued are joined into one streaming request of
+    # at most this many bytes, waiting at most the delay for more to arrive.
+    STT_AGGREGATE_MAX_BYTES: int = 64 * 1024
+    STT_AGGREGATE_MAX_DELAY_SECONDS: float = 0.0
+
+    # --- Silence Gating ---
+    # Keep silence from being streamed to (and billed by) speech-to-text.
+    # Users can override the switch and the threshold in their speech settings.
+    STT_SILENCE_GATING_ENABLED: bool = True
+    # Opus byte rate below which a chunk counts as silence.
+    STT_SILENCE_THRESHOLD_BYTES_PER_SECOND: float = 1500.0
+    # How long audio keeps being forwarded after the last speech.
+    STT_SILENCE_HANGOVER_SECONDS: float = 1.5
+
+    # --- Transcript Delivery ---
+    # Minimum time between interim transcript messages to a client; only the
+    # newest interim is sent once the interval has passed. Finals are immediate.
+    INTERIM_MIN_INTERVAL_SECONDS: float = 0.25
+    # Send interims as a common-prefix length plus the new suffix.
+    INTERIM_DELTA_ENCODING: bool = False
+    # Push suggestions on every final transcript without waiting for a
+    # get_suggestions request. Clients opt in per session with a
+    # session_options message; this is the default for new sessions.
+    SERVER_SUGGESTIONS_DEFAULT: bool = False
+
+    # --- Outbound Queue ---
+    # Messages to each client wait in a bounded queue drained by one writer.
+    # Queued interims are dropped first when it fills; a client whose queue
+    # overflows anyway, or whose single send takes longer than the timeout,
+    # is disconnected.
+    OUTBOUND_QUEUE_MAX_MESSAGES: int = 256
+    OUTBOUND_SEND_TIMEOUT_SECONDS: float = 5.0
+    # Most queued messages sent together in one "batch" frame (protocol v2).
+    OUTBOUND_MAX_BATCH: int = 16
+
+    # --- Wire Protocol ---
+    # Offer protocol v3 (MessagePack messages with short type codes) to
+    # clients that ask for it; needs the optional msgpack package.
+    WS_MSGPACK_ENABLED: bool = True
+    # Protocol v3 frames of these message classes are deflate-compressed
+    # when at least WS_COMPRESSION_MIN_BYTES long (0 disables). Audio is
+    # never compressed, so run uvicorn with --ws-per-message-deflate false.
+    WS_COMPRESSED_MESSAGE_CLASSES: List[Literal["transcript", "suggestions", "control"]] = [
+        "transcript",
+        "suggestions",
+        "control",
+    ]
+    WS_COMPRESSION_MIN_BYTES: int = 256
+
+    # --- Backplane ---
+    # Links the connection managers of all workers so per-user sends,
+    # broadcasts and presence span processes. "memory" keeps them within
+    # this worker; run more than one worker with "redis".
+    BACKPLANE: Literal["memory", "redis"] = "memory"
+    BACKPLANE_REDIS_URL: str = "redis://localhost:6379/0"
+    # A worker that dies stops counting users as online after this long.
+    BACKPLANE_PRESENCE_TTL_SECONDS: float = 30.0
+
+    # --- Session Resumption ---
+    # After an unexpected disconnect a session (speech stream, audio buffer,
+    # conversation state, queued messages) is kept this long for the client
+    # to reconnect with its resume token. 0 disables resumption.
+    SESSION_RESUME_GRACE_SECONDS: float = 30.0
+
+    # --- Heartbeat and Idle Reaping ---
+    # The server sends a heartbeat after this much silence from the client,
+    # and closes connections it has not heard from for the timeout (e.g.
+    # half-open TCP connections); those sessions are parked for resumption.
+    WS_HEARTBEAT_INTERVAL_SECONDS: float = 15.0
+    WS_HEARTBEAT_TIMEOUT_SECONDS: float = 45.0
+    # Sessions with no audio or messages for this long are closed; 0 disables.
+    WS_IDLE_TIMEOUT_SECONDS: float = 600.0
+
+    # --- Admission Control ---
+    # New websocket sessions are refused, with a retry hint, while any of
+    # these limits is reached (0 disables a limit). The load score at
+    # /api/load and in the metrics is the highest fraction of a limit in use.
+    ADMISSION_MAX_SESSIONS: int = 500
+    ADMISSION_MAX_PENDING_LLM_REQUESTS: int = 64
+    ADMISSION_MAX_LOOP_LAG_SECONDS: float = 0.5
+    # Refused clients are told to retry after this long, plus jitter.
+    ADMISSION_RETRY_AFTER_SECONDS: float = 5.0
+
+    # --- Shutdown Drain ---
+    # On SIGTERM, connected clients are asked to reconnect (to another
+    # worker) while their transcripts, suggestions and pending writes are
+    # finished, all within this deadline. Keep it below the orchestrator's
+    # termination grace period.
+    DRAIN_TIMEOUT_SECONDS: float = 20.0
+
+    # --- Message Dispatch ---
+    # Control messages are handled off the receive loop so audio keeps being
+    # read while, e.g., suggestions are generated. Handlers of one connection
+    # run at most this many at once (one per lane: suggestions, control).
+    MESSAGE_HANDLER_MAX_CONCURRENCY: int = 2
+    # Messages waiting per lane; the oldest is dropped beyond this.
+    MESSAGE_LANE_MAX_PENDING: int = 16
+
+    # --- Load Testing ---
+    # Directory where inbound websocket traffic is recorded for replay.
+    # Recording is off unless this is set.
+    SESSION_RECORDING_DIR: Optional[str] = None
+    # "fake" answers suggestions with canned text after a fixed delay.
+    LLM_BACKEND: Literal["gemini", "fake"] = "gemini"
+    FAKE_LLM_LATENCY_SECONDS: float = 0.3
+    # When set, websocket tokens of the form "<this secret>:<n>" authenticate
+    # as synthetic load-test users instead of being verified with Firebase.
+    # Never set this in production.
+    LOAD_TEST_AUTH_TOKEN: Optional[SecretStr] = None
+
     @computed_field
     @property
     def DATABASE_URL(self) -> PostgresDsn:
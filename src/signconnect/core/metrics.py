@@ -0,0 +1,134 @@
+# src/signconnect/core/metrics.py
+
+import threading
+from typing import Dict, List, Tuple
+
+# Label values are stored as a sorted tuple of (name, value) pairs.
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in key) + "}"
+
+
+class _Metric:
+    """
+    Base class for a named metric holding one value per label set.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def value(self, **labels: str) -> float:
+        """
+        Returns the current value for the given labels (0 if never set).
+        """
+        return self._values.get(_label_key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        """
+        Renders the metric in the Prometheus text exposition format.
+        """
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = dict(self._values) or {(): 0.0}
+        for key, value in values.items():
+            lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return lines
+
+    def _add(self, amount: float, labels: Dict[str, str]) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Counter(_Metric):
+    """
+    A monotonically increasing count, e.g. of dropped audio chunks.
+    """
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        Increments the counter.
+        """
+        self._add(amount, labels)
+
+
+class Gauge(_Metric):
+    """
+    A value that can go up and down, e.g. bytes currently buffered.
+    """
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        Increases the gauge.
+        """
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        """
+        Decreases the gauge.
+        """
+        self._add(-amount, labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        """
+        Sets the gauge to an absolute value.
+        """
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+
+class MetricsRegistry:
+    """
+    Holds the process's metrics and renders them for scraping.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, description: str) -> Counter:
+        """
+        Returns the counter with this name, creating it if needed.
+        """
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        """
+        Returns the gauge with this name, creating it if needed.
+        """
+        return self._get_or_create(Gauge, name, description)
+
+    def render(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, cls, name: str, description: str):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, description)
+        return metric
+
+
+# The process-wide registry exposed at /api/metrics.
+REGISTRY = MetricsRegistry()
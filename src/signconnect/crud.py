@@ -1,4 +1,5 @@
 import uuid
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sentence_transformers import SentenceTransformer
 from .db import models
@@ -10,6 +11,18 @@ from . import schemas, db
 embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
 
 
+def embed_text(text: str):
+    """
+    Generates the vector embedding for a piece of text.
+
+    Callers that run several vector queries for the same text should embed it
+    once and pass the result along.
+    :param text:
+    :return:
+    """
+    return embedding_model.encode(text)
+
+
 # --- User CRUD ---
 
 def get_user(db: Session, user_id: uuid.UUID) -> models.User | None:
@@ -30,6 +43,23 @@ def get_user_by_email(db: Session, email: str) -> models.User | None:
     """
     return db.query(models.User).filter(models.User.email == email).first()
 
+def update_user_speech_settings(
+    db: Session, *, user: models.User, settings_update: schemas.SpeechSettingsUpdate
+) -> models.User:
+    """
+    Updates a user's speech-to-text settings. Fields set to None fall back to
+    the server defaults.
+    :param db:
+    :param user:
+    :param settings_update:
+    :return:
+    """
+    for key, value in settings_update.model_dump(exclude_unset=True).items():
+        setattr(user, key, value)
+    db.commit()
+    db.refresh(user)
+    return user
+
 # --- User Preference CRUD ---
 
 def get_user_preferences(db: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100) -> list[models.UserPreference]:
@@ -71,31 +101,108 @@ def create_user_preference(db: Session, preference: schemas.UserPreferenceCreate
     :param user_id:
     :return:
     """
-    db_preference = models.UserPreference(**preference.model_dump(), user_id=user_id)
+    db_preference = models.UserPreference(
+        **preference.model_dump(),
+        user_id=user_id,
+        preference_embedding=embed_text(preference.preference_text)
+    )
     db.add(db_preference)
     db.commit()
     db.refresh(db_preference)
     return db_preference
 
+def get_user_preferences_with_embeddings(db: Session, user_id: uuid.UUID) -> list[models.UserPreference]:
+    """
+    Retrieves all preferences for a user with their embeddings populated.
+
+    Preferences stored before embeddings were introduced are embedded and
+    saved on first access.
+    :param db:
+    :param user_id:
+    :return:
+    """
+    preferences = db.query(models.UserPreference).filter(models.UserPreference.user_id == user_id).all()
+
+    missing = [pref for pref in preferences if pref.preference_embedding is None]
+    if missing:
+        embeddings = embedding_model.encode([pref.preference_text for pref in missing])
+        for pref, embedding in zip(missing, embeddings):
+            pref.preference_embedding = embedding
+            db.add(pref)
+        db.commit()
+
+    return preferences
+
 # --- Conversation Turn CRUD ---
-def create_conversation_turn(db: Session, turn: schemas.ConversationTurnCreate, user_id: uuid.UUID) -> models.ConversationTurn:
+def create_conversation(db: Session, user_id: uuid.UUID) -> models.Conversation:
     """
-    Creates a new conversation turn record for a user.
+    Creates a new conversation record for a user.
     :param db:
-    :param turn:
     :param user_id:
     :return:
     """
+    db_conversation = models.Conversation(user_id=user_id)
+    db.add(db_conversation)
+    db.commit()
+    db.refresh(db_conversation)
+    return db_conversation
 
-    # this function assumes a conversation model exists and you'd link to it.
-    # for now, let's simplify and link directly to the user.
-    db_turn = models.ConversationTurn(**turn.model_dump(), user_id=user_id)
+def create_conversation_turns(
+    db: Session, turns: list[schemas.ConversationTurnCreate], conversation_id: uuid.UUID
+) -> list[models.ConversationTurn]:
+    """
+    Creates several conversation turn records in a single transaction.
+    :param db:
+    :param turns:
+    :param conversation_id:
+    :return:
+    """
+    db_turns = [
+        models.ConversationTurn(**turn.model_dump(), conversation_id=conversation_id)
+        for turn in turns
+    ]
+    db.add_all(db_turns)
+    db.commit()
+    return db_turns
+
+def create_conversation_turn(db: Session, turn: schemas.ConversationTurnCreate, conversation_id: uuid.UUID) -> models.ConversationTurn:
+    """
+    Creates a new conversation turn record within a conversation.
+    :param db:
+    :param turn:
+    :param conversation_id:
+    :return:
+    """
+    db_turn = models.ConversationTurn(**turn.model_dump(), conversation_id=conversation_id)
     db.add(db_turn)
     db.commit()
     db.refresh(db_turn)
     return db_turn
 
 
+def get_frequent_user_replies(db: Session, user_id: uuid.UUID, limit: int = 3) -> list[str]:
+    """
+    Retrieves the replies a user has sent most often across their conversations.
+    :param db:
+    :param user_id:
+    :param limit:
+    :return:
+    """
+    rows = (
+        db.query(models.ConversationTurn.transcribed_text, func.count().label("uses"))
+        .join(models.Conversation, models.ConversationTurn.conversation_id == models.Conversation.id)
+        .filter(
+            models.Conversation.user_id == user_id,
+            models.ConversationTurn.speaker == "user",
+        )
+        .group_by(models.ConversationTurn.transcribed_text)
+        .order_by(func.count().desc())
+        .limit(limit)
+        .all()
+    )
+    return [text for text, _ in rows]
+
+
 # --- Scenario and ScenarioQuestion CRUD ---
 
 def create_scenario(db: Session, scenario: schemas.ScenarioCreate, user_id: uuid.UUID) -> models.Scenario:
@@ -145,20 +252,40 @@ def find_similar_question(db: Session, query_text: str, user_id: uuid.UUID) -> m
     :param user_id:
     :return:
     """
+    match = find_similar_question_with_distance(db, query_text=query_text, user_id=user_id)
+    return match[0] if match else None
+
+def find_similar_question_with_distance(
+    db: Session, query_text: str, user_id: uuid.UUID, query_embedding=None
+) -> tuple[models.ScenarioQuestion, float] | None:
+    """
+    Finds the most similar ScenarioQuestion for a given user, together with its
+    L2 distance from the query text.
+
+    :param db:
+    :param query_text:
+    :param user_id:
+    :param query_embedding: Precomputed embedding of query_text, if available.
+    :return: A (question, distance) tuple, or None if the user has no questions.
+    """
 
     # Generate the embedding for the incoming transcribed text
-    query_embedding = embedding_model.encode(query_text)
+    if query_embedding is None:
+        query_embedding = embed_text(query_text)
+    distance = models.ScenarioQuestion.question_embedding.l2_distance(query_embedding)
 
     # Use the l2_distance function from pgvector to find the most similar question.
     # We join across the tables to ensure we only search questions owned by the current user.
-    similar_question = (
-        db.query(models.ScenarioQuestion)
+    row = (
+        db.query(models.ScenarioQuestion, distance.label("distance"))
         .join(models.Scenario)
         .filter(models.Scenario.user_id == user_id)
-        .order_by(models.ScenarioQuestion.question_embedding.l2_distance(query_embedding))
+        .order_by(distance)
         .first()
     )
-    return similar_question
+    if row is None:
+        return None
+    return row[0], row[1]
 
 def update_question(
     db: Session,
@@ -193,6 +320,12 @@ def update_question(
     for key, value in update_data.items():
         setattr(db_question, key, value)
 
+    # Editing the question invalidates anything generated from its old text
+    if "question_text" in update_data:
+        db_question.question_embedding = embed_text(db_question.question_text)
+    if update_data:
+        db_question.precomputed_suggestions = None
+
     db.add(db_question)
     db.commit()
     db.refresh(db_question)
@@ -284,6 +417,9 @@ def update_preference(
     for key, value in update_data.items():
         setattr(db_preference, key, value)
 
+    if "preference_text" in update_data:
+        db_preference.preference_embedding = embed_text(db_preference.preference_text)
+
     db.add(db_preference)
     db.commit()
     db.refresh(db_preference)
@@ -366,4 +502,99 @@ def delete_question_by_id(db: Session, *, question_id: uuid.UUID, user_id: uuid.
     db.delete(question_to_delete)
     db.commit()
 
-    return question_to_delete
\ No newline at end of file
+    return question_to_delete
+
+
+# --- Pre-generated suggestion helpers ---
+
+def get_question_for_pregeneration(db: Session, question_id: uuid.UUID) -> models.ScenarioQuestion | None:
+    """
+    Retrieves a ScenarioQuestion by its ID, with its parent scenario loaded so
+    the owning user is known.
+
+    :param db:
+    :param question_id:
+    :return:
+    """
+    return (
+        db.query(models.ScenarioQuestion)
+        .join(models.Scenario, models.ScenarioQuestion.scenario_id == models.Scenario.id)
+        .filter(models.ScenarioQuestion.id == question_id)
+        .first()
+    )
+
+def lock_question_for_pregeneration(db: Session, question_id: uuid.UUID) -> models.ScenarioQuestion | None:
+    """
+    Re-reads a ScenarioQuestion and locks its row (SELECT ... FOR UPDATE)
+    until the transaction ends, so an edit cannot land between checking the
+    question and storing suggestions generated from it.
+
+    :param db:
+    :param question_id:
+    :return:
+    """
+    return (
+        db.query(models.ScenarioQuestion)
+        .filter(models.ScenarioQuestion.id == question_id)
+        .populate_existing()
+        .with_for_update()
+        .first()
+    )
+
+def set_precomputed_suggestions(
+    db: Session, *, question_id: uuid.UUID, suggestions: list[str]
+) -> models.ScenarioQuestion | None:
+    """
+    Stores pre-generated suggestions on a ScenarioQuestion.
+
+    :param db:
+    :param question_id:
+    :param suggestions:
+    :return:
+    """
+    db_question = db.query(models.ScenarioQuestion).filter(models.ScenarioQuestion.id == question_id).first()
+    if not db_question:
+        return None
+
+    db_question.precomputed_suggestions = suggestions
+    db.add(db_question)
+    db.commit()
+    db.refresh(db_question)
+    return db_question
+
+def clear_precomputed_suggestions_for_user(db: Session, user_id: uuid.UUID) -> list[uuid.UUID]:
+    """
+    Invalidates the pre-generated suggestions of every question owned by a user,
+    e.g. after their preferences changed.
+
+    :param db:
+    :param user_id:
+    :return: The IDs of the invalidated questions.
+    """
+    question_ids = [
+        question_id
+        for (question_id,) in db.query(models.ScenarioQuestion.id)
+        .join(models.Scenario, models.ScenarioQuestion.scenario_id == models.Scenario.id)
+        .filter(models.Scenario.user_id == user_id)
+        .all()
+    ]
+    if question_ids:
+        db.query(models.ScenarioQuestion).filter(
+            models.ScenarioQuestion.id.in_(question_ids)
+        ).update({models.ScenarioQuestion.precomputed_suggestions: None}, synchronize_session=False)
+        db.commit()
+    return question_ids
+
+def get_question_ids_missing_suggestions(db: Session) -> list[uuid.UUID]:
+    """
+    Retrieves the IDs of all questions that have no pre-generated suggestions.
+
+    :param db:
+    :return:
+    """
+    return [
+        question_id
+        for (question_id,) in db.query(models.ScenarioQuestion.id)
+        .filter(models.ScenarioQuestion.precomputed_suggestions.is_(None))
+        .all()
+    ]
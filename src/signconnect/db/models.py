@@ -3,8 +3,8 @@
 
 import uuid
 import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Float
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import timezone
 from pgvector.sqlalchemy import Vector
@@ -27,6 +27,9 @@ class User(Base):
     created_at = Column(DateTime, default=lambda: datetime.datetime.now(timezone.utc)) # lambda function ensures time
     # is calculated every time a new row is created, rather than just once when the applications starts
     firebase_uid = Column(String, unique=True, index=True, nullable=True)  # Nullable for now if you have existing users
+    # Per-user silence gating overrides; NULL means use the server default
+    silence_gating_enabled = Column(Boolean, nullable=True)
+    silence_threshold_bytes_per_second = Column(Float, nullable=True)
 
     conversations = relationship("Conversation", back_populates="user")
     preferences = relationship("UserPreference", back_populates="owner")
@@ -55,6 +58,8 @@ class ConversationTurn(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id"), nullable=False)
     transcribed_text = Column(String, nullable=False)
+    # Who produced the turn: "other" for transcribed speech, "user" for replies.
+    speaker = Column(String, nullable=True)
     timestamp = Column(DateTime, default=lambda: datetime.datetime.now(timezone.utc))
 
     conversation = relationship("Conversation", back_populates="turns")
@@ -67,6 +72,9 @@ class UserPreference(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     preference_text = Column(String, nullable=False)
+    # Embedding of the preference text, computed at write time and used to
+    # select only the preferences relevant to the current transcript.
+    preference_embedding = Column(Vector(384))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     owner = relationship("User", back_populates="preferences")
@@ -102,6 +110,9 @@ class ScenarioQuestion(Base):
     # The vector embedding for the question text. The number (384) is the
     # dimension of the embeddings produced by our chosen model.
     question_embedding = Column(Vector(384))
+    # Suggestions generated ahead of time by the background pre-generation job.
+    # NULL means they are missing or were invalidated by an edit.
+    precomputed_suggestions = Column(ARRAY(String), nullable=True)
     scenario_id = Column(UUID(as_uuid=True), ForeignKey("scenarios.id"), nullable=False)
 
     scenario = relationship("Scenario", back_populates="questions")
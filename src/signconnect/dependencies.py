@@ -3,6 +3,7 @@ from .firebase import verify_firebase_token
 from typing import Generator
 from sqlalchemy.orm import Session
 from .llm.client import GeminiClient
+from .services.suggestion_pregen import SuggestionPregenerator
 from firebase_admin import auth
 
 
@@ -22,6 +23,12 @@ def get_llm_client(request: Request) -> GeminiClient:
     """
     return request.app.state.llm_client
 
+def get_suggestion_pregenerator(request: Request) -> SuggestionPregenerator:
+    """
+    Dependency to get the application's background SuggestionPregenerator.
+    """
+    return request.app.state.suggestion_pregenerator
+
 async def get_current_user(
         authorization: str | None = Header(None),
         token_from_query: str | None = Query(None, alias="token")
@@ -0,0 +1,138 @@
+# src/signconnect/llm/circuit_breaker.py
+
+import time
+from collections import deque
+from typing import Callable, Deque
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class CircuitBreaker:
+    """
+    A latency- and error-aware circuit breaker for LLM calls.
+
+    While closed, the outcome of every call is kept in a rolling window. A call
+    counts as failed if it errored, returned nothing, or exceeded the latency
+    SLO. Once the failure rate in the window reaches the threshold the breaker
+    opens and callers should go straight to their fallback. After a cool-down it
+    becomes half-open and lets a trickle of probe calls through, one per probe
+    interval; enough consecutive successful probes close it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        latency_slo_seconds: float = 2.5,
+        open_seconds: float = 30.0,
+        probe_interval_seconds: float = 5.0,
+        probes_to_close: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            window_size: Number of recent calls considered for the failure rate.
+            min_calls: Calls required in the window before the breaker may open.
+            failure_rate_threshold: Failure fraction at which the breaker opens.
+            latency_slo_seconds: Calls slower than this count as failures.
+            open_seconds: Cool-down before probing recovery.
+            probe_interval_seconds: Minimum spacing between half-open probes.
+            probes_to_close: Consecutive successful probes needed to close.
+            clock: Monotonic time source, injectable for tests.
+        """
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.latency_slo_seconds = latency_slo_seconds
+        self.open_seconds = open_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+        self.probes_to_close = probes_to_close
+        self._clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._last_probe_at = float("-inf")
+        self._probe_in_flight = False
+        self._probe_successes = 0
+
+    @property
+    def failure_rate(self) -> float:
+        """
+        Fraction of failed calls in the rolling window.
+        """
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for failed in self._outcomes if failed) / len(self._outcomes)
+
+    def allow_request(self) -> bool:
+        """
+        Returns True if a real call may be made now.
+
+        Post-conditions:
+        - In the half-open state, a True result reserves the single probe slot;
+          the caller must report its outcome through `record`, or give the
+          slot back through `release`.
+        """
+        now = self._clock()
+        if self.state == self.OPEN:
+            if now - self._opened_at < self.open_seconds:
+                return False
+            self._transition(self.HALF_OPEN)
+
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight or now - self._last_probe_at < self.probe_interval_seconds:
+                return False
+            self._probe_in_flight = True
+            self._last_probe_at = now
+        return True
+
+    def record(self, success: bool, latency_seconds: float) -> None:
+        """
+        Records the outcome of a call made after `allow_request` returned True.
+        """
+        failed = not success or latency_seconds > self.latency_slo_seconds
+
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+            if failed:
+                self._transition(self.OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.probes_to_close:
+                self._transition(self.CLOSED)
+            return
+
+        self._outcomes.append(failed)
+        if (
+            self.state == self.CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and self.failure_rate >= self.failure_rate_threshold
+        ):
+            self._transition(self.OPEN)
+
+    def release(self) -> None:
+        """
+        Gives back a reservation made by `allow_request` without an outcome,
+        e.g. when the caller was cancelled before the call returned. A freed
+        probe slot can be taken again right away.
+        """
+        if self.state == self.HALF_OPEN and self._probe_in_flight:
+            self._probe_in_flight = False
+            self._last_probe_at = float("-inf")
+
+    def _transition(self, state: str) -> None:
+        logger.warning("LLM circuit breaker state change.", old=self.state, new=state)
+        self.state = state
+        if state == self.OPEN:
+            self._opened_at = self._clock()
+        elif state == self.HALF_OPEN:
+            self._probe_successes = 0
+            self._probe_in_flight = False
+        elif state == self.CLOSED:
+            self._outcomes.clear()
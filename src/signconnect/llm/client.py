@@ -1,11 +1,90 @@
 # src/signconnect/llm/client.py
 
+import datetime
 import google.generativeai as genai
-from typing import List
+from google.generativeai import caching
+from typing import List, Optional
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Rough characters-per-token ratio for English text, used for prompt budgeting
+# where calling the provider's tokenizer would cost a network round trip.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of prompt tokens a piece of text will consume.
+    """
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+MODEL_NAME = "gemini-1.5-flash"
+
+# The stable part of every suggestion prompt. It is sent as the model's system
+# instruction so it forms an identical prefix across calls, which is what
+# provider-side (explicit or implicit) prefix caching keys on.
+SUGGESTION_SYSTEM_INSTRUCTION = (
+    "You are an AI assistant for a deaf or hard-of-hearing person. "
+    "Your goal is to provide three concise, natural-sounding, and relevant "
+    "response suggestions to the ongoing conversation. The user will provide "
+    "the latest transcript, their personal context, and the conversation history.\n\n"
+    "Based on all this information, provide exactly three brief and "
+    "relevant response suggestions, each on a new line, without any "
+    "numbering or bullet points."
+)
+
+
+def build_profile_prompt(user_preferences: List[str]) -> str:
+    """
+    Formats a user's preferences as the per-user section of the prompt.
+    """
+    return "**User's Personal Context:**\n" f"- {', '.join(user_preferences)}\n\n"
+
+
+def build_turn_prompt(
+    transcript: str,
+    user_preferences: List[str],
+    conversation_history: List[str],
+) -> str:
+    """
+    Builds the small per-turn suffix that follows the cached prefix.
+    """
+    prompt = build_profile_prompt(user_preferences) if user_preferences else ""
+    return (
+        prompt
+        + "**Conversation History:**\n"
+        f"{' '.join(conversation_history)}\n\n"
+        "**Latest Transcript (what the other person just said):**\n"
+        f'"{transcript}"'
+    )
+
+
+class PromptCache:
+    """
+    A provider-side cache holding a session's stable prompt prefix: the system
+    instruction followed by the user's profile.
+    """
+
+    def __init__(self, cached_content: caching.CachedContent, model: genai.GenerativeModel):
+        """
+        Args:
+            cached_content: The cached content resource on the provider.
+            model: A model bound to the cached content.
+        """
+        self.cached_content = cached_content
+        self.model = model
+
+    def delete(self) -> None:
+        """
+        Deletes the cached content on the provider.
+        """
+        try:
+            self.cached_content.delete()
+        except Exception as e:
+            logger.warning(f"Error deleting Gemini prompt cache: {e}")
+
 
 class GeminiClient:
     """
@@ -23,14 +102,59 @@ class GeminiClient:
             api_key: The Google Gemini API key.
         """
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-1.5-flash")
+        self.model_name = MODEL_NAME
+        self.model = genai.GenerativeModel(
+            self.model_name, system_instruction=SUGGESTION_SYSTEM_INSTRUCTION
+        )
+        # Summaries need different instructions than suggestions
+        self.summary_model = genai.GenerativeModel(self.model_name)
         logger.info("GeminiClient initialized successfully.")
 
+    def create_prompt_cache(
+        self,
+        user_preferences: List[str],
+        min_tokens: int,
+        ttl_seconds: int,
+    ) -> Optional[PromptCache]:
+        """
+        Caches the system instruction plus the user's full profile on the provider.
+
+        Providers only accept caches above a minimum size, so nothing is created
+        when the prefix is smaller than `min_tokens`; calls then rely on the
+        stable prefix layout for implicit reuse instead.
+
+        Args:
+            user_preferences: All of the user's preference texts.
+            min_tokens: Smallest prefix, in estimated tokens, worth caching.
+            ttl_seconds: How long the provider keeps the cache if never deleted.
+
+        Returns:
+            The cache handle, or None if no cache was created.
+        """
+        profile = build_profile_prompt(user_preferences) if user_preferences else ""
+        if estimate_tokens(SUGGESTION_SYSTEM_INSTRUCTION + profile) < min_tokens:
+            return None
+        try:
+            cached_content = caching.CachedContent.create(
+                model=self.model_name,
+                system_instruction=SUGGESTION_SYSTEM_INSTRUCTION,
+                contents=[profile],
+                ttl=datetime.timedelta(seconds=ttl_seconds),
+            )
+            logger.info("Created Gemini prompt cache.", name=cached_content.name)
+            return PromptCache(
+                cached_content, genai.GenerativeModel.from_cached_content(cached_content)
+            )
+        except Exception as e:
+            logger.warning(f"Gemini prompt caching unavailable, using uncached prefix: {e}")
+            return None
+
     def get_response_suggestions(
         self,
         transcript: str,
         user_preferences: List[str],
         conversation_history: List[str],
+        prompt_cache: Optional[PromptCache] = None,
     ) -> List[str]:
         """
         Generates conversational response suggestions based on the transcript
@@ -39,30 +163,24 @@ class GeminiClient:
         Args:
             transcript: The latest transcript of the conversation.
             user_preferences: A list of user-specific details or preferences.
+                Leave empty when the profile is already in `prompt_cache`.
             conversation_history: A list of previous messages in the conversation.
+            prompt_cache: A session's cached prompt prefix, if one exists.
 
         Returns:
             A list of three suggested responses, or an empty list if an error occurs.
         """
         try:
-            # Constructing the prompt with clear context for the model
-            prompt = (
-                "You are an AI assistant for a deaf or hard-of-hearing person. "
-                "Your goal is to provide three concise, natural-sounding, and relevant "
-                "response suggestions to the ongoing conversation. The user will provide "
-                "the latest transcript, their personal context, and the conversation history.\n\n"
-                "**User's Personal Context:**\n"
-                f"- {', '.join(user_preferences)}\n\n"
-                "**Conversation History:**\n"
-                f"{' '.join(conversation_history)}\n\n"
-                "**Latest Transcript (what the other person just said):**\n"
-                f'"{transcript}"\n\n'
-                "Based on all this information, provide exactly three brief and "
-                "relevant response suggestions, each on a new line, without any "
-                "numbering or bullet points."
+            # Only the per-turn suffix is sent; the instructions are the model's
+            # system instruction (or live in the prompt cache).
+            prompt = build_turn_prompt(
+                transcript=transcript,
+                user_preferences=user_preferences,
+                conversation_history=conversation_history,
             )
+            model = prompt_cache.model if prompt_cache is not None else self.model
 
-            response = self.model.generate_content(prompt)
+            response = model.generate_content(prompt)
 
             # Clean up the response and split into a list
             suggestions = [
@@ -73,3 +191,44 @@ class GeminiClient:
         except Exception as e:
             logger.exception(f"Error generating suggestions from Gemini: {e}")
             return []
+
+    def summarize_conversation(
+        self,
+        previous_summary: str,
+        turns: List[str],
+        max_tokens: int = 150,
+    ) -> str:
+        """
+        Folds older conversation turns into a running summary.
+
+        Args:
+            previous_summary: The summary produced so far, or an empty string.
+            turns: Turns to fold in, oldest first, each prefixed with its speaker.
+            max_tokens: Approximate size limit for the returned summary.
+
+        Returns:
+            The updated summary, or the previous summary if an error occurs.
+        """
+        try:
+            max_words = max(1, max_tokens * 3 // 4)
+            prompt = (
+                "You maintain a running summary of a conversation between a deaf or "
+                "hard-of-hearing person (\"user\") and someone speaking to them "
+                "(\"other\"). Update the summary with the new turns, keeping names, "
+                "facts, requests and decisions that may matter later.\n\n"
+                "**Current Summary:**\n"
+                f"{previous_summary or '(none yet)'}\n\n"
+                "**New Turns:**\n"
+                + "\n".join(turns)
+                + "\n\n"
+                f"Reply with only the updated summary, in at most {max_words} words."
+            )
+
+            response = self.summary_model.generate_content(prompt)
+            summary = response.text.strip()
+            # Enforce the size bound even if the model ignores the instruction
+            return summary[: max_tokens * CHARS_PER_TOKEN]
+
+        except Exception as e:
+            logger.exception(f"Error summarizing conversation with Gemini: {e}")
+            return previous_summary
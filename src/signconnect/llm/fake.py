@@ -0,0 +1,60 @@
+# src/signconnect/llm/fake.py
+import time
+from typing import List, Optional
+
+import structlog
+
+from .client import PromptCache
+
+logger = structlog.get_logger(__name__)
+
+CANNED_SUGGESTIONS = [
+    "Could you say that again?",
+    "Yes, that works for me.",
+    "Let me think about it.",
+]
+
+
+class FakeLLMClient:
+    """
+    A stand-in for GeminiClient that answers with canned text after a fixed
+    delay. Used for load tests and benchmarks that must not call the provider.
+    """
+
+    def __init__(self, latency_seconds: float = 0.3):
+        """
+        Args:
+            latency_seconds: How long each call blocks, simulating the provider.
+        """
+        self.latency_seconds = latency_seconds
+        logger.warning("Using the fake LLM client; suggestions are canned.")
+
+    def create_prompt_cache(
+        self, user_preferences: List[str], min_tokens: int, ttl_seconds: int
+    ) -> Optional[PromptCache]:
+        """
+        Never creates a cache.
+        """
+        return None
+
+    def get_response_suggestions(
+        self,
+        transcript: str,
+        user_preferences: List[str],
+        conversation_history: List[str],
+        prompt_cache: Optional[PromptCache] = None,
+    ) -> List[str]:
+        """
+        Returns the canned suggestions after the configured latency.
+        """
+        time.sleep(self.latency_seconds)
+        return list(CANNED_SUGGESTIONS)
+
+    def summarize_conversation(
+        self, previous_summary: str, turns: List[str], max_tokens: int = 150
+    ) -> str:
+        """
+        Returns the previous summary; summaries are not simulated.
+        """
+        time.sleep(self.latency_seconds)
+        return previous_summary
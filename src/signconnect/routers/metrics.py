@@ -0,0 +1,48 @@
+# src/signconnect/routers/metrics.py
+
+import math
+
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from ..core.metrics import REGISTRY
+
+router = APIRouter(
+    prefix="/api",
+    tags=["metrics"],
+)
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Expose runtime metrics for scraping",
+)
+def get_metrics() -> PlainTextResponse:
+    """
+    Returns this worker's metrics in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@router.get(
+    "/load",
+    summary="Report this worker's load for load balancing and autoscaling",
+)
+def get_load(request: Request) -> JSONResponse:
+    """
+    Returns this worker's load score and its components. While the worker
+    refuses new sessions the status is 503 with a Retry-After header, so a
+    load balancer health check can route new connections elsewhere.
+    """
+    admission = request.app.state.admission
+    load = admission.load()
+    if load["accepting"]:
+        return JSONResponse(load)
+    return JSONResponse(
+        load,
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(math.ceil(admission.retry_hint()))},
+    )
@@ -8,6 +8,8 @@ from starlette import status
 from .. import crud, schemas
 from ..dependencies import get_db
 from ..dependencies import get_current_user
+from ..dependencies import get_suggestion_pregenerator
+from ..services.suggestion_pregen import SuggestionPregenerator
 
 router = APIRouter(
     prefix="/api/users/me/questions",
@@ -54,6 +56,7 @@ def update_question_endpoint(
     *,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    pregenerator: SuggestionPregenerator = Depends(get_suggestion_pregenerator),
 ):
     """
     Update a specific question by its ID.
@@ -75,4 +78,6 @@ def update_question_endpoint(
             detail=f"Question with ID {question_id} not found or you do not have permission to edit it."
         )
 
+    # The edit invalidated the stored suggestions, so regenerate them
+    pregenerator.enqueue(updated_question.id)
     return updated_question
\ No newline at end of file
@@ -3,7 +3,8 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from .. import crud, schemas
-from ..dependencies import get_current_user, get_db
+from ..dependencies import get_current_user, get_db, get_suggestion_pregenerator
+from ..services.suggestion_pregen import SuggestionPregenerator
 
 # Create a new router object
 router = APIRouter(
@@ -84,6 +85,7 @@ def create_scenario_question(
     question: schemas.ScenarioQuestionCreate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    pregenerator: SuggestionPregenerator = Depends(get_suggestion_pregenerator),
 ):
     """
     Create a new pre-configured question for one of the user's scenarios, ensuring the user owns the parent scenario.
@@ -110,9 +112,12 @@ def create_scenario_question(
         raise HTTPException(
             status_code=403, detail="Not authorized to add questions to this scenario."
         )
-    return crud.create_scenario_question(
+    db_question = crud.create_scenario_question(
         db=db, question=question, scenario_id=scenario_id
     )
+    # Pre-generate suggestions so this question can be answered without the LLM
+    pregenerator.enqueue(db_question.id)
+    return db_question
 
 
 @router.delete(
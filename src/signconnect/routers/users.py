@@ -7,7 +7,8 @@ from starlette import status
 import structlog
 
 from .. import crud, schemas
-from ..dependencies import get_current_user, get_db
+from ..dependencies import get_current_user, get_db, get_suggestion_pregenerator
+from ..services.suggestion_pregen import SuggestionPregenerator
 
 logger = structlog.get_logger(__name__)
 
@@ -18,12 +19,24 @@ router = APIRouter(
 )
 
 
+def _refresh_pregenerated_suggestions(
+    db: Session, pregenerator: SuggestionPregenerator, user_id: uuid.UUID
+):
+    """
+    Invalidates a user's pre-generated suggestions after their preferences
+    changed and schedules them for regeneration.
+    """
+    question_ids = crud.clear_precomputed_suggestions_for_user(db, user_id=user_id)
+    pregenerator.enqueue_many(question_ids)
+
+
 # The path is now "/preferences/" which is relative to the "/users/me" prefix
 @router.post("/preferences/", response_model=schemas.UserPreference)
 def create_preference(
     preference: schemas.UserPreferenceCreate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    pregenerator: SuggestionPregenerator = Depends(get_suggestion_pregenerator),
 ):
     """
     Create a new preference for the currently authenticated user.
@@ -45,7 +58,11 @@ def create_preference(
         db_user = crud.create_user(db=db, user=user_to_create)
         logger.info("--- db user created")
 
-    return crud.create_user_preference(db=db, preference=preference, user_id=db_user.id)
+    db_preference = crud.create_user_preference(
+        db=db, preference=preference, user_id=db_user.id
+    )
+    _refresh_pregenerated_suggestions(db, pregenerator, user_id=db_user.id)
+    return db_preference
 
 
 # This path is also relative to the prefix
@@ -84,6 +101,7 @@ def delete_preference_endpoint(
     *,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    pregenerator: SuggestionPregenerator = Depends(get_suggestion_pregenerator),
 ):
     """
     Delete a specific preference by its ID for the current user.
@@ -104,6 +122,7 @@ def delete_preference_endpoint(
             detail=f"Preference with ID {preference_id} not found or you do not have permission to delete it.",
         )
 
+    _refresh_pregenerated_suggestions(db, pregenerator, user_id=db_user.id)
     return deleted_preference
 
 
@@ -118,6 +137,7 @@ def update_preference_endpoint(
     *,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    pregenerator: SuggestionPregenerator = Depends(get_suggestion_pregenerator),
 ):
     """
     Update a specific preference by its ID for the current user.
@@ -141,4 +161,41 @@ def update_preference_endpoint(
             detail=f"Preference with ID {preference_id} not found or you do not have permission to edit it.",
         )
 
+    _refresh_pregenerated_suggestions(db, pregenerator, user_id=db_user.id)
     return updated_preference
+
+
+@router.get("/speech-settings", response_model=schemas.SpeechSettings)
+def read_speech_settings(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Retrieve the current user's speech-to-text settings.
+    """
+    db_user = crud.get_user_by_email(db, email=current_user.get("email"))
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return db_user
+
+
+@router.put("/speech-settings", response_model=schemas.SpeechSettings)
+def update_speech_settings(
+    settings_update: schemas.SpeechSettingsUpdate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Update the current user's speech-to-text settings, e.g. to turn silence
+    gating off or tune its threshold. Applies to new connections.
+    """
+    db_user = crud.get_user_by_email(db, email=current_user.get("email"))
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return crud.update_user_speech_settings(
+        db, user=db_user, settings_update=settings_update
+    )
@@ -1,89 +1,144 @@
 # src/signconnect/routers/websockets.py
 
 import asyncio
+import hmac
+import json
+from typing import Awaitable, Callable, Tuple
+
 from fastapi import (
     APIRouter,
     WebSocket,
     WebSocketDisconnect,
-    Depends,
     WebSocketException,
     status,
 )
-from sqlalchemy.orm import Session
-from google.cloud import speech
 import structlog
 
+from signconnect import crud
 from signconnect.services import websocket_manager as manager_service
-from signconnect.dependencies import get_db
+from signconnect.services.audio_buffer import AudioBuffer
+from signconnect.services.heartbeat import HEARTBEAT_TIMEOUT, REAPED_CONNECTIONS, ConnectionMonitor
+from signconnect.services.interim_policy import InterimCoalescer
+from signconnect.services.message_dispatch import MessageDispatcher
+from signconnect.services.protocol import PROTOCOL_V2, negotiate_protocol, receive_frame
+from signconnect.services.conversation_memory import ConversationTurnStore
+from signconnect.services.drain import ShutdownDrain
+from signconnect.services.session import ConversationSession
+from signconnect.services.session_recording import SessionRecorder
+from signconnect.services.session_resume import RESUME_PREFIX, LiveSession
+from signconnect.services.silence_gate import SilenceGate
+from signconnect.stt.backends import GoogleSpeechBackend, SpeechBackend
 from signconnect.firebase import verify_firebase_token
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api", tags=["websockets"])
-manager = manager_service.ConnectionManager()
 
 
-async def audio_processor(websocket: WebSocket, audio_queue: asyncio.Queue):
+async def audio_processor(
+    websocket: WebSocket,
+    audio_queue: AudioBuffer,
+    session: ConversationSession | None = None,
+    backend: SpeechBackend | None = None,
+    gate: SilenceGate | None = None,
+    transcripts: InterimCoalescer | None = None,
+    suggest: Callable[[str], Awaitable[None]] | None = None,
+):
     """
     Processes audio from a queue and sends transcripts back to the client.
     This function runs as a background task for each connection.
+    Final transcripts are also recorded in the session's conversation memory.
+    `backend` is the app's shared speech-to-text engine; a Google backend is
+    created if none is given. `gate` keeps the user's silences from the engine.
+    `transcripts` applies the outbound interim policy; by default every
+    changed interim is sent. If the session opted in to server suggestions,
+    `suggest` is started for each final transcript.
     """
-    client = speech.SpeechAsyncClient()
-    config = speech.RecognitionConfig(
-        encoding=speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
-        sample_rate_hertz=48000,
-        language_code="en-US",
-        enable_automatic_punctuation=True,
-        model="latest_long",
-    )
-    streaming_config = speech.StreamingRecognitionConfig(
-        config=config, interim_results=True
+    backend = backend or GoogleSpeechBackend()
+    manager = websocket.app.state.connection_manager
+    transcripts = transcripts or InterimCoalescer(
+        lambda message: manager.send_personal_json(message, websocket),
+        min_interval_seconds=0,
     )
 
-    async def request_generator():
-        yield speech.StreamingRecognizeRequest(streaming_config=streaming_config)
-        while True:
-            chunk = await audio_queue.get()
-            if chunk is None:
-                break
-            yield speech.StreamingRecognizeRequest(audio_content=chunk)
-            audio_queue.task_done()
-
     try:
-        responses = await client.streaming_recognize(requests=request_generator())
-        async for response in responses:
-            if not response.results or not response.results[0].alternatives:
+        async for result in backend.transcribe(audio_queue, gate=gate):
+            if not result.is_final:
+                await transcripts.interim(result.text)
                 continue
-
-            transcript = response.results[0].alternatives[0].transcript
-            msg_type = (
-                "final_transcript"
-                if response.results[0].is_final
-                else "interim_transcript"
-            )
-            await manager.send_personal_json(
-                {"type": msg_type, "data": transcript}, websocket
-            )
+            if session is not None:
+                session.memory.add_turn("other", result.text)
+                if session.server_suggestions and suggest is not None:
+                    # Saves the client's get_suggestions round trip
+                    session.start_suggestions(suggest(result.text))
+            await transcripts.final(result.text)
     except Exception as e:
         logger.exception(f"Error during transcription: {e}")
     finally:
+        transcripts.close()
         logger.info("Audio processor finished.")
 
 
-async def authenticated_websocket_handler(websocket: WebSocket, db: Session) -> dict:
+def _load_test_user(token: str, settings) -> dict | None:
+    """
+    Returns a synthetic user for a load-test token ("<secret>:<n>"), or None if
+    load-test authentication is disabled or the token is not one.
+    """
+    secret = settings.LOAD_TEST_AUTH_TOKEN
+    if secret is None:
+        return None
+    prefix, _, index = token.rpartition(":")
+    # Bytes, as compare_digest rejects non-ASCII str from untrusted input
+    if not hmac.compare_digest(prefix.encode(), secret.get_secret_value().encode()):
+        return None
+    return {"uid": f"loadtest-{index}", "email": f"loadtest-{index}@loadtest.invalid"}
+
+
+async def authenticated_websocket_handler(
+    websocket: WebSocket, subprotocol: str | None = None
+) -> Tuple[dict, LiveSession | None]:
     """
     Handles the initial authentication phase of the WebSocket connection.
+    `subprotocol` is the negotiated protocol echoed back to the client.
+    A client resuming a parked session presents its resume token instead of
+    a Firebase ID token; the session is then returned along with its user.
+    New sessions are refused, with a retry hint, while the worker is
+    overloaded; resumed ones add no load and are let in unless the worker
+    is draining.
     """
-    await websocket.accept()
+    await websocket.accept(subprotocol=subprotocol)
     try:
         token = await websocket.receive_text()
-        user = verify_firebase_token(token)
+        resuming = token.startswith(RESUME_PREFIX)
+        refusal = websocket.app.state.admission.check(new_session=not resuming)
+        if refusal is not None:
+            await websocket.send_json(
+                {
+                    "type": "overloaded",
+                    "reason": refusal.reason,
+                    "retry_after_seconds": refusal.retry_after_seconds,
+                }
+            )
+            raise WebSocketException(
+                code=status.WS_1013_TRY_AGAIN_LATER, reason="Server overloaded"
+            )
+        if resuming:
+            live = websocket.app.state.resume_registry.claim(token[len(RESUME_PREFIX):])
+            if live is None:
+                raise WebSocketException(
+                    code=status.WS_1008_POLICY_VIOLATION,
+                    reason="Session expired",
+                )
+            return live.user, live
+        user = _load_test_user(
+            token, websocket.app.state.settings
+        ) or verify_firebase_token(token)
         if not user:
             raise WebSocketException(
                 code=status.WS_1008_POLICY_VIOLATION,
                 reason="Invalid authentication token",
             )
-        return user
+        return user, None
     except WebSocketException as e:
         await websocket.close(code=e.code, reason=e.reason)
         raise
@@ -95,57 +150,345 @@ async def authenticated_websocket_handler(websocket: WebSocket, db: Session) ->
         raise
 
 
+async def _close_quietly(
+    websocket: WebSocket, code: int = status.WS_1000_NORMAL_CLOSURE, reason: str | None = None
+) -> None:
+    # Used on sockets that may be dead already (taken over, or reaped)
+    try:
+        await asyncio.wait_for(websocket.close(code=code, reason=reason), timeout=1.0)
+    except Exception:
+        pass
+
+
+async def _receive_frames(
+    websocket: WebSocket,
+    live: LiveSession,
+    dispatcher: MessageDispatcher,
+    monitor: ConnectionMonitor,
+    drain: ShutdownDrain,
+) -> None:
+    """
+    Reads frames until the client disconnects: audio goes straight to the
+    buffer, other messages to the dispatcher. Returns when the client
+    acknowledges a reconnect request, its last frame on this connection;
+    an acknowledgement nobody asked for (no drain running) is ignored.
+    """
+    recorder = live.recorder
+    audio_queue = live.audio_queue
+    while True:
+        audio_chunk, message = await receive_frame(websocket)
+        if message is not None and message.get("type") == "heartbeat_ack":
+            monitor.frame_received(activity=False)
+            continue
+        if message is not None and message.get("type") == "reconnect_ack":
+            if drain.draining:
+                return
+            continue
+        monitor.frame_received()
+        if recorder is not None:
+            if audio_chunk is not None:
+                recorder.audio(audio_chunk)
+            else:
+                recorder.control(json.dumps(message))
+        if audio_chunk is not None:
+            # Binary frames are raw audio: no JSON parsing or base64 decoding
+            await audio_queue.put(audio_chunk)
+            continue
+        # Slow handlers run in the dispatcher's lanes, not in this loop
+        await dispatcher.dispatch(message)
+
+
+async def _hand_over(
+    websocket: WebSocket,
+    receiving: asyncio.Task,
+    live: LiveSession,
+    dispatcher: MessageDispatcher,
+    manager: manager_service.ConnectionManager,
+    drain: ShutdownDrain,
+) -> None:
+    """
+    Moves a connection off a draining worker without losing what was said.
+
+    The client is asked to reconnect; it sends its last audio here, then
+    acknowledges and opens a new session elsewhere. Meanwhile this
+    connection ends the audio stream so the speech engine returns its last
+    finals, lets suggestions for them (and any requested ones) finish,
+    flushes its queued writes and closes, all within the drain deadline.
+
+    Raises:
+        WebSocketDisconnect: If the client left instead of acknowledging.
+    """
+    if not receiving.done():  # else the client acknowledged already
+        await manager.send_personal_json({"type": "reconnect", "reason": "shutdown"}, websocket)
+        await asyncio.wait(
+            {receiving}, timeout=min(drain.ack_timeout_seconds, drain.remaining())
+        )
+    if receiving.done():
+        receiving.result()
+    else:
+        receiving.cancel()
+    await live.audio_queue.put(None)
+    await asyncio.wait({live.process_task}, timeout=drain.remaining())
+    await dispatcher.join(drain.remaining())
+    await live.session.wait_for_suggestions(drain.remaining())
+    outbound = manager.outbound(websocket)
+    if outbound is not None:
+        await outbound.drain(drain.remaining())
+    await _close_quietly(
+        websocket, code=status.WS_1012_SERVICE_RESTART, reason="Server restarting"
+    )
+
+
+def _lookup_user(session_factory, email: str | None):
+    with session_factory() as db:
+        return crud.get_user_by_email(db, email=email)
+
+
+async def _open_session(
+    websocket: WebSocket,
+    user: dict,
+    settings,
+    manager: manager_service.ConnectionManager,
+    llm_client,
+) -> LiveSession:
+    """
+    Builds the state of a new session and starts transcribing its audio.
+    Outbound messages go to whichever socket serves the session at the time.
+    """
+    recorder = None
+    if settings.SESSION_RECORDING_DIR:
+        # Opt-in capture of inbound traffic for the replay load test
+        recorder = SessionRecorder(settings.SESSION_RECORDING_DIR)
+    session = ConversationSession.from_settings(
+        settings,
+        llm_client=llm_client,
+        turn_store=ConversationTurnStore(
+            websocket.app.state.session_factory, email=user.get("email")
+        ),
+        breaker=websocket.app.state.llm_breaker,
+    )
+    background_sends = set()
+
+    def send_flow_control(action: str):
+        # Called synchronously by the buffer; send without blocking it
+        task = asyncio.create_task(
+            manager.send_personal_json(
+                {"type": "flow_control", "action": action}, live.websocket
+            )
+        )
+        background_sends.add(task)
+        task.add_done_callback(background_sends.discard)
+
+    audio_queue = AudioBuffer(
+        max_bytes=settings.AUDIO_BUFFER_MAX_BYTES,
+        max_seconds=settings.AUDIO_BUFFER_MAX_SECONDS,
+        policy=settings.AUDIO_OVERFLOW_POLICY,
+        on_flow_control=send_flow_control,
+    )
+    # Off the event loop: a slow pool checkout must not stall other sockets
+    db_user = await asyncio.to_thread(
+        _lookup_user, websocket.app.state.session_factory, user.get("email")
+    )
+    gate = SilenceGate.for_user(settings, db_user)
+    live = LiveSession(user, session, audio_queue, gate=gate, recorder=recorder)
+    live.websocket = websocket
+
+    async def suggest(transcript: str):
+        # Runs beside the receive loop, so it uses its own DB session
+        with websocket.app.state.session_factory() as suggestion_db:
+            await manager_service.send_suggestions(
+                manager,
+                live.websocket,
+                transcript,
+                suggestion_db,
+                user,
+                llm_client,
+                session,
+            )
+
+    live.process_task = asyncio.create_task(
+        audio_processor(
+            websocket,
+            audio_queue,
+            session=session,
+            backend=websocket.app.state.speech_backend,
+            gate=gate,
+            transcripts=InterimCoalescer(
+                lambda message: manager.send_personal_json(message, live.websocket),
+                min_interval_seconds=settings.INTERIM_MIN_INTERVAL_SECONDS,
+                delta_encoding=settings.INTERIM_DELTA_ENCODING,
+            ),
+            suggest=suggest,
+        )
+    )
+    return live
+
+
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, db: Session = Depends(get_db)):
+async def websocket_endpoint(websocket: WebSocket):
     """
     Acts as a coordinator for the WebSocket connection.
     - Manages connection lifecycle.
-    - Starts the audio processing task.
-    - Listens for incoming messages and delegates them to the message handler.
+    - Starts the audio processing task, or reattaches to the one of a
+      resumed session.
+    - Listens for incoming messages: audio goes straight to the buffer, other
+      messages to the dispatcher, so slow handlers never stall the reads.
+    - Sends heartbeats and reaps connections that stop answering or sit idle.
+    - Hands the client over to another worker when this one drains.
+    - Parks the session when the socket drops unexpectedly, so the client
+      can resume it with its token.
     """
     user = None
+    live = None
+    dispatcher = None
+    park = False
+    manager = websocket.app.state.connection_manager
+    resumes = websocket.app.state.resume_registry
+    drain = websocket.app.state.shutdown_drain
+    settings = websocket.app.state.settings
+    llm_client = websocket.app.state.llm_client
     try:
-        user = await authenticated_websocket_handler(websocket, db)
-        await manager.connect(websocket)
-        logger.info(f"WebSocket connection accepted for user: {user.get('email')}")
+        subprotocol, protocol_version = negotiate_protocol(
+            websocket.scope.get("subprotocols", []),
+            max_version=manager.max_protocol_version,
+        )
+        user, live = await authenticated_websocket_handler(websocket, subprotocol)
+        # Protocol v2 clients understand "batch" frames; v3 ones MessagePack
+        batching = protocol_version >= PROTOCOL_V2
+        encoding = manager.encoding_for(protocol_version)
+
+        if live is not None:
+            if live.process_task.done():
+                # Transcription ended while parked; the client has to start over
+                await live.close(manager)
+                live = None
+                await websocket.close(
+                    code=status.WS_1008_POLICY_VIOLATION, reason="Session expired"
+                )
+                return
+            previous = live.websocket
+            live.websocket = websocket
+            if manager.rebind(previous, websocket, batching=batching, encoding=encoding):
+                # Messages queued while the client was away are sent now
+                asyncio.create_task(_close_quietly(previous))
+            else:
+                await manager.connect(
+                    websocket, user_id=user.get("uid"), batching=batching, encoding=encoding
+                )
+            logger.info(
+                f"WebSocket session resumed for user: {user.get('email')}",
+                protocol_version=protocol_version,
+            )
+        else:
+            await manager.connect(
+                websocket, user_id=user.get("uid"), batching=batching, encoding=encoding
+            )
+            logger.info(
+                f"WebSocket connection accepted for user: {user.get('email')}",
+                protocol_version=protocol_version,
+            )
+            live = await _open_session(websocket, user, settings, manager, llm_client)
 
-        llm_client = websocket.app.state.llm_client
-        audio_queue = asyncio.Queue()
-        process_task = asyncio.create_task(audio_processor(websocket, audio_queue))
+        if resumes.grace_seconds > 0:
+            await manager.send_personal_json(
+                {
+                    "type": "session_resume",
+                    "token": resumes.issue(live),
+                    "grace_seconds": resumes.grace_seconds,
+                },
+                websocket,
+            )
 
-        while True:
-            message = await websocket.receive_json()
-            await manager_service.handle_message(
+        dispatcher = MessageDispatcher(
+            lambda message: manager_service.handle_message(
                 manager=manager,
                 websocket=websocket,
                 message=message,
-                db=db,
+                session_factory=websocket.app.state.session_factory,
                 user=user,
                 llm_client=llm_client,
-                audio_queue=audio_queue,
+                audio_queue=live.audio_queue,
+                session=live.session,
+            ),
+            max_concurrency=settings.MESSAGE_HANDLER_MAX_CONCURRENCY,
+            max_pending=settings.MESSAGE_LANE_MAX_PENDING,
+        )
+
+        monitor = ConnectionMonitor(
+            lambda: manager.send_personal_json({"type": "heartbeat"}, websocket),
+            interval_seconds=settings.WS_HEARTBEAT_INTERVAL_SECONDS,
+            timeout_seconds=settings.WS_HEARTBEAT_TIMEOUT_SECONDS,
+            idle_timeout_seconds=settings.WS_IDLE_TIMEOUT_SECONDS,
+        )
+        receiving = asyncio.create_task(
+            _receive_frames(websocket, live, dispatcher, monitor, drain)
+        )
+        watching = asyncio.create_task(monitor.run())
+        draining = asyncio.create_task(drain.started.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {receiving, watching, draining}, return_when=asyncio.FIRST_COMPLETED
             )
+            receive_failed = receiving in done and receiving.exception() is not None
+            if not receive_failed and (draining in done or receiving in done):
+                # Draining; receiving only returns once the client acknowledged
+                watching.cancel()
+                await _hand_over(websocket, receiving, live, dispatcher, manager, drain)
+                return
+        finally:
+            receiving.cancel()
+            watching.cancel()
+            draining.cancel()
+        if receive_failed:
+            receiving.result()  # re-raises the disconnect or error
+        if watching not in done or watching.cancelled():
+            return  # nothing to reap; the finally closes the session normally
+        reason = watching.result()
+        REAPED_CONNECTIONS.inc(reason=reason)
+        logger.info(f"Reaping connection for {user.get('email')}.", reason=reason)
+        # A silent client may only be on a broken path; an idle one is done
+        park = reason == HEARTBEAT_TIMEOUT
+        await _close_quietly(
+            websocket,
+            code=status.WS_1001_GOING_AWAY if park else status.WS_1000_NORMAL_CLOSURE,
+            reason="Heartbeat timeout" if park else "Idle timeout",
+        )
 
-    except WebSocketDisconnect:
+    except WebSocketException as e:
+        # Refused during the handshake (bad token, expired session, overload);
+        # no traceback, these are routine and can come in floods
+        logger.info("WebSocket refused.", code=e.code, reason=e.reason)
+    except WebSocketDisconnect as e:
         logger.info(
-            f"Client disconnected: {user.get('email') if user else 'unauthenticated'}"
+            f"Client disconnected: {user.get('email') if user else 'unauthenticated'}",
+            code=e.code,
         )
+        # Anything but a deliberate close may be a network blip
+        park = e.code != status.WS_1000_NORMAL_CLOSURE
     except Exception as e:
         logger.exception(
             f"WebSocket error for user {user.get('email') if user else 'unauthenticated'}: {e}"
         )
     finally:
-        if user:
-            manager.disconnect(websocket)
-            # 1. Gracefully tell the audio processor to exit its loop
-            await audio_queue.put(None)
-            # 2. Cancel the background task if it's still running
-            if not process_task.done():
-                process_task.cancel()
-            try:
-                # 3. Wait for the task to acknowledge the cancellation
-                await process_task
-            except asyncio.CancelledError:
-                pass  # This is expected on cancellation
-            logger.info(
-                f"Connection closed and resources cleaned up for {user.get('email')}."
-            )
+        if dispatcher is not None:
+            # Stop in-flight handlers (e.g. a suggestion request) and drop queued ones
+            await dispatcher.close()
+        if live is None:
+            if user:
+                manager.disconnect(websocket)
+        elif live.websocket is not websocket:
+            pass  # taken over by a newer connection of the same session
+        elif (
+            park
+            and live.resume_token is not None
+            and not live.process_task.done()
+            and not drain.draining
+        ):
+            # Keep transcribing and queueing for the client while it reconnects
+            manager.suspend(websocket)
+            resumes.park(live, on_expire=lambda: live.close(manager))
+            logger.info(f"Session parked for {user.get('email')}.")
+        else:
+            resumes.discard(live)
+            await live.close(manager)
+
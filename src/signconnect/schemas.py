@@ -1,5 +1,5 @@
 from __future__ import annotations
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 import uuid
 from datetime import datetime
 from typing import List, Optional
@@ -43,6 +43,7 @@ class Scenario(ScenarioBase):
 # --- ConversationTurn Schemas ---
 class ConversationTurnBase(BaseModel):
     transcribed_text: str
+    speaker: Optional[str] = None
 
 class ConversationTurnCreate(ConversationTurnBase):
     pass
@@ -92,6 +93,17 @@ class UserCreate(UserBase):
     password: str
     firebase_uid: str | None = None
 
+class SpeechSettings(BaseModel):
+    """
+    Per-user speech-to-text settings; None means the server default applies.
+    """
+    silence_gating_enabled: Optional[bool] = None
+    silence_threshold_bytes_per_second: Optional[float] = Field(None, gt=0)
+    model_config = ConfigDict(from_attributes=True)
+
+class SpeechSettingsUpdate(SpeechSettings):
+    pass
+
 class User(UserBase):
     id: uuid.UUID
     is_active: bool
@@ -0,0 +1,221 @@
+# src/signconnect/services/admission.py
+import asyncio
+import functools
+import random
+import time
+from collections import deque
+from typing import Callable, Deque, NamedTuple, Optional, TypeVar
+
+import structlog
+
+from signconnect.core.metrics import REGISTRY
+
+logger = structlog.get_logger(__name__)
+
+# Reasons a new session is refused
+SESSIONS = "sessions"
+LLM_REQUESTS = "llm_requests"
+LOOP_LAG = "loop_lag"
+DRAINING = "draining"
+
+PENDING_LLM_REQUESTS = REGISTRY.gauge(
+    "signconnect_llm_pending_requests",
+    "LLM calls running on this worker, including ones past their latency budget.",
+)
+LOAD_SCORE = REGISTRY.gauge(
+    "signconnect_load_score",
+    "Highest fraction of an admission limit in use; new sessions are refused from 1.",
+)
+LOOP_LAG_SECONDS = REGISTRY.gauge(
+    "signconnect_event_loop_lag_seconds", "Recent worst delay of the event loop."
+)
+ADMISSIONS = REGISTRY.counter(
+    "signconnect_session_admissions_total",
+    "New websocket sessions, by outcome (admitted, or the limit that refused them).",
+)
+
+T = TypeVar("T")
+
+
+def track_llm_call(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wraps a blocking LLM client method so its calls count as pending LLM
+    requests until they return. The count is kept in the worker thread, so
+    a call abandoned by its caller (e.g. past the latency budget) still
+    counts while it runs.
+    """
+
+    @functools.wraps(func)
+    def tracked(*args, **kwargs):
+        PENDING_LLM_REQUESTS.inc()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            PENDING_LLM_REQUESTS.dec()
+
+    return tracked
+
+
+class Refusal(NamedTuple):
+    """Why a new session was refused, and when the client should retry."""
+
+    reason: str
+    retry_after_seconds: float
+
+
+class AdmissionController:
+    """
+    Decides whether this worker takes on new websocket sessions.
+
+    Each session holds a speech stream, DB work and LLM demand, so an
+    overloaded worker refuses new sessions rather than degrading the ones it
+    has. Load is measured against three limits (0 disables one): open
+    sessions, pending LLM requests, and event-loop lag. The load score is
+    the highest fraction of a limit in use; from 1 new sessions are refused
+    with a retry hint. Resumed sessions are not new load and are not checked.
+    Once the worker drains for shutdown, every session is refused.
+    """
+
+    def __init__(
+        self,
+        session_count: Callable[[], int],
+        max_sessions: int = 0,
+        max_pending_llm_requests: int = 0,
+        max_loop_lag_seconds: float = 0.0,
+        retry_after_seconds: float = 5.0,
+        lag_sample_interval_seconds: float = 0.5,
+        lag_window: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            session_count: Returns the number of sessions open on this worker.
+            max_sessions: Most sessions this worker serves.
+            max_pending_llm_requests: Most LLM calls running before new
+                sessions are refused.
+            max_loop_lag_seconds: Event-loop lag beyond which new sessions
+                are refused.
+            retry_after_seconds: Base retry hint given to refused clients;
+                each gets up to twice this, so they do not return together.
+            lag_sample_interval_seconds: How often the loop lag is sampled.
+            lag_window: Lag samples considered; the worst one counts.
+            clock: Monotonic time source, injectable for tests.
+        """
+        self._session_count = session_count
+        self.max_sessions = max_sessions
+        self.max_pending_llm_requests = max_pending_llm_requests
+        self.max_loop_lag_seconds = max_loop_lag_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.lag_sample_interval_seconds = lag_sample_interval_seconds
+        self._clock = clock
+        self._lag_samples: Deque[float] = deque(maxlen=lag_window)
+        self._lag_task: Optional[asyncio.Task] = None
+        self.draining = False
+
+    @classmethod
+    def from_settings(cls, settings, session_count: Callable[[], int]) -> "AdmissionController":
+        return cls(
+            session_count,
+            max_sessions=settings.ADMISSION_MAX_SESSIONS,
+            max_pending_llm_requests=settings.ADMISSION_MAX_PENDING_LLM_REQUESTS,
+            max_loop_lag_seconds=settings.ADMISSION_MAX_LOOP_LAG_SECONDS,
+            retry_after_seconds=settings.ADMISSION_RETRY_AFTER_SECONDS,
+        )
+
+    async def start(self) -> None:
+        """
+        Starts sampling the event-loop lag.
+        """
+        if self._lag_task is None:
+            self._lag_task = asyncio.create_task(self._sample_loop_lag())
+
+    async def close(self) -> None:
+        """
+        Stops sampling the event-loop lag.
+        """
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            try:
+                await self._lag_task
+            except asyncio.CancelledError:
+                pass
+            self._lag_task = None
+
+    def stop_admitting(self) -> None:
+        """
+        Refuses all sessions from now on, e.g. while draining for shutdown.
+        """
+        self.draining = True
+        self.load()
+
+    @property
+    def loop_lag_seconds(self) -> float:
+        return max(self._lag_samples, default=0.0)
+
+    @property
+    def pending_llm_requests(self) -> int:
+        return int(PENDING_LLM_REQUESTS.value())
+
+    def load(self) -> dict:
+        """
+        Returns the current load: each measure, the score, and whether new
+        sessions are admitted.
+        """
+        usage = {
+            SESSIONS: (self._session_count(), self.max_sessions),
+            LLM_REQUESTS: (self.pending_llm_requests, self.max_pending_llm_requests),
+            LOOP_LAG: (self.loop_lag_seconds, self.max_loop_lag_seconds),
+        }
+        fractions = {reason: used / limit for reason, (used, limit) in usage.items() if limit}
+        score = max(fractions.values(), default=0.0)
+        if self.draining:
+            # Report a full worker, so nothing new is routed here
+            score = max(score, 1.0)
+            fractions[DRAINING] = float("inf")
+        LOAD_SCORE.set(score)
+        return {
+            "score": round(score, 3),
+            "accepting": score < 1,
+            "sessions": usage[SESSIONS][0],
+            "pending_llm_requests": usage[LLM_REQUESTS][0],
+            "loop_lag_seconds": round(usage[LOOP_LAG][0], 4),
+            "limiting": max(fractions, key=fractions.get) if score else None,
+        }
+
+    def check(self, new_session: bool = True) -> Optional[Refusal]:
+        """
+        Decides on one session.
+
+        Args:
+            new_session: False for a resumed session, which is only refused
+                while draining.
+
+        Returns:
+            None to admit it, or the refusal to send the client.
+        """
+        if not new_session and not self.draining:
+            return None
+        load = self.load()
+        if load["accepting"]:
+            ADMISSIONS.inc(outcome="admitted")
+            return None
+        reason = load["limiting"]
+        ADMISSIONS.inc(outcome=reason)
+        logger.warning("Refusing new session, worker overloaded.", reason=reason, load=load)
+        return Refusal(reason, self.retry_hint())
+
+    def retry_hint(self) -> float:
+        """
+        Returns a retry delay for a refused client, spread out with jitter.
+        """
+        return round(self.retry_after_seconds * (1 + random.random()), 1)
+
+    async def _sample_loop_lag(self) -> None:
+        # A sleep that wakes up late measures how long callbacks waited
+        while True:
+            started = self._clock()
+            await asyncio.sleep(self.lag_sample_interval_seconds)
+            lag = max(0.0, self._clock() - started - self.lag_sample_interval_seconds)
+            self._lag_samples.append(lag)
+            LOOP_LAG_SECONDS.set(self.loop_lag_seconds)
+            self.load()
@@ -0,0 +1,218 @@
+# src/signconnect/services/audio_buffer.py
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+import structlog
+
+from signconnect.core.metrics import REGISTRY
+
+logger = structlog.get_logger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+PAUSE = "pause"
+
+# Hard cap, as a multiple of the configured limits, for the pause policy.
+# Clients that ignore a pause request start losing audio past this point.
+PAUSE_HARD_LIMIT_FACTOR = 2
+# A paused client is told to resume once the buffer falls below this fraction
+# of the configured limits.
+RESUME_FRACTION = 0.5
+
+BUFFERED_BYTES = REGISTRY.gauge(
+    "signconnect_audio_buffered_bytes", "Audio bytes waiting for speech-to-text."
+)
+BUFFERED_CHUNKS = REGISTRY.gauge(
+    "signconnect_audio_buffered_chunks", "Audio chunks waiting for speech-to-text."
+)
+DROPPED_CHUNKS = REGISTRY.counter(
+    "signconnect_audio_dropped_chunks_total", "Audio chunks dropped on buffer overflow."
+)
+DROPPED_BYTES = REGISTRY.counter(
+    "signconnect_audio_dropped_bytes_total", "Audio bytes dropped on buffer overflow."
+)
+FLOW_CONTROL_SIGNALS = REGISTRY.counter(
+    "signconnect_audio_flow_control_total", "Flow-control messages sent to clients."
+)
+
+
+class AudioBuffer:
+    """
+    A bounded per-connection buffer of audio chunks awaiting speech-to-text.
+
+    It is bounded both in bytes and in how long the oldest chunk has been
+    waiting, so a stalled STT stream can neither exhaust memory nor have stale
+    audio transcribed long after it mattered. On overflow it either drops the
+    oldest audio or asks the client to pause, depending on the policy.
+
+    The interface mirrors the subset of asyncio.Queue the audio pipeline uses;
+    putting None marks the end of the stream.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_seconds: float,
+        policy: str = DROP_OLDEST,
+        on_flow_control: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_bytes: Maximum buffered audio in bytes.
+            max_seconds: Maximum time a chunk may wait in the buffer.
+            policy: DROP_OLDEST or PAUSE.
+            on_flow_control: Called with "pause" or "resume" when the client
+                should change its sending rate. Must not block.
+            clock: Monotonic time source, injectable for tests.
+        """
+        if policy not in (DROP_OLDEST, PAUSE):
+            raise ValueError(f"Unknown audio overflow policy: {policy}")
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.policy = policy
+        self._on_flow_control = on_flow_control
+        self._clock = clock
+        # Entries are (enqueued_at, chunk). The first chunk of a stream carries
+        # the container header, so it is never dropped before it is consumed.
+        self._chunks: Deque[Tuple[float, bytes]] = deque()
+        self._header_pending = True
+        self._bytes = 0
+        self._closed = False
+        self._not_empty = asyncio.Event()
+        self.paused = False
+        # When the chunk most recently taken out was put, on this buffer's clock
+        self.last_received_at: Optional[float] = None
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+
+    @property
+    def buffered_bytes(self) -> int:
+        """
+        Bytes currently waiting in the buffer.
+        """
+        return self._bytes
+
+    def qsize(self) -> int:
+        """
+        Number of chunks currently waiting in the buffer.
+        """
+        return len(self._chunks)
+
+    def empty(self) -> bool:
+        """
+        Returns True if no chunks are waiting.
+        """
+        return not self._chunks
+
+    async def put(self, chunk: Optional[bytes]) -> None:
+        """
+        Adds a chunk, enforcing the limits. None marks the end of the stream.
+        """
+        self.put_nowait(chunk)
+
+    def put_nowait(self, chunk: Optional[bytes]) -> None:
+        """
+        Synchronous variant of `put`; the buffer never blocks producers.
+        """
+        if chunk is None:
+            self._closed = True
+            self._not_empty.set()
+            return
+
+        self._chunks.append((self._clock(), chunk))
+        self._bytes += len(chunk)
+        BUFFERED_BYTES.inc(len(chunk))
+        BUFFERED_CHUNKS.inc()
+
+        if self.policy == PAUSE:
+            if not self.paused and self._over_limit(1):
+                self._signal("pause")
+            self._drop_while_over_limit(PAUSE_HARD_LIMIT_FACTOR)
+        else:
+            self._drop_while_over_limit(1)
+        self._not_empty.set()
+
+    async def get(self) -> Optional[bytes]:
+        """
+        Waits for and returns the next chunk, or None once the stream has ended
+        and the buffer is drained.
+        """
+        while not self._chunks:
+            if self._closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        # Audio that went stale while the consumer was stalled is not worth sending
+        self._drop_while_over_limit(PAUSE_HARD_LIMIT_FACTOR if self.policy == PAUSE else 1)
+        return self._pop()
+
+    def get_nowait(self) -> Optional[bytes]:
+        """
+        Returns the next chunk if one is waiting.
+
+        Raises:
+            asyncio.QueueEmpty: If no chunk is waiting.
+        """
+        if not self._chunks:
+            if self._closed:
+                return None
+            raise asyncio.QueueEmpty
+        return self._pop()
+
+    def task_done(self) -> None:
+        """
+        No-op kept for asyncio.Queue compatibility.
+        """
+
+    def discard(self) -> None:
+        """
+        Drops everything still buffered, e.g. when the connection closes.
+        """
+        BUFFERED_BYTES.dec(self._bytes)
+        BUFFERED_CHUNKS.dec(len(self._chunks))
+        self._chunks.clear()
+        self._bytes = 0
+        self._closed = True
+        self._not_empty.set()
+
+    def _pop(self) -> bytes:
+        self.last_received_at, chunk = self._chunks.popleft()
+        self._header_pending = False
+        self._bytes -= len(chunk)
+        BUFFERED_BYTES.dec(len(chunk))
+        BUFFERED_CHUNKS.dec()
+        if self.paused and not self._over_limit(RESUME_FRACTION):
+            self._signal("resume")
+        return chunk
+
+    def _over_limit(self, factor: float) -> bool:
+        if self._bytes > self.max_bytes * factor:
+            return True
+        # Age is measured on the oldest droppable chunk, not a pending header
+        oldest = 1 if self._header_pending else 0
+        return len(self._chunks) > oldest and (
+            self._clock() - self._chunks[oldest][0] > self.max_seconds * factor
+        )
+
+    def _drop_while_over_limit(self, factor: float) -> None:
+        while self._over_limit(factor) and len(self._chunks) > 1:
+            # Keep the unconsumed header chunk; drop the oldest audio after it
+            index = 1 if self._header_pending else 0
+            _, chunk = self._chunks[index]
+            del self._chunks[index]
+            self._bytes -= len(chunk)
+            self.dropped_chunks += 1
+            self.dropped_bytes += len(chunk)
+            BUFFERED_BYTES.dec(len(chunk))
+            BUFFERED_CHUNKS.dec()
+            DROPPED_CHUNKS.inc()
+            DROPPED_BYTES.inc(len(chunk))
+
+    def _signal(self, action: str) -> None:
+        self.paused = action == "pause"
+        FLOW_CONTROL_SIGNALS.inc(action=action)
+        logger.info("Audio flow control.", action=action, buffered_bytes=self._bytes)
+        if self._on_flow_control is not None:
+            self._on_flow_control(action)
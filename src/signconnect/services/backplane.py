@@ -0,0 +1,267 @@
+# src/signconnect/services/backplane.py
+import asyncio
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+MEMORY = "memory"
+REDIS = "redis"
+
+# Envelope kinds exchanged between nodes
+BROADCAST = "broadcast"
+USER = "user"
+
+EnvelopeHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class Backplane(ABC):
+    """
+    Interface for the pub/sub channel that links the ConnectionManagers of
+    every worker ("node"), and for the shared record of which users are
+    connected where.
+
+    Envelopes published by one node are delivered to every node, the sender
+    included; receivers skip their own by comparing `origin` to `node_id`.
+    """
+
+    def __init__(self, node_id: Optional[str] = None):
+        """
+        Args:
+            node_id: This worker's id; a random one is generated if omitted.
+        """
+        self.node_id = node_id or uuid.uuid4().hex
+
+    @abstractmethod
+    async def start(self, on_envelope: EnvelopeHandler) -> None:
+        """
+        Subscribes this node; `on_envelope` is called for every envelope.
+        """
+
+    async def close(self) -> None:
+        """
+        Unsubscribes and withdraws this node's presence.
+        """
+
+    @abstractmethod
+    async def publish(self, envelope: Dict[str, Any]) -> None:
+        """
+        Sends an envelope to every node.
+        """
+
+    @abstractmethod
+    async def join(self, user_id: str) -> None:
+        """
+        Records that the user has a connection on this node.
+        """
+
+    @abstractmethod
+    async def leave(self, user_id: str) -> None:
+        """
+        Records that the user has no connection left on this node.
+        """
+
+    @abstractmethod
+    async def is_online(self, user_id: str) -> bool:
+        """
+        Returns whether the user is connected to any node.
+        """
+
+
+class InMemoryHub:
+    """
+    The shared state of in-memory backplanes: subscribers and presence.
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[str, EnvelopeHandler] = {}
+        self.presence: Dict[str, Set[str]] = {}
+
+
+class InMemoryBackplane(Backplane):
+    """
+    A backplane within one process. With its own hub (the default) it serves
+    a single worker; nodes built on the same hub behave like a cluster, which
+    is how multi-node delivery is tested without a broker.
+    """
+
+    def __init__(self, hub: Optional[InMemoryHub] = None, node_id: Optional[str] = None):
+        super().__init__(node_id)
+        self.hub = hub or InMemoryHub()
+
+    async def start(self, on_envelope: EnvelopeHandler) -> None:
+        self.hub.subscribers[self.node_id] = on_envelope
+
+    async def close(self) -> None:
+        self.hub.subscribers.pop(self.node_id, None)
+        for user_id in list(self.hub.presence):
+            await self.leave(user_id)
+
+    async def publish(self, envelope: Dict[str, Any]) -> None:
+        for handler in list(self.hub.subscribers.values()):
+            await handler(envelope)
+
+    async def join(self, user_id: str) -> None:
+        self.hub.presence.setdefault(user_id, set()).add(self.node_id)
+
+    async def leave(self, user_id: str) -> None:
+        nodes = self.hub.presence.get(user_id)
+        if nodes is None:
+            return
+        nodes.discard(self.node_id)
+        if not nodes:
+            del self.hub.presence[user_id]
+
+    async def is_online(self, user_id: str) -> bool:
+        return bool(self.hub.presence.get(user_id))
+
+
+class RedisBackplane(Backplane):
+    """
+    A backplane over Redis (or any server speaking its protocol).
+
+    Envelopes travel on one pub/sub channel. Presence is a hash per user
+    mapping node ids to an expiry time; each node refreshes its users well
+    within the TTL, so a node that dies without cleaning up stops counting
+    once its entries expire.
+
+    Requires the optional `redis` package unless a client is passed in.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        channel: str = "signconnect:websocket",
+        presence_ttl_seconds: float = 30.0,
+        node_id: Optional[str] = None,
+        client: Any = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            url: The server to connect to when no client is given.
+            channel: Pub/sub channel shared by all nodes.
+            presence_ttl_seconds: How long a node's presence entries last
+                without a refresh.
+            node_id: This worker's id; random if omitted.
+            client: An asyncio Redis client, e.g. for tests.
+            clock: Wall-clock time source shared by all nodes' expiry times.
+        """
+        super().__init__(node_id)
+        self.url = url
+        self.channel = channel
+        self.presence_ttl_seconds = presence_ttl_seconds
+        self._client = client
+        self._clock = clock
+        self._pubsub = None
+        self._local_users: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self, on_envelope: EnvelopeHandler) -> None:
+        """
+        Raises:
+            RuntimeError: If no client was given and redis is not installed.
+        """
+        if self._client is None:
+            try:
+                import redis.asyncio
+            except ImportError as e:
+                raise RuntimeError("The redis backplane needs the optional 'redis' package") from e
+            self._client = redis.asyncio.from_url(self.url, decode_responses=True)
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._tasks = [
+            asyncio.create_task(self._listen(on_envelope)),
+            asyncio.create_task(self._refresh_presence()),
+        ]
+        logger.info("Redis backplane subscribed.", channel=self.channel, node_id=self.node_id)
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for user_id in list(self._local_users):
+            await self.leave(user_id)
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._client is not None:
+            await self._client.aclose()
+
+    async def publish(self, envelope: Dict[str, Any]) -> None:
+        await self._client.publish(self.channel, json.dumps(envelope))
+
+    async def join(self, user_id: str) -> None:
+        self._local_users.add(user_id)
+        await self._touch(user_id)
+
+    async def leave(self, user_id: str) -> None:
+        self._local_users.discard(user_id)
+        await self._client.hdel(self._presence_key(user_id), self.node_id)
+
+    async def is_online(self, user_id: str) -> bool:
+        nodes = await self._client.hgetall(self._presence_key(user_id))
+        now = self._clock()
+        return any(float(expires) > now for expires in nodes.values())
+
+    def _presence_key(self, user_id: str) -> str:
+        return f"{self.channel}:presence:{user_id}"
+
+    async def _touch(self, user_id: str) -> None:
+        key = self._presence_key(user_id)
+        await self._client.hset(key, self.node_id, self._clock() + self.presence_ttl_seconds)
+        # Lets the key disappear once no node refreshes it
+        await self._client.expire(key, int(self.presence_ttl_seconds) + 1)
+
+    async def _refresh_presence(self) -> None:
+        while True:
+            await asyncio.sleep(self.presence_ttl_seconds / 3)
+            try:
+                for user_id in list(self._local_users):
+                    await self._touch(user_id)
+            except Exception as e:
+                logger.warning(f"Failed to refresh backplane presence: {e!r}")
+
+    async def _listen(self, on_envelope: EnvelopeHandler) -> None:
+        while True:
+            try:
+                async for item in self._pubsub.listen():
+                    if item.get("type") != "message":
+                        continue
+                    try:
+                        await on_envelope(json.loads(item["data"]))
+                    except Exception as e:
+                        logger.exception(f"Failed to deliver backplane envelope: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Backplane subscription lost, resubscribing: {e!r}")
+            await asyncio.sleep(1.0)
+            try:
+                await self._pubsub.subscribe(self.channel)
+            except Exception:
+                pass  # retried on the next pass
+
+
+def create_backplane(settings) -> Backplane:
+    """
+    Creates the backplane selected by settings.BACKPLANE.
+
+    Raises:
+        ValueError: If the backplane name is unknown.
+    """
+    if settings.BACKPLANE == MEMORY:
+        return InMemoryBackplane()
+    if settings.BACKPLANE == REDIS:
+        return RedisBackplane(
+            url=settings.BACKPLANE_REDIS_URL,
+            presence_ttl_seconds=settings.BACKPLANE_PRESENCE_TTL_SECONDS,
+        )
+    raise ValueError(f"Unknown backplane: {settings.BACKPLANE}")
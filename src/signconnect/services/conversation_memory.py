@@ -0,0 +1,197 @@
+# src/signconnect/services/conversation_memory.py
+import asyncio
+import uuid
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+import structlog
+from sqlalchemy.orm import Session
+
+from signconnect import crud, schemas
+
+logger = structlog.get_logger(__name__)
+
+# A turn is a (speaker, text) pair; speaker is "other" or "user".
+Turn = Tuple[str, str]
+
+
+class ConversationTurnStore:
+    """
+    Persists a session's turns as ConversationTurn rows.
+
+    The Conversation row is created on the first write, so sessions in which
+    nothing is said leave no trace in the database.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], email: str):
+        """
+        Args:
+            session_factory: Callable returning a new database session.
+            email: Email of the authenticated user owning the conversation.
+        """
+        self._session_factory = session_factory
+        self._email = email
+        self._conversation_id: Optional[uuid.UUID] = None
+
+    def __call__(self, turns: List[Turn]) -> None:
+        db = self._session_factory()
+        try:
+            if self._conversation_id is None:
+                db_user = crud.get_user_by_email(db, email=self._email)
+                if db_user is None:
+                    return
+                self._conversation_id = crud.create_conversation(db, user_id=db_user.id).id
+            crud.create_conversation_turns(
+                db,
+                turns=[
+                    schemas.ConversationTurnCreate(transcribed_text=text, speaker=speaker)
+                    for speaker, text in turns
+                ],
+                conversation_id=self._conversation_id,
+            )
+        finally:
+            db.close()
+
+
+class ConversationMemory:
+    """
+    Bounded conversation context for a single websocket session.
+
+    The most recent turns are kept verbatim in a ring buffer. Turns that fall
+    out of the buffer are folded into a rolling summary by a background task,
+    a batch at a time, so building a prompt never waits on summarization and
+    its size stays bounded however long the conversation runs. Evicted turns
+    stay in the context verbatim until their batch has been folded in.
+    """
+
+    def __init__(
+        self,
+        max_turns: int = 6,
+        summary_max_tokens: int = 150,
+        summary_batch_turns: int = 4,
+        summarizer: Optional[Callable[[str, List[str], int], str]] = None,
+        store: Optional[Callable[[List[Turn]], None]] = None,
+    ):
+        """
+        Args:
+            max_turns: Number of recent turns kept verbatim.
+            summary_max_tokens: Approximate size limit for the rolling summary.
+            summary_batch_turns: Number of evicted turns folded into the
+                summary per summarizer call.
+            summarizer: Blocking callable (previous_summary, turns, max_tokens)
+                returning the updated summary. Older turns are dropped if None.
+            store: Blocking callable persisting a batch of turns, if any.
+        """
+        self.max_turns = max_turns
+        self.summary_max_tokens = summary_max_tokens
+        self.summary_batch_turns = max(1, summary_batch_turns)
+        self.summary = ""
+        self._summarizer = summarizer
+        self._store = store
+        self._turns: Deque[Turn] = deque()
+        self._to_summarize: List[Turn] = []
+        self._summarizing: List[Turn] = []
+        self._to_store: List[Turn] = []
+        self._storing: Optional[asyncio.Task] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def turns(self) -> List[Turn]:
+        """
+        The turns currently held verbatim, oldest first.
+        """
+        return list(self._turns)
+
+    def add_turn(self, speaker: str, text: str) -> None:
+        """
+        Records a turn and schedules background summarization and persistence.
+
+        Pre-conditions:
+        - Called from within a running event loop.
+        """
+        text = text.strip()
+        if not text:
+            return
+        turn = (speaker, text)
+        self._turns.append(turn)
+        while len(self._turns) > self.max_turns:
+            evicted = self._turns.popleft()
+            if self._summarizer is not None:
+                self._to_summarize.append(evicted)
+        if self._store is not None:
+            self._to_store.append(turn)
+        if self._to_store or len(self._to_summarize) >= self.summary_batch_turns:
+            self._kick()
+
+    def context(self, exclude_latest: Optional[str] = None) -> List[str]:
+        """
+        Returns the prompt context: the rolling summary, then the evicted
+        turns not yet folded into it, then the recent turns.
+
+        Args:
+            exclude_latest: If the newest turn has this text, it is left out,
+                so the transcript being answered is not repeated as history.
+        """
+        turns = self._summarizing + self._to_summarize + list(self._turns)
+        if turns and exclude_latest is not None and turns[-1][1] == exclude_latest.strip():
+            turns.pop()
+
+        context = []
+        if self.summary:
+            context.append(f"Summary of earlier conversation: {self.summary}")
+        context.extend(f"{speaker}: {text}" for speaker, text in turns)
+        return context
+
+    async def close(self) -> None:
+        """
+        Stops background summarization and flushes any turns not yet persisted.
+
+        A store already running is waited for rather than abandoned, so two
+        stores never run side by side.
+        """
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        await self._flush_store()
+
+    def _kick(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self._to_store or len(self._to_summarize) >= self.summary_batch_turns:
+            await self._flush_store()
+            if len(self._to_summarize) >= self.summary_batch_turns:
+                self._summarizing, self._to_summarize = self._to_summarize, []
+                try:
+                    self.summary = await asyncio.to_thread(
+                        self._summarizer,
+                        self.summary,
+                        [f"{speaker}: {text}" for speaker, text in self._summarizing],
+                        self.summary_max_tokens,
+                    )
+                except Exception as e:
+                    logger.exception(f"Error updating conversation summary: {e}")
+                finally:
+                    self._summarizing = []
+
+    async def _flush_store(self) -> None:
+        if self._storing is not None:
+            await asyncio.wait({self._storing})
+        if not self._to_store:
+            return
+        batch, self._to_store = self._to_store, []
+        self._storing = asyncio.create_task(self._store_batch(batch))
+        # Shielded: cancelling the worker leaves the store running for close()
+        # to wait on, since its thread cannot be stopped anyway.
+        await asyncio.shield(self._storing)
+
+    async def _store_batch(self, batch: List[Turn]) -> None:
+        try:
+            await asyncio.to_thread(self._store, batch)
+        except Exception as e:
+            logger.exception(f"Error persisting conversation turns: {e}")
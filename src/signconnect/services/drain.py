@@ -0,0 +1,141 @@
+# src/signconnect/services/drain.py
+import asyncio
+import signal
+import threading
+import time
+from typing import Callable, Optional
+
+import structlog
+
+from signconnect.core.metrics import REGISTRY
+from signconnect.services.admission import AdmissionController
+from signconnect.services.session_resume import ResumeRegistry
+
+logger = structlog.get_logger(__name__)
+
+DRAINING = REGISTRY.gauge(
+    "signconnect_draining", "1 while this worker drains its connections for shutdown."
+)
+
+
+class ShutdownDrain:
+    """
+    Moves a worker's sessions off it before it shuts down, e.g. during a
+    rolling deploy.
+
+    Draining stops admitting sessions and expires parked ones. Every open
+    connection then hands itself over (see the websocket endpoint): the
+    client is told to reconnect, which the load balancer routes to another
+    worker, while this one finishes the connection's transcripts and
+    suggestions, flushes its writes and closes its speech stream. All of it
+    shares one deadline.
+
+    uvicorn closes websockets as soon as it handles SIGTERM, before the
+    lifespan shutdown runs, so `install` puts the drain in front of
+    uvicorn's own SIGTERM handling.
+    """
+
+    def __init__(
+        self,
+        manager,
+        resumes: ResumeRegistry,
+        admission: AdmissionController,
+        timeout_seconds: float = 20.0,
+        ack_timeout_seconds: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            manager: The worker's ConnectionManager.
+            resumes: The worker's parked sessions.
+            admission: Told to stop admitting sessions.
+            timeout_seconds: Deadline for the whole drain.
+            ack_timeout_seconds: How long a connection waits for its client
+                to acknowledge the reconnect request.
+            clock: Monotonic time source, injectable for tests.
+        """
+        self._manager = manager
+        self._resumes = resumes
+        self._admission = admission
+        self.timeout_seconds = timeout_seconds
+        self.ack_timeout_seconds = ack_timeout_seconds
+        self._clock = clock
+        self.started = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._deadline = float("inf")
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls, settings, manager, resumes, admission) -> "ShutdownDrain":
+        return cls(
+            manager,
+            resumes,
+            admission,
+            timeout_seconds=settings.DRAIN_TIMEOUT_SECONDS,
+        )
+
+    @property
+    def draining(self) -> bool:
+        return self.started.is_set()
+
+    def remaining(self) -> float:
+        """
+        Seconds left before the drain deadline (infinite before draining).
+        """
+        return max(self._deadline - self._clock(), 0.0)
+
+    async def drain(self) -> None:
+        """
+        Drains the worker; returns once every connection is gone or the
+        deadline has passed. Later calls wait for the first one.
+        """
+        if self.started.is_set():
+            await self._finished.wait()
+            return
+        self._deadline = self._clock() + self.timeout_seconds
+        DRAINING.set(1)
+        logger.info("Draining connections.", connections=len(self._manager))
+        self._admission.stop_admitting()
+        self.started.set()
+        expired = await self._resumes.expire_parked()
+        while len(self._manager) and self.remaining() > 0:
+            await asyncio.sleep(0.1)
+        logger.info(
+            "Drain finished.", expired_parked=expired, remaining_connections=len(self._manager)
+        )
+        self._finished.set()
+
+    def install(self) -> None:
+        """
+        Drains on SIGTERM, then hands the signal to the previous handler
+        (uvicorn's, which shuts the server down). A second SIGTERM skips
+        the rest of the drain.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            # Signal handlers can only be set from the main thread (e.g. not
+            # under the test client); shutdown then goes without a drain
+            logger.info("Not in the main thread; SIGTERM will not drain connections.")
+            return
+        loop = asyncio.get_running_loop()
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def shut_down(signum, frame):
+            if callable(previous):
+                previous(signum, frame)
+            else:
+                signal.signal(signal.SIGTERM, previous)
+                signal.raise_signal(signum)
+
+        def start_drain(signum, frame):
+            if self._task is not None:
+                shut_down(signum, frame)
+                return
+            logger.info("SIGTERM received.")
+            self._task = loop.create_task(self.drain())
+            self._task.add_done_callback(lambda _: shut_down(signum, frame))
+
+        def on_sigterm(signum, frame):
+            # Wakes the loop, which may be waiting in select()
+            loop.call_soon_threadsafe(start_drain, signum, frame)
+
+        signal.signal(signal.SIGTERM, on_sigterm)
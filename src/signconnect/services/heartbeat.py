@@ -0,0 +1,79 @@
+# src/signconnect/services/heartbeat.py
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from signconnect.core.metrics import REGISTRY
+
+# Reasons a connection is reaped
+HEARTBEAT_TIMEOUT = "heartbeat_timeout"
+IDLE = "idle"
+
+REAPED_CONNECTIONS = REGISTRY.counter(
+    "signconnect_websocket_reaped_total",
+    "Connections closed by the server, by reason (heartbeat_timeout, idle).",
+)
+
+
+class ConnectionMonitor:
+    """
+    Decides when the server should give up on a connection.
+
+    Any frame from the client proves it is alive. When the line has been
+    quiet for a heartbeat interval the server sends a heartbeat, which the
+    client acknowledges; a client heard from for longer than the timeout is
+    presumed gone (e.g. a half-open TCP connection). Separately, a session
+    with no audio or messages (heartbeat acknowledgements do not count) for
+    the idle timeout is closed.
+    """
+
+    def __init__(
+        self,
+        send_heartbeat: Callable[[], Awaitable[None]],
+        interval_seconds: float = 15.0,
+        timeout_seconds: float = 45.0,
+        idle_timeout_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            send_heartbeat: Sends one heartbeat message to the client.
+            interval_seconds: Quiet time before a heartbeat is sent; also how
+                often the timeouts are checked.
+            timeout_seconds: Silence after which the client is presumed gone.
+            idle_timeout_seconds: Inactivity after which the session is
+                closed; 0 disables the idle policy.
+            clock: Monotonic time source, injectable for tests.
+        """
+        self._send_heartbeat = send_heartbeat
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._clock = clock
+        self.last_seen = self.last_active = clock()
+
+    def frame_received(self, activity: bool = True) -> None:
+        """
+        Records a frame from the client; `activity` is False for heartbeat
+        acknowledgements, which prove liveness but not use.
+        """
+        self.last_seen = self._clock()
+        if activity:
+            self.last_active = self.last_seen
+
+    async def run(self) -> str:
+        """
+        Sends heartbeats until the connection should be closed.
+
+        Returns:
+            The reason: HEARTBEAT_TIMEOUT or IDLE.
+        """
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            now = self._clock()
+            if now - self.last_seen >= self.timeout_seconds:
+                return HEARTBEAT_TIMEOUT
+            if self.idle_timeout_seconds and now - self.last_active >= self.idle_timeout_seconds:
+                return IDLE
+            if now - self.last_seen >= self.interval_seconds:
+                await self._send_heartbeat()
@@ -0,0 +1,123 @@
+# src/signconnect/services/interim_policy.py
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from signconnect.core.metrics import REGISTRY
+
+INTERIM_TRANSCRIPTS = REGISTRY.counter(
+    "signconnect_interim_transcripts_total",
+    "Interim transcripts from speech-to-text, by outcome (sent, coalesced, unchanged).",
+)
+
+
+def encode_delta(previous: str, current: str) -> Dict[str, Any]:
+    """
+    Encodes `current` relative to `previous` as the length of their common
+    prefix plus the remaining suffix.
+    """
+    prefix = 0
+    for a, b in zip(previous, current):
+        if a != b:
+            break
+        prefix += 1
+    return {"type": "interim_transcript_delta", "prefix": prefix, "data": current[prefix:]}
+
+
+class InterimCoalescer:
+    """
+    Outbound policy for one connection's transcripts.
+
+    Interims are rate limited: between sends only the newest interim is kept
+    and it is sent when the interval has passed, so nothing but superseded
+    text is skipped. Interims identical to the last one sent are dropped, and
+    with delta encoding only the changed tail of the text is sent. Finals are
+    sent immediately and discard any interim still waiting.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+        min_interval_seconds: float = 0.25,
+        delta_encoding: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            send: Sends a JSON message to the client.
+            min_interval_seconds: Minimum time between two interim messages.
+            delta_encoding: Send interims as {"prefix", "data"} deltas against
+                the previous interim of the same utterance.
+            clock: Monotonic time source, injectable for tests.
+        """
+        self._send = send
+        self.min_interval_seconds = min_interval_seconds
+        self.delta_encoding = delta_encoding
+        self._clock = clock
+        self._lock = asyncio.Lock()
+        self._pending: Optional[str] = None
+        self._last_sent = ""
+        self._last_sent_at = float("-inf")
+        self._timer: Optional[asyncio.Task] = None
+
+    async def interim(self, text: str) -> None:
+        """
+        Offers an interim transcript for sending.
+        """
+        async with self._lock:
+            if self._pending is not None:
+                INTERIM_TRANSCRIPTS.inc(outcome="coalesced")
+            self._pending = text
+            delay = self._last_sent_at + self.min_interval_seconds - self._clock()
+            if delay <= 0:
+                await self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.create_task(self._flush_later(delay))
+
+    async def final(self, text: str) -> None:
+        """
+        Sends a final transcript immediately, superseding any waiting interim.
+        """
+        self._cancel_timer()
+        async with self._lock:
+            if self._pending is not None:
+                INTERIM_TRANSCRIPTS.inc(outcome="coalesced")
+            self._pending = None
+            self._last_sent = ""
+            self._last_sent_at = float("-inf")
+            await self._send({"type": "final_transcript", "data": text})
+
+    def close(self) -> None:
+        """
+        Drops any waiting interim, e.g. when the connection closes.
+        """
+        self._cancel_timer()
+        self._pending = None
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        # From here on the flush runs to completion; a final waits for the lock
+        self._timer = None
+        async with self._lock:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        text, self._pending = self._pending, None
+        if text is None:
+            return
+        if text == self._last_sent:
+            INTERIM_TRANSCRIPTS.inc(outcome="unchanged")
+            return
+        if self.delta_encoding:
+            message = encode_delta(self._last_sent, text)
+        else:
+            message = {"type": "interim_transcript", "data": text}
+        self._last_sent = text
+        self._last_sent_at = self._clock()
+        INTERIM_TRANSCRIPTS.inc(outcome="sent")
+        await self._send(message)
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,149 @@
+# src/signconnect/services/message_dispatch.py
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import structlog
+
+from signconnect.core.metrics import REGISTRY
+
+logger = structlog.get_logger(__name__)
+
+INLINE = None
+SUGGESTIONS_LANE = "suggestions"
+CONTROL_LANE = "control"
+
+DISPATCHED_MESSAGES = REGISTRY.counter(
+    "signconnect_dispatched_messages_total",
+    "Client control messages by outcome (inline, queued, dropped, failed).",
+)
+
+
+def default_lane(message: Dict[str, Any]) -> Optional[str]:
+    """
+    Picks the lane for a client message.
+
+    Audio (protocol v1) is handled inline so the receive loop feeds the
+    audio buffer directly. Suggestion requests, which wait on the database
+    and the LLM, get their own lane so they cannot hold up the quick
+    control messages, which keep their order in the control lane.
+    """
+    msg_type = message.get("type")
+    if msg_type == "audio":
+        return INLINE
+    if msg_type == "get_suggestions":
+        return SUGGESTIONS_LANE
+    return CONTROL_LANE
+
+
+class MessageDispatcher:
+    """
+    Runs one connection's message handlers off the receive loop.
+
+    Messages are grouped into lanes. Within a lane they are handled one at a
+    time in arrival order; different lanes run concurrently, up to
+    `max_concurrency` handlers at once. Each lane holds at most `max_pending`
+    waiting messages; beyond that the oldest is dropped (for suggestions it
+    is also the stalest). A lane's worker task exists only while the lane has
+    work.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Dict[str, Any]], Awaitable[None]],
+        max_concurrency: int = 4,
+        max_pending: int = 16,
+        lane_for: Callable[[Dict[str, Any]], Optional[str]] = default_lane,
+    ):
+        """
+        Args:
+            handler: Handles one message, e.g. a bound handle_message.
+            max_concurrency: Most handlers running at once across lanes.
+            max_pending: Most messages waiting in one lane.
+            lane_for: Maps a message to its lane, or INLINE to handle it in
+                the caller.
+        """
+        self._handler = handler
+        self.max_pending = max_pending
+        self._lane_for = lane_for
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._pending: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._closed = False
+
+    async def dispatch(self, message: Dict[str, Any]) -> None:
+        """
+        Hands a message to its lane, or handles it now if it is inline.
+
+        Returns without waiting for queued messages to be handled.
+        """
+        if self._closed:
+            return
+        lane = self._lane_for(message)
+        if lane is INLINE:
+            DISPATCHED_MESSAGES.inc(outcome="inline")
+            await self._handler(message)
+            return
+
+        pending = self._pending.setdefault(lane, deque())
+        if len(pending) >= self.max_pending:
+            dropped = pending.popleft()
+            DISPATCHED_MESSAGES.inc(outcome="dropped")
+            logger.warning(
+                f"Dropping queued '{dropped.get('type')}' message; lane '{lane}' is full."
+            )
+        pending.append(message)
+        DISPATCHED_MESSAGES.inc(outcome="queued")
+        if lane not in self._workers:
+            self._workers[lane] = asyncio.create_task(self._drain(lane))
+
+    async def join(self, timeout_seconds: float) -> bool:
+        """
+        Waits for the waiting and running handlers to finish, without
+        cancelling them.
+
+        Returns:
+            True if they finished within the timeout.
+        """
+        workers = list(self._workers.values())
+        if not workers:
+            return True
+        _, unfinished = await asyncio.wait(workers, timeout=max(timeout_seconds, 0))
+        return not unfinished
+
+    async def close(self) -> None:
+        """
+        Cancels running handlers and discards waiting messages.
+        """
+        self._closed = True
+        self._pending.clear()
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    @property
+    def pending(self) -> int:
+        """
+        Messages waiting across all lanes, not counting running handlers.
+        """
+        return sum(len(pending) for pending in self._pending.values())
+
+    async def _drain(self, lane: str) -> None:
+        pending = self._pending[lane]
+        try:
+            while pending:
+                message = pending.popleft()
+                async with self._slots:
+                    try:
+                        await self._handler(message)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        # One bad message must not take the connection down
+                        DISPATCHED_MESSAGES.inc(outcome="failed")
+                        logger.exception(
+                            f"Error handling '{message.get('type')}' message: {e}"
+                        )
+        finally:
+            self._workers.pop(lane, None)
@@ -0,0 +1,245 @@
+# src/signconnect/services/outbound_queue.py
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import structlog
+from fastapi import WebSocket, status
+
+from signconnect.core.metrics import REGISTRY
+from signconnect.services.protocol import JSON_ENCODING, Frame
+
+logger = structlog.get_logger(__name__)
+
+HIGH = 0
+LOW = 1
+# Interims are superseded by the next interim or final; everything else
+# (finals, suggestions, control replies) goes ahead of them.
+LOW_PRIORITY_TYPES = {"interim_transcript", "interim_transcript_delta"}
+
+OUTBOUND_DROPPED = REGISTRY.counter(
+    "signconnect_outbound_dropped_total",
+    "Queued interim messages dropped because newer text superseded them or the queue was full.",
+)
+OUTBOUND_BATCHES = REGISTRY.counter(
+    "signconnect_outbound_batches_total", "Websocket frames carrying more than one message."
+)
+
+
+class OutboundQueue:
+    """
+    A bounded queue of messages to one client, drained by a single writer task.
+
+    Only the writer touches the socket, so concurrent producers (transcripts,
+    suggestions, control replies) never interleave sends. High-priority
+    messages are sent before interims, and interims that newer text has made
+    obsolete are dropped. When several messages are waiting and the client
+    supports it, they are sent together as one "batch" frame. Messages are
+    queued already encoded for the client's protocol (`encoding`).
+
+    A client that cannot keep up is closed: when a send exceeds the timeout,
+    or when the queue is full of messages that cannot be dropped.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_messages: int = 256,
+        max_batch: int = 16,
+        send_timeout_seconds: float = 5.0,
+        batching: bool = False,
+        on_close: Optional[Callable[[WebSocket, str], None]] = None,
+        encoding=JSON_ENCODING,
+    ):
+        """
+        Args:
+            websocket: The client's socket.
+            max_messages: Cap on queued messages, bounding memory per connection.
+            max_batch: Most messages sent in one frame.
+            send_timeout_seconds: A single send slower than this closes the connection.
+            batching: Whether the client understands "batch" frames.
+            on_close: Called with the socket and a reason when the queue closes
+                a slow consumer.
+            encoding: The client's wire encoding (JSON or MessagePack).
+        """
+        self._websocket = websocket
+        self.max_messages = max_messages
+        self.max_batch = max_batch
+        self.send_timeout_seconds = send_timeout_seconds
+        self.batching = batching
+        self._on_close = on_close
+        self.encoding = encoding
+        # Entries are (message type, encoded message)
+        self._high: Deque[Tuple[str, Frame]] = deque()
+        self._low: Deque[Tuple[str, Frame]] = deque()
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+        # Set when a delta-encoded interim was dropped: later deltas would be
+        # applied to text the client never received, so they are dropped too
+        # until a final or a full interim resets the client's state.
+        self._deltas_broken = False
+        self.closed = False
+
+    def __len__(self) -> int:
+        return len(self._high) + len(self._low)
+
+    def start(self) -> None:
+        """
+        Starts the writer task.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def put(self, message: Dict[str, Any]) -> bool:
+        """
+        Queues a message without blocking.
+
+        Returns:
+            False if the connection is closed or was just closed as too slow.
+        """
+        message_type = message.get("type", "")
+        priority = LOW if message_type in LOW_PRIORITY_TYPES else HIGH
+        return self.put_encoded(self.encoding.encode(message), priority, message_type)
+
+    def put_encoded(self, encoded: Frame, priority: int = HIGH, message_type: str = "") -> bool:
+        """
+        Queues a message already encoded with `encoding`, without blocking.
+        """
+        if self.closed:
+            return False
+
+        if message_type == "final_transcript":
+            # The final replaces every interim of the utterance
+            self._drop_interims()
+            self._deltas_broken = False
+        if priority == LOW:
+            if message_type == "interim_transcript":
+                self._drop_interims()
+                self._deltas_broken = False
+            elif self._deltas_broken:
+                OUTBOUND_DROPPED.inc()
+                return True
+            self._low.append((message_type, encoded))
+        else:
+            self._high.append((message_type, encoded))
+
+        if len(self) > self.max_messages:
+            self._drop_interims()
+            if len(self) > self.max_messages:
+                self._close_slow_consumer("outbound queue full")
+                return False
+        self._idle.clear()
+        self._ready.set()
+        return True
+
+    async def drain(self, timeout_seconds: float) -> bool:
+        """
+        Waits until everything queued has been sent.
+
+        Returns:
+            True if the queue emptied within the timeout.
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout_seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def pause(self) -> None:
+        """
+        Stops the writer but keeps accepting messages, e.g. while the client
+        reconnects. The usual limits still apply to what piles up.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def attach(self, websocket: WebSocket, batching: bool = False, encoding=None) -> None:
+        """
+        Moves the queue to a new socket and restarts the writer there, so
+        messages queued in the meantime are delivered. If the new socket
+        negotiated another encoding, they are re-encoded for it.
+        """
+        self.pause()
+        self._websocket = websocket
+        self.batching = batching
+        if encoding is not None and encoding is not self.encoding:
+            for queue in (self._high, self._low):
+                entries = list(queue)
+                queue.clear()
+                queue.extend(
+                    (message_type, encoding.encode(message))
+                    for message_type, encoded in entries
+                    for message in self.encoding.decode(encoded)
+                )
+            self.encoding = encoding
+        self.start()
+
+    def stop(self) -> None:
+        """
+        Stops the writer and discards anything still queued.
+        """
+        self.closed = True
+        self._high.clear()
+        self._low.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    def _drop_interims(self) -> None:
+        if not self._low:
+            return
+        OUTBOUND_DROPPED.inc(len(self._low))
+        if any(message_type == "interim_transcript_delta" for message_type, _ in self._low):
+            self._deltas_broken = True
+        self._low.clear()
+
+    def _take(self, limit: int) -> List[Tuple[str, Frame]]:
+        batch = []
+        while len(batch) < limit and (self._high or self._low):
+            queue = self._high if self._high else self._low
+            batch.append(queue.popleft())
+        return batch
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                if not self._high and not self._low:
+                    self._idle.set()
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                batch = self._take(self.max_batch if self.batching else 1)
+                if len(batch) > 1:
+                    OUTBOUND_BATCHES.inc()
+                await asyncio.wait_for(
+                    self.encoding.send(self._websocket, self.encoding.frame(batch)),
+                    timeout=self.send_timeout_seconds,
+                )
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self._close_slow_consumer("send timed out")
+        except Exception as e:
+            # The socket is gone; the receive loop will clean up
+            logger.info(f"Outbound writer stopped: {e!r}")
+            self.closed = True
+            self._idle.set()
+
+    def _close_slow_consumer(self, reason: str) -> None:
+        logger.warning("Closing slow websocket consumer.", reason=reason, queued=len(self))
+        self.stop()
+        self._idle.set()
+        asyncio.create_task(self._close_socket())
+        if self._on_close is not None:
+            self._on_close(self._websocket, reason)
+
+    async def _close_socket(self) -> None:
+        try:
+            await asyncio.wait_for(
+                self._websocket.close(code=status.WS_1013_TRY_AGAIN_LATER),
+                timeout=self.send_timeout_seconds,
+            )
+        except Exception:
+            pass
@@ -0,0 +1,114 @@
+# src/signconnect/services/preference_selector.py
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from signconnect import crud
+from signconnect.llm.client import estimate_tokens
+
+
+class PreferenceSelector:
+    """
+    Selects the user preferences most relevant to a transcript.
+
+    One instance lives for the duration of a websocket connection. It loads the
+    user's preference embeddings once, reloads them after `refresh_seconds`
+    so mid-session edits are picked up, and ranks them in memory for each
+    transcript. Prompt size therefore stays flat however many preferences a
+    user accumulates. Selections run in worker threads, possibly two at once
+    for one session, so loading is serialized.
+    """
+
+    def __init__(
+        self,
+        top_k: int = 5,
+        token_budget: int = 200,
+        refresh_seconds: float = 60.0,
+    ):
+        """
+        Initializes the selector.
+
+        Args:
+            top_k: Maximum number of preferences returned per selection.
+            token_budget: Approximate token budget for the returned preferences.
+            refresh_seconds: How long the loaded preferences are reused.
+        """
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self.refresh_seconds = refresh_seconds
+        self._user_id: Optional[uuid.UUID] = None
+        self._loaded_at: float = 0.0
+        self._texts: List[str] = []
+        self._embeddings: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """
+        Forces the next selection to reload preferences from the database.
+        """
+        self._loaded_at = 0.0
+
+    def all(self, db: Session, user_id: uuid.UUID) -> List[str]:
+        """
+        Returns every preference text of the user, in storage order.
+        """
+        texts, _ = self._ensure_loaded(db, user_id)
+        return list(texts)
+
+    def select(self, db: Session, user_id: uuid.UUID, query_embedding) -> List[str]:
+        """
+        Returns up to `top_k` preference texts ranked by similarity to the
+        query embedding, skipping any that would exceed the token budget.
+
+        Pre-conditions:
+        - `query_embedding` was produced by the same model as the stored
+          preference embeddings.
+        """
+        texts, embeddings = self._ensure_loaded(db, user_id)
+        if embeddings is None or not texts:
+            return []
+
+        # Embeddings are unit-normalised, so the dot product is cosine similarity
+        scores = embeddings @ np.asarray(query_embedding, dtype=np.float32)
+        ranked = np.argsort(-scores)
+
+        selected: List[str] = []
+        used_tokens = 0
+        for index in ranked:
+            if len(selected) >= self.top_k:
+                break
+            text = texts[index]
+            cost = estimate_tokens(text)
+            if used_tokens + cost > self.token_budget:
+                continue
+            selected.append(text)
+            used_tokens += cost
+        return selected
+
+    def _ensure_loaded(
+        self, db: Session, user_id: uuid.UUID
+    ) -> Tuple[List[str], Optional[np.ndarray]]:
+        with self._lock:
+            now = time.monotonic()
+            if user_id != self._user_id or now - self._loaded_at >= self.refresh_seconds:
+                preferences = list(
+                    crud.get_user_preferences_with_embeddings(db, user_id=user_id)
+                )
+                self._texts = [pref.preference_text for pref in preferences]
+                self._embeddings = (
+                    np.vstack(
+                        [
+                            np.asarray(pref.preference_embedding, dtype=np.float32)
+                            for pref in preferences
+                        ]
+                    )
+                    if preferences
+                    else None
+                )
+                self._user_id = user_id
+                self._loaded_at = now
+            return self._texts, self._embeddings
@@ -0,0 +1,255 @@
+# src/signconnect/services/protocol.py
+import json
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+# Version 1 (no subprotocol): every frame is JSON text and audio arrives
+# base64-encoded in {"type": "audio", "data": ...} messages.
+PROTOCOL_V1 = 1
+# Version 2: audio arrives as raw binary frames; JSON text frames carry
+# control messages only.
+PROTOCOL_V2 = 2
+# Version 3: as version 2, but messages to the client are MessagePack binary
+# frames with short type codes, large ones deflate-compressed. Only that
+# direction changes: the client's control messages (get_suggestions,
+# heartbeat_ack, session_options, reconnect_ack...) stay JSON text frames,
+# since every binary frame from the client is audio.
+PROTOCOL_V3 = 3
+
+# Subprotocol names offered by clients in Sec-WebSocket-Protocol, newest first.
+SUBPROTOCOLS = {
+    "signconnect.v3": PROTOCOL_V3,
+    "signconnect.v2": PROTOCOL_V2,
+}
+
+# Message classes, for per-class compression. Audio is not one of them: it
+# is already Opus-compressed and is never compressed again.
+TRANSCRIPT = "transcript"
+SUGGESTIONS = "suggestions"
+CONTROL = "control"
+MESSAGE_CLASSES = {
+    "interim_transcript": TRANSCRIPT,
+    "interim_transcript_delta": TRANSCRIPT,
+    "final_transcript": TRANSCRIPT,
+    "suggestions": SUGGESTIONS,
+}
+
+# Protocol v3 type codes and the positional fields that follow them. A
+# message is encoded as [code, *fields]; one that does not fit its schema
+# (or has no code) as [GENERIC_CODE, message]. Mirrored in the frontend.
+GENERIC_CODE = 0
+BATCH_CODE = 1
+MESSAGE_CODES: Dict[str, Tuple[int, Tuple[str, ...]]] = {
+    "interim_transcript": (2, ("data",)),
+    "interim_transcript_delta": (3, ("prefix", "data")),
+    "final_transcript": (4, ("data",)),
+    "suggestions": (5, ("data",)),
+    "flow_control": (6, ("action",)),
+    "heartbeat": (7, ()),
+    "session_resume": (8, ("token", "grace_seconds")),
+    "session_options": (9, ("server_suggestions",)),
+    "pong": (10, ("data",)),
+    "reconnect": (11, ("reason",)),
+}
+_MESSAGE_TYPES = {code: (name, fields) for name, (code, fields) in MESSAGE_CODES.items()}
+
+Frame = Union[str, bytes]
+
+
+def message_class(message_type: str) -> str:
+    """
+    Returns the compression class of a message type.
+    """
+    return MESSAGE_CLASSES.get(message_type, CONTROL)
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise RuntimeError(
+            "Protocol v3 needs the optional 'msgpack' package: pip install msgpack"
+        ) from e
+    return msgpack
+
+
+@lru_cache(maxsize=1)
+def msgpack_available() -> bool:
+    """
+    Returns whether protocol v3 can be offered.
+    """
+    try:
+        _msgpack()
+    except RuntimeError:
+        return False
+    return True
+
+
+class JsonEncoding:
+    """
+    Encodes messages to the client as JSON text frames (protocols v1 and v2).
+    """
+
+    def encode(self, message: Dict[str, Any]) -> str:
+        return json.dumps(message)
+
+    def frame(self, messages: Sequence[Tuple[str, str]]) -> str:
+        """
+        Builds one frame from encoded (message type, message) pairs: the
+        message itself, or a "batch" frame holding all of them.
+        """
+        if len(messages) == 1:
+            return messages[0][1]
+        return '{"type": "batch", "messages": [' + ", ".join(m for _, m in messages) + "]}"
+
+    def decode(self, frame: Frame) -> List[Dict[str, Any]]:
+        """
+        Returns the messages in a frame, unpacking batches.
+        """
+        message = json.loads(frame)
+        if message.get("type") == "batch":
+            return message["messages"]
+        return [message]
+
+    async def send(self, websocket: WebSocket, frame: Frame) -> None:
+        await websocket.send_text(frame)
+
+
+class MsgPackEncoding:
+    """
+    Encodes messages to the client as MessagePack binary frames (protocol v3).
+
+    Type names and keys are replaced by the short codes and positional
+    fields of MESSAGE_CODES. A frame of at least `compression_min_bytes`
+    holding a message of a compressed class is sent deflated (raw deflate,
+    wrapped in a MessagePack bin) instead.
+
+    Limitations: this covers server-to-client messages only; client control
+    messages are decoded as JSON text (see `receive_frame`). Compression is
+    per message class, at the application level, rather than tuned
+    permessage-deflate: that extension applies to every frame in both
+    directions, including audio that is already Opus-compressed, so it is
+    left off (see docker-compose) and each frame is deflated on its own,
+    without a shared window across frames.
+    """
+
+    def __init__(
+        self,
+        compressed_classes: Iterable[str] = (TRANSCRIPT, SUGGESTIONS, CONTROL),
+        compression_min_bytes: int = 256,
+    ):
+        """
+        Args:
+            compressed_classes: Message classes whose frames may be compressed.
+            compression_min_bytes: Smaller frames are never compressed; 0
+                disables compression.
+
+        Raises:
+            RuntimeError: If msgpack is not installed.
+        """
+        self._msgpack = _msgpack()
+        self._packer = self._msgpack.Packer()
+        self.compressed_classes = frozenset(compressed_classes)
+        self.compression_min_bytes = compression_min_bytes
+
+    @classmethod
+    def from_settings(cls, settings) -> "MsgPackEncoding":
+        return cls(
+            compressed_classes=settings.WS_COMPRESSED_MESSAGE_CLASSES,
+            compression_min_bytes=settings.WS_COMPRESSION_MIN_BYTES,
+        )
+
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        code, fields = MESSAGE_CODES.get(message.get("type"), (GENERIC_CODE, ()))
+        if code != GENERIC_CODE and len(message) == len(fields) + 1 and all(
+            field in message for field in fields
+        ):
+            return self._packer.pack([code, *(message[field] for field in fields)])
+        return self._packer.pack([GENERIC_CODE, message])
+
+    def frame(self, messages: Sequence[Tuple[str, bytes]]) -> bytes:
+        """
+        Builds one frame from encoded (message type, message) pairs: the
+        message itself, or [BATCH_CODE, *messages]; compressed if it qualifies.
+        """
+        if len(messages) == 1:
+            frame = messages[0][1]
+        else:
+            # The messages are MessagePack already; only the header is new
+            frame = b"".join(
+                [self._packer.pack_array_header(len(messages) + 1), self._packer.pack(BATCH_CODE)]
+                + [m for _, m in messages]
+            )
+        if (
+            self.compression_min_bytes
+            and len(frame) >= self.compression_min_bytes
+            and any(message_class(t) in self.compressed_classes for t, _ in messages)
+        ):
+            compressor = zlib.compressobj(wbits=-15)
+            return self._packer.pack(compressor.compress(frame) + compressor.flush())
+        return frame
+
+    def decode(self, frame: Frame) -> List[Dict[str, Any]]:
+        """
+        Returns the messages in a frame, decompressing it and unpacking batches.
+        """
+        value = self._msgpack.unpackb(frame)
+        if isinstance(value, bytes):
+            value = self._msgpack.unpackb(zlib.decompress(value, wbits=-15))
+        if value[0] == BATCH_CODE:
+            return [self._decode_message(m) for m in value[1:]]
+        return [self._decode_message(value)]
+
+    def _decode_message(self, value: List[Any]) -> Dict[str, Any]:
+        if value[0] == GENERIC_CODE:
+            return value[1]
+        name, fields = _MESSAGE_TYPES[value[0]]
+        return {"type": name, **dict(zip(fields, value[1:]))}
+
+    async def send(self, websocket: WebSocket, frame: Frame) -> None:
+        await websocket.send_bytes(frame)
+
+
+JSON_ENCODING = JsonEncoding()
+
+
+def negotiate_protocol(
+    offered: List[str], max_version: int = PROTOCOL_V3
+) -> Tuple[Optional[str], int]:
+    """
+    Picks the newest protocol version offered by the client, up to
+    `max_version`. Version 3 is only picked if msgpack is installed.
+
+    Returns:
+        The subprotocol to echo when accepting (None for version 1), and the
+        negotiated protocol version.
+    """
+    for name, version in SUBPROTOCOLS.items():
+        if version > max_version or (version == PROTOCOL_V3 and not msgpack_available()):
+            continue
+        if name in offered:
+            return name, version
+    return None, PROTOCOL_V1
+
+
+async def receive_frame(websocket: WebSocket) -> Tuple[Optional[bytes], Optional[Dict[str, Any]]]:
+    """
+    Receives one frame from the client.
+
+    Returns:
+        (audio, None) for a binary frame, or (None, message) for a JSON text
+        frame. Under every protocol version, binary frames from the client
+        are audio and control messages are JSON.
+
+    Raises:
+        WebSocketDisconnect: If the client disconnected.
+    """
+    frame = await websocket.receive()
+    if frame["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(frame.get("code", 1000), frame.get("reason"))
+    if frame.get("bytes") is not None:
+        return frame["bytes"], None
+    return None, json.loads(frame["text"])
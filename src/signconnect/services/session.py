@@ -0,0 +1,206 @@
+# src/signconnect/services/session.py
+import asyncio
+import threading
+import uuid
+from typing import Awaitable, Callable, List, Optional
+
+import structlog
+from sqlalchemy.orm import Session
+
+from signconnect.core.config import Settings
+from signconnect.llm.circuit_breaker import CircuitBreaker
+from signconnect.llm.client import GeminiClient, PromptCache
+from signconnect.services.admission import track_llm_call
+from signconnect.services.conversation_memory import ConversationMemory, Turn
+from signconnect.services.preference_selector import PreferenceSelector
+
+logger = structlog.get_logger(__name__)
+
+
+class ConversationSession:
+    """
+    Holds the state that lives for the duration of one websocket connection.
+    """
+
+    def __init__(
+        self,
+        preferences: PreferenceSelector | None = None,
+        memory: ConversationMemory | None = None,
+        pregenerated_max_distance: float | None = None,
+        prompt_cache_min_tokens: int | None = None,
+        prompt_cache_ttl_seconds: int = 3600,
+        breaker: CircuitBreaker | None = None,
+        suggestion_timeout_seconds: float = 4.0,
+        server_suggestions: bool = False,
+    ):
+        """
+        Initializes the session state.
+
+        Args:
+            preferences: Selector for the preferences injected into prompts.
+            memory: Rolling memory of the conversation so far.
+            pregenerated_max_distance: Maximum distance at which a stored
+                question's pre-generated suggestions are served. None disables it.
+            prompt_cache_min_tokens: Smallest prompt prefix worth caching on the
+                provider. None disables provider-side caching.
+            prompt_cache_ttl_seconds: Provider-side lifetime of the cache.
+            breaker: Worker-wide circuit breaker guarding LLM calls, if any.
+            suggestion_timeout_seconds: Latency budget for live suggestions.
+            server_suggestions: Push suggestions on every final transcript
+                instead of waiting for the client to request them.
+        """
+        self.preferences = preferences or PreferenceSelector()
+        self.memory = memory or ConversationMemory()
+        self.pregenerated_max_distance = pregenerated_max_distance
+        self.prompt_cache_min_tokens = prompt_cache_min_tokens
+        self.prompt_cache_ttl_seconds = prompt_cache_ttl_seconds
+        self.prompt_cache: Optional[PromptCache] = None
+        self._prompt_cache_task: Optional[asyncio.Task] = None
+        # Guards prompt_cache against a creation finishing as the session closes
+        self._prompt_cache_lock = threading.Lock()
+        self._closed = False
+        self.breaker = breaker
+        self.suggestion_timeout_seconds = suggestion_timeout_seconds
+        self.server_suggestions = server_suggestions
+        self._suggestion_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        llm_client: Optional[GeminiClient] = None,
+        turn_store: Optional[Callable[[List[Turn]], None]] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> "ConversationSession":
+        """
+        Creates the session state for a new connection from the app settings.
+
+        Args:
+            settings: The application settings.
+            llm_client: Client used to summarize older turns, if any.
+            turn_store: Callable persisting conversation turns, if any.
+            breaker: Worker-wide circuit breaker guarding LLM calls, if any.
+        """
+        return cls(
+            preferences=PreferenceSelector(
+                top_k=settings.PREFERENCE_TOP_K,
+                token_budget=settings.PREFERENCE_TOKEN_BUDGET,
+                refresh_seconds=settings.PREFERENCE_CACHE_TTL_SECONDS,
+            ),
+            memory=ConversationMemory(
+                max_turns=settings.CONVERSATION_MEMORY_TURNS,
+                summary_max_tokens=settings.CONVERSATION_SUMMARY_MAX_TOKENS,
+                summary_batch_turns=settings.CONVERSATION_SUMMARY_BATCH_TURNS,
+                summarizer=(
+                    track_llm_call(llm_client.summarize_conversation) if llm_client else None
+                ),
+                store=turn_store,
+            ),
+            pregenerated_max_distance=settings.SUGGESTION_PREGEN_MATCH_DISTANCE,
+            prompt_cache_min_tokens=settings.PROMPT_CACHE_MIN_TOKENS,
+            prompt_cache_ttl_seconds=settings.PROMPT_CACHE_TTL_SECONDS,
+            breaker=breaker,
+            suggestion_timeout_seconds=settings.SUGGESTION_TIMEOUT_SECONDS,
+            server_suggestions=settings.SERVER_SUGGESTIONS_DEFAULT,
+        )
+
+    async def ensure_prompt_cache(
+        self, llm_client: GeminiClient, db: Session, user_id: uuid.UUID
+    ) -> None:
+        """
+        Starts creating the session's provider-side prompt cache, once.
+
+        Creation runs in the background; until it completes (or if the prefix
+        is too small to cache) `prompt_cache` stays None and prompts are sent
+        uncached.
+
+        The cache holds the user's full preference list, not the top-k
+        selection made per transcript: that selection changes every turn,
+        and a cached prefix is only reused if it is identical. A profile big
+        enough to reach the provider's minimum is cheaper to send whole from
+        the cache than selected and uncached.
+        """
+        if self.prompt_cache_min_tokens is None or self._prompt_cache_task is not None:
+            return
+        user_preferences = await asyncio.to_thread(self.preferences.all, db, user_id=user_id)
+        if self._prompt_cache_task is not None:
+            return  # started by a concurrent request meanwhile
+        self._prompt_cache_task = asyncio.create_task(
+            self._create_prompt_cache(llm_client, user_preferences)
+        )
+
+    async def _create_prompt_cache(
+        self, llm_client: GeminiClient, user_preferences: List[str]
+    ) -> None:
+        try:
+            await asyncio.to_thread(
+                self._store_prompt_cache,
+                track_llm_call(llm_client.create_prompt_cache),
+                user_preferences,
+            )
+        except Exception as e:
+            logger.exception(f"Error creating prompt cache: {e}")
+
+    def _store_prompt_cache(
+        self, create: Callable[..., Optional[PromptCache]], user_preferences: List[str]
+    ) -> None:
+        # Runs in a worker thread, which carries on if close() cancels the
+        # task waiting for it; a cache created too late is deleted here
+        cache = create(
+            user_preferences, self.prompt_cache_min_tokens, self.prompt_cache_ttl_seconds
+        )
+        with self._prompt_cache_lock:
+            if not self._closed:
+                self.prompt_cache = cache
+                return
+        if cache is not None:
+            cache.delete()
+
+    def start_suggestions(self, generate: Awaitable[None]) -> None:
+        """
+        Runs server-initiated suggestion generation in the background.
+
+        Only the newest transcript's suggestions matter, so generation still
+        running for an earlier one is cancelled.
+        """
+        if self._suggestion_task is not None and not self._suggestion_task.done():
+            self._suggestion_task.cancel()
+        self._suggestion_task = asyncio.create_task(generate)
+        self._suggestion_task.add_done_callback(self._log_suggestion_error)
+
+    async def wait_for_suggestions(self, timeout_seconds: float) -> bool:
+        """
+        Waits for server-initiated suggestion generation still running.
+
+        Returns:
+            True if none is left running within the timeout.
+        """
+        task = self._suggestion_task
+        if task is None or task.done():
+            return True
+        _, unfinished = await asyncio.wait({task}, timeout=max(timeout_seconds, 0))
+        return not unfinished
+
+    @staticmethod
+    def _log_suggestion_error(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error pushing suggestions: {task.exception()}")
+
+    async def close(self) -> None:
+        """
+        Releases the session's background work and provider-side resources.
+        """
+        with self._prompt_cache_lock:
+            self._closed = True
+            prompt_cache, self.prompt_cache = self.prompt_cache, None
+        if self._suggestion_task is not None and not self._suggestion_task.done():
+            self._suggestion_task.cancel()
+        await self.memory.close()
+        if self._prompt_cache_task is not None and not self._prompt_cache_task.done():
+            self._prompt_cache_task.cancel()
+            try:
+                await self._prompt_cache_task
+            except asyncio.CancelledError:
+                pass
+        if prompt_cache is not None:
+            await asyncio.to_thread(prompt_cache.delete)
@@ -0,0 +1,143 @@
+# src/signconnect/services/session_recording.py
+import asyncio
+import datetime
+import os
+import struct
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Recording file layout: the magic line, then one record per inbound frame.
+# Each record is a header (kind, milliseconds since the session started,
+# payload length) followed by the payload: raw audio bytes or UTF-8 JSON text.
+MAGIC = b"SCREC1\n"
+RECORD_HEADER = struct.Struct(">BII")
+AUDIO = 1
+CONTROL = 2
+FILE_SUFFIX = ".screc"
+
+# One thread writes every recording, so file I/O stays off the event loop
+# and each recording's writes land in order
+_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-recording")
+
+
+class RecordedFrame(NamedTuple):
+    """One inbound websocket frame of a recorded session."""
+
+    kind: int
+    offset_seconds: float
+    payload: bytes
+
+
+class SessionRecorder:
+    """
+    Writes one connection's inbound audio chunks and control messages, with
+    their arrival times, to a compact binary file for later replay.
+
+    Only frames received after authentication are recorded, so tokens never
+    reach the disk. Files are named by time and a random id, not by user.
+    Frames are buffered in memory and written by a background thread once
+    `flush_bytes` have accumulated, and on close.
+    """
+
+    def __init__(self, directory: str, clock=time.monotonic, flush_bytes: int = 64 * 1024):
+        """
+        Args:
+            directory: Where recordings are written; created if missing.
+            clock: Monotonic time source, injectable for tests.
+            flush_bytes: Buffered bytes that trigger a background write.
+        """
+        timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self.path = os.path.join(directory, f"{timestamp}-{uuid.uuid4().hex[:8]}{FILE_SUFFIX}")
+        self.flush_bytes = flush_bytes
+        self._clock = clock
+        self._started = clock()
+        self._buffer = bytearray(MAGIC)
+        self._file: Optional[BinaryIO] = None
+        self._closed = False
+        self.frames = 0
+        _WRITER.submit(self._open, directory)
+
+    def audio(self, chunk: bytes) -> None:
+        """
+        Records a binary audio frame.
+        """
+        self._write(AUDIO, chunk)
+
+    def control(self, text: str) -> None:
+        """
+        Records a JSON text frame as received.
+        """
+        self._write(CONTROL, text.encode("utf-8"))
+
+    async def close(self) -> None:
+        """
+        Writes the remaining frames and closes the recording.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        await asyncio.wrap_future(self._flush(close=True))
+        logger.info("Session recording saved.", path=self.path, frames=self.frames)
+
+    def _write(self, kind: int, payload: bytes) -> None:
+        if self._closed:
+            return
+        offset_ms = int((self._clock() - self._started) * 1000)
+        self._buffer += RECORD_HEADER.pack(kind, offset_ms, len(payload))
+        self._buffer += payload
+        self.frames += 1
+        if len(self._buffer) >= self.flush_bytes:
+            self._flush()
+
+    def _flush(self, close: bool = False) -> Future:
+        data, self._buffer = self._buffer, bytearray()
+        return _WRITER.submit(self._write_out, data, close)
+
+    # The methods below run in the writer thread
+
+    def _open(self, directory: str) -> None:
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "wb")
+        except OSError as e:
+            logger.error(f"Cannot write session recording: {e}", path=self.path)
+
+    def _write_out(self, data: bytearray, close: bool) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.write(data)
+            if close:
+                self._file.close()
+                self._file = None
+        except OSError as e:
+            logger.error(f"Session recording failed: {e}", path=self.path)
+            self._file.close()
+            self._file = None
+
+
+def read_recording(path: str) -> Iterator[RecordedFrame]:
+    """
+    Reads the frames of a recording in order.
+
+    Raises:
+        ValueError: If the file is not a session recording.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a session recording")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            kind, offset_ms, length = RECORD_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return  # truncated by a crash mid-write
+            yield RecordedFrame(kind, offset_ms / 1000, payload)
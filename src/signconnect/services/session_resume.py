@@ -0,0 +1,208 @@
+# src/signconnect/services/session_resume.py
+import asyncio
+import secrets
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import structlog
+from fastapi import WebSocket
+
+from signconnect.core.metrics import REGISTRY
+from signconnect.services.audio_buffer import AudioBuffer
+from signconnect.services.session import ConversationSession
+from signconnect.services.session_recording import SessionRecorder
+from signconnect.services.silence_gate import SilenceGate
+
+logger = structlog.get_logger(__name__)
+
+# First frame of a reconnecting client: this prefix plus its resume token,
+# in place of a Firebase ID token.
+RESUME_PREFIX = "resume:"
+
+PARKED_SESSIONS = REGISTRY.gauge(
+    "signconnect_parked_sessions", "Sessions waiting for their client to reconnect."
+)
+SESSION_RESUMES = REGISTRY.counter(
+    "signconnect_session_resumes_total",
+    "Resume attempts and parked sessions, by outcome (resumed, rejected, expired).",
+)
+
+
+class LiveSession:
+    """
+    The part of a connection that can outlive its socket: the user, the
+    conversation session, the audio buffer and the task transcribing it.
+
+    `websocket` is the socket currently serving the session. Outbound
+    messages are addressed to it, and while the session is parked they
+    wait in its (suspended) outbound queue.
+    """
+
+    def __init__(
+        self,
+        user: Dict[str, Any],
+        session: ConversationSession,
+        audio_queue: AudioBuffer,
+        gate: Optional[SilenceGate] = None,
+        recorder: Optional[SessionRecorder] = None,
+    ):
+        self.user = user
+        self.session = session
+        self.audio_queue = audio_queue
+        self.gate = gate
+        self.recorder = recorder
+        self.websocket: Optional[WebSocket] = None
+        self.process_task: Optional[asyncio.Task] = None
+        self.resume_token: Optional[str] = None
+        self.parked = False
+        self._closed = False
+
+    async def close(self, manager) -> None:
+        """
+        Releases everything: the connection registration, the transcription
+        task, the audio buffer and the conversation session. Runs once.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self.recorder is not None:
+            await self.recorder.close()
+        if self.websocket is not None:
+            manager.disconnect(self.websocket)
+        # 1. Gracefully tell the audio processor to exit its loop
+        await self.audio_queue.put(None)
+        # 2. Cancel the background task if it's still running
+        if self.process_task is not None:
+            if not self.process_task.done():
+                self.process_task.cancel()
+            try:
+                # 3. Wait for the task to acknowledge the cancellation
+                await self.process_task
+            except asyncio.CancelledError:
+                pass  # This is expected on cancellation
+        self.audio_queue.discard()
+        logger.info(
+            "Audio buffer closed.",
+            dropped_chunks=self.audio_queue.dropped_chunks,
+            dropped_bytes=self.audio_queue.dropped_bytes,
+            silence_suppressed_fraction=(
+                round(self.gate.suppressed_fraction, 3) if self.gate else None
+            ),
+        )
+        # 4. Flush conversation turns and stop background summarization
+        await self.session.close()
+        logger.info(
+            f"Connection closed and resources cleaned up for {self.user.get('email')}."
+        )
+
+
+class ResumeRegistry:
+    """
+    Resume tokens of this worker's sessions, and the sessions parked after
+    their socket dropped.
+
+    Every (re)connection gets a fresh single-use token. When the socket
+    drops, the session is parked for the grace period; a reconnect that
+    presents the token within it takes the session over, otherwise the
+    session is closed. A token can also take over a session whose old
+    socket has not been noticed as dead yet (e.g. a phone switching from
+    Wi-Fi to cellular).
+
+    Parked state lives in this process, so resuming needs the reconnect to
+    reach the same worker.
+    """
+
+    def __init__(self, grace_seconds: float = 30.0):
+        """
+        Args:
+            grace_seconds: How long a parked session waits for its client.
+        """
+        self.grace_seconds = grace_seconds
+        self._sessions: Dict[str, LiveSession] = {}
+        self._expiry: Dict[str, asyncio.Task] = {}
+        self._on_expire: Dict[str, Callable[[], Awaitable[None]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def issue(self, live: LiveSession) -> str:
+        """
+        Gives the session a new resume token, revoking the previous one.
+        """
+        self.discard(live)
+        token = secrets.token_urlsafe(32)
+        live.resume_token = token
+        self._sessions[token] = live
+        return token
+
+    def park(self, live: LiveSession, on_expire: Callable[[], Awaitable[None]]) -> None:
+        """
+        Keeps the session for the grace period, then calls `on_expire`.
+        """
+        token = live.resume_token
+        if token is None or self._sessions.get(token) is not live:
+            return
+        live.parked = True
+        PARKED_SESSIONS.inc()
+        self._on_expire[token] = on_expire
+        self._expiry[token] = asyncio.create_task(self._expire_later(token))
+
+    def claim(self, token: str) -> Optional[LiveSession]:
+        """
+        Takes the session for a resume token off the registry.
+
+        Returns:
+            The session, or None if the token is unknown or has expired.
+        """
+        live = self._sessions.pop(token, None)
+        if live is None:
+            SESSION_RESUMES.inc(outcome="rejected")
+            return None
+        self._unpark(token, live)
+        live.resume_token = None
+        SESSION_RESUMES.inc(outcome="resumed")
+        return live
+
+    def discard(self, live: LiveSession) -> None:
+        """
+        Forgets the session's token, e.g. when it closes for good.
+        """
+        token = live.resume_token
+        if token is not None and self._sessions.get(token) is live:
+            del self._sessions[token]
+            self._unpark(token, live)
+        live.resume_token = None
+
+    async def expire_parked(self) -> int:
+        """
+        Expires every parked session now, e.g. when the worker shuts down.
+
+        Returns:
+            The number of sessions expired.
+        """
+        tokens = list(self._expiry)
+        for token in tokens:
+            await self._expire(token)
+        return len(tokens)
+
+    def _unpark(self, token: str, live: LiveSession) -> None:
+        self._on_expire.pop(token, None)
+        expiry = self._expiry.pop(token, None)
+        if expiry is not None and expiry is not asyncio.current_task():
+            expiry.cancel()
+        if live.parked:
+            live.parked = False
+            PARKED_SESSIONS.dec()
+
+    async def _expire_later(self, token: str) -> None:
+        await asyncio.sleep(self.grace_seconds)
+        await self._expire(token)
+
+    async def _expire(self, token: str) -> None:
+        live = self._sessions.get(token)
+        on_expire = self._on_expire.get(token)
+        if live is None or on_expire is None:
+            return
+        self.discard(live)
+        SESSION_RESUMES.inc(outcome="expired")
+        logger.info(f"Parked session for {live.user.get('email')} expired.")
+        await on_expire()
@@ -0,0 +1,121 @@
+# src/signconnect/services/silence_gate.py
+import time
+from typing import Callable, Optional
+
+from signconnect.core.metrics import REGISTRY
+
+AUDIO_SECONDS = REGISTRY.counter(
+    "signconnect_stt_audio_seconds_total",
+    "Seconds of client audio seen by the silence gate, by outcome.",
+)
+SUPPRESSED_FRACTION = REGISTRY.gauge(
+    "signconnect_stt_audio_suppressed_fraction",
+    "Fraction of audio the silence gate kept from speech-to-text since startup.",
+)
+
+# Bounds on the time a chunk is assumed to cover. Chunks that arrived in a
+# burst (after a network stall) count as short, i.e. a high byte rate, so
+# they are forwarded.
+MIN_CHUNK_SECONDS = 0.25
+MAX_CHUNK_SECONDS = 2.0
+
+
+class SilenceGate:
+    """
+    Decides, chunk by chunk, whether audio is worth sending to speech-to-text.
+
+    The browser encodes Opus with a variable bitrate, so silence produces far
+    smaller packets than speech. The gate estimates each chunk's byte rate and
+    treats chunks below the threshold as silence, without decoding the audio.
+    A chunk's duration is the gap between its arrival and the previous one's,
+    so a backlog read all at once after the consumer stalled is measured as it
+    was recorded.
+    After the last speech chunk it keeps forwarding for a hangover period so
+    short pauses and trailing syllables still reach the recognizer.
+    """
+
+    def __init__(
+        self,
+        threshold_bytes_per_second: float = 1500.0,
+        hangover_seconds: float = 1.5,
+        nominal_chunk_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            threshold_bytes_per_second: Byte rate below which a chunk is silence.
+            hangover_seconds: How long forwarding continues after speech.
+            nominal_chunk_seconds: Duration assumed for the first chunk
+                (the client's MediaRecorder timeslice).
+            clock: Monotonic time source, injectable for tests.
+        """
+        self.threshold_bytes_per_second = threshold_bytes_per_second
+        self.hangover_seconds = hangover_seconds
+        self.nominal_chunk_seconds = nominal_chunk_seconds
+        self._clock = clock
+        self._last_chunk_at = None
+        self._last_speech_at = None
+        self.forwarded_seconds = 0.0
+        self.suppressed_seconds = 0.0
+
+    @classmethod
+    def for_user(cls, settings, db_user=None):
+        """
+        Creates the gate for a connection, applying the user's overrides of the
+        server defaults. Returns None if gating is disabled for the user.
+        """
+        enabled = settings.STT_SILENCE_GATING_ENABLED
+        threshold = settings.STT_SILENCE_THRESHOLD_BYTES_PER_SECOND
+        if db_user is not None:
+            if db_user.silence_gating_enabled is not None:
+                enabled = db_user.silence_gating_enabled
+            if db_user.silence_threshold_bytes_per_second is not None:
+                threshold = db_user.silence_threshold_bytes_per_second
+        if not enabled:
+            return None
+        return cls(
+            threshold_bytes_per_second=threshold,
+            hangover_seconds=settings.STT_SILENCE_HANGOVER_SECONDS,
+        )
+
+    @property
+    def suppressed_fraction(self) -> float:
+        """
+        Fraction of this connection's audio, by duration, that was not forwarded.
+        """
+        total = self.forwarded_seconds + self.suppressed_seconds
+        return self.suppressed_seconds / total if total else 0.0
+
+    def accept(self, chunk: bytes, received_at: Optional[float] = None) -> bool:
+        """
+        Classifies the next chunk.
+
+        Args:
+            chunk: The audio chunk.
+            received_at: When the chunk arrived from the client, on the gate's
+                clock. Defaults to now.
+
+        Returns:
+            True if the chunk should be sent to speech-to-text.
+        """
+        now = self._clock() if received_at is None else received_at
+        if self._last_chunk_at is None:
+            duration = self.nominal_chunk_seconds
+        else:
+            duration = min(max(now - self._last_chunk_at, MIN_CHUNK_SECONDS), MAX_CHUNK_SECONDS)
+        self._last_chunk_at = now
+
+        if len(chunk) / duration >= self.threshold_bytes_per_second:
+            self._last_speech_at = now
+        forward = self._last_speech_at is not None and now - self._last_speech_at <= self.hangover_seconds
+
+        if forward:
+            self.forwarded_seconds += duration
+            AUDIO_SECONDS.inc(duration, outcome="forwarded")
+        else:
+            self.suppressed_seconds += duration
+            AUDIO_SECONDS.inc(duration, outcome="suppressed")
+        forwarded = AUDIO_SECONDS.value(outcome="forwarded")
+        suppressed = AUDIO_SECONDS.value(outcome="suppressed")
+        SUPPRESSED_FRACTION.set(suppressed / (forwarded + suppressed))
+        return forward
@@ -0,0 +1,85 @@
+# src/signconnect/services/speech_pool.py
+import asyncio
+import itertools
+from typing import Callable, List, Optional
+
+import structlog
+from google.cloud import speech
+
+logger = structlog.get_logger(__name__)
+
+
+class SpeechClientPool:
+    """
+    A small, app-lifetime pool of Speech-to-Text clients.
+
+    Each client owns one gRPC channel, and a channel multiplexes many
+    concurrent streaming calls, so connections borrow a client instead of
+    creating their own. Credential loading, channel setup and the TLS
+    handshake are paid once at startup rather than before every session's
+    first transcript.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        client_factory: Callable[[], speech.SpeechAsyncClient] = speech.SpeechAsyncClient,
+        warmup_timeout_seconds: float = 5.0,
+    ):
+        """
+        Args:
+            size: Number of clients (and gRPC channels) in the pool.
+            client_factory: Creates a client; injectable for tests.
+            warmup_timeout_seconds: How long startup waits for each channel to connect.
+        """
+        self.size = max(1, size)
+        self._client_factory = client_factory
+        self._warmup_timeout_seconds = warmup_timeout_seconds
+        self._clients: List[speech.SpeechAsyncClient] = []
+        self._cycle: Optional[itertools.cycle] = None
+
+    async def start(self) -> None:
+        """
+        Creates the clients and connects their channels ahead of the first session.
+        """
+        if self._clients:
+            return
+        self._clients = [self._client_factory() for _ in range(self.size)]
+        self._cycle = itertools.cycle(self._clients)
+        await asyncio.gather(*(self._warm_up(client) for client in self._clients))
+        logger.info("Speech client pool started.", size=self.size)
+
+    def acquire(self) -> speech.SpeechAsyncClient:
+        """
+        Returns a client for a new streaming session, spreading sessions across
+        channels round-robin. Clients are shared, so nothing is returned to the pool.
+
+        If the pool was not started (e.g. in tests without a lifespan), clients
+        are created on first use.
+        """
+        if not self._clients:
+            self._clients = [self._client_factory() for _ in range(self.size)]
+            self._cycle = itertools.cycle(self._clients)
+        return next(self._cycle)
+
+    async def close(self) -> None:
+        """
+        Closes every client's channel.
+        """
+        clients, self._clients, self._cycle = self._clients, [], None
+        for client in clients:
+            try:
+                await client.transport.close()
+            except Exception as e:
+                logger.warning(f"Error closing speech client: {e}")
+        logger.info("Speech client pool closed.")
+
+    async def _warm_up(self, client: speech.SpeechAsyncClient) -> None:
+        try:
+            await asyncio.wait_for(
+                client.transport.grpc_channel.channel_ready(),
+                timeout=self._warmup_timeout_seconds,
+            )
+        except Exception as e:
+            # The channel will still connect lazily on the first call
+            logger.warning(f"Speech channel warm-up failed: {e}")
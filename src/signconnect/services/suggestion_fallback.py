@@ -0,0 +1,42 @@
+# src/signconnect/services/suggestion_fallback.py
+from typing import Iterable, List, Optional
+
+from signconnect.db import models
+
+# Used when neither the user's scenarios nor their history offer anything.
+GENERIC_SUGGESTIONS = [
+    "Could you repeat that, please?",
+    "Yes, thank you.",
+    "One moment, please.",
+]
+
+
+def build_fallback_suggestions(
+    similar_question: Optional[models.ScenarioQuestion] = None,
+    frequent_replies: Iterable[str] = (),
+    limit: int = 3,
+) -> List[str]:
+    """
+    Builds suggestions without calling the LLM.
+
+    Sources are used in order of relevance: the answer stored for the closest
+    scenario question, the user's most-used replies, then generic templates.
+    Duplicates are removed.
+    """
+    candidates: List[str] = []
+    if similar_question is not None:
+        candidates.append(similar_question.user_answer_text)
+    candidates.extend(frequent_replies)
+    candidates.extend(GENERIC_SUGGESTIONS)
+
+    suggestions: List[str] = []
+    seen = set()
+    for candidate in candidates:
+        key = candidate.strip().lower()
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        suggestions.append(candidate.strip())
+        if len(suggestions) >= limit:
+            break
+    return suggestions
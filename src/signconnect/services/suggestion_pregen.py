@@ -0,0 +1,214 @@
+# src/signconnect/services/suggestion_pregen.py
+import asyncio
+import threading
+import uuid
+from typing import Callable, Iterable, Optional
+
+import structlog
+from sqlalchemy.orm import Session
+
+from signconnect import crud
+from signconnect.db import models
+from signconnect.llm.client import GeminiClient
+
+logger = structlog.get_logger(__name__)
+
+
+def question_context(question: models.ScenarioQuestion) -> str:
+    """
+    Formats a stored scenario question and its answer as prompt context.
+    """
+    return (
+        f"Recall this related question and answer: "
+        f"Q: '{question.question_text}' "
+        f"A: '{question.user_answer_text}'"
+    )
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class SuggestionPregenerator:
+    """
+    Background job that pre-generates LLM suggestions for stored scenario questions.
+
+    Question IDs are queued whenever a question or the owner's preferences change.
+    A single worker task drains the queue, calling the LLM no faster than the
+    configured rate, and stores the results on the question so the websocket
+    path can serve them without waiting on the LLM.
+
+    IDs are queued from sync endpoints running in the threadpool, so once
+    started the queue is only touched on the event loop; the set of pending
+    IDs, also read while generating, is guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        llm_client: GeminiClient,
+        requests_per_minute: int,
+        max_pending: int = 10_000,
+    ):
+        """
+        Initializes the pre-generator.
+
+        Args:
+            session_factory: Callable returning a new database session.
+            llm_client: The client used to generate suggestions.
+            requests_per_minute: Maximum LLM calls per minute. Zero disables throttling.
+            max_pending: Maximum number of queued questions; further IDs are dropped.
+        """
+        self._session_factory = session_factory
+        self._llm_client = llm_client
+        self._min_interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._queue: asyncio.Queue[uuid.UUID] = asyncio.Queue(maxsize=max_pending)
+        self._pending: set[uuid.UUID] = set()
+        self._pending_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(self, question_id: uuid.UUID) -> None:
+        """
+        Schedules a question for (re)generation. Duplicate IDs are coalesced.
+        Safe to call from any thread.
+        """
+        with self._pending_lock:
+            # Marked pending right away, so a generation already running for
+            # the question sees that its result is stale
+            if question_id in self._pending:
+                return
+            self._pending.add(question_id)
+        if self._loop is None or _running_loop() is self._loop:
+            self._put(question_id)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put, question_id)
+        except RuntimeError:
+            # The loop has shut down; nothing would generate it anyway
+            self._drop(question_id, "Suggestion pre-generator stopped, dropping question")
+
+    def _put(self, question_id: uuid.UUID) -> None:
+        try:
+            self._queue.put_nowait(question_id)
+        except asyncio.QueueFull:
+            self._drop(question_id, "Suggestion pre-generation queue full, dropping question")
+
+    def _drop(self, question_id: uuid.UUID, reason: str) -> None:
+        logger.warning(reason, question_id=str(question_id))
+        with self._pending_lock:
+            self._pending.discard(question_id)
+
+    def enqueue_many(self, question_ids: Iterable[uuid.UUID]) -> None:
+        """
+        Schedules several questions for (re)generation.
+        """
+        for question_id in question_ids:
+            self.enqueue(question_id)
+
+    async def start(self) -> None:
+        """
+        Starts the worker task and queues every question still missing suggestions.
+        """
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        try:
+            missing = await asyncio.to_thread(self._missing_question_ids)
+            self.enqueue_many(missing)
+        except Exception as e:
+            logger.exception(f"Could not load questions for suggestion pre-generation: {e}")
+        self._task = asyncio.create_task(self._run())
+        logger.info("Suggestion pre-generator started.", queued=self._queue.qsize())
+
+    async def stop(self) -> None:
+        """
+        Cancels the worker task and waits for it to exit.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Suggestion pre-generator stopped.")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            question_id = await self._queue.get()
+            with self._pending_lock:
+                self._pending.discard(question_id)
+            started = loop.time()
+            try:
+                await asyncio.to_thread(self._generate, question_id)
+            except Exception as e:
+                logger.exception(f"Error pre-generating suggestions: {e}", question_id=str(question_id))
+            finally:
+                self._queue.task_done()
+            # Space out LLM calls to stay within the provider quota
+            await asyncio.sleep(max(0.0, self._min_interval - (loop.time() - started)))
+
+    def _missing_question_ids(self) -> list[uuid.UUID]:
+        db = self._session_factory()
+        try:
+            return crud.get_question_ids_missing_suggestions(db)
+        finally:
+            db.close()
+
+    def _generate(self, question_id: uuid.UUID) -> None:
+        db = self._session_factory()
+        try:
+            question = crud.get_question_for_pregeneration(db, question_id=question_id)
+            if question is None or question.precomputed_suggestions:
+                # Deleted, or already generated by an earlier queue entry
+                return
+
+            user_id = question.scenario.user_id
+            source = (question.question_text, question.user_answer_text)
+            preference_texts = [
+                pref.preference_text for pref in crud.get_user_preferences(db, user_id=user_id)
+            ]
+            context = question_context(question)
+            # Don't hold a connection (or stale reads) through the LLM call
+            db.rollback()
+
+            suggestions = self._llm_client.get_response_suggestions(
+                transcript=source[0],
+                user_preferences=preference_texts,
+                conversation_history=[context],
+            )
+            if not suggestions:
+                return
+
+            # Checked and written under the row lock: an edit that commits
+            # first is seen here, and one that commits later clears the
+            # suggestions written below and queues the question again
+            current = crud.lock_question_for_pregeneration(db, question_id=question_id)
+            with self._pending_lock:
+                requeued = question_id in self._pending
+            if (
+                current is None
+                or requeued
+                or current.precomputed_suggestions
+                or (current.question_text, current.user_answer_text) != source
+                or sorted(
+                    pref.preference_text
+                    for pref in crud.get_user_preferences(db, user_id=user_id)
+                )
+                != sorted(preference_texts)
+            ):
+                # The question or its owner's preferences changed while we were
+                # generating; the queued entry will regenerate from fresh data.
+                db.rollback()
+                return
+
+            crud.set_precomputed_suggestions(db, question_id=question_id, suggestions=suggestions)
+            logger.info("Stored pre-generated suggestions.", question_id=str(question_id))
+        finally:
+            db.close()
@@ -0,0 +1,268 @@
+# src/signconnect/services/transcription.py
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, List, NamedTuple, Optional, Tuple
+
+import structlog
+from google.cloud import speech
+
+from signconnect.core.metrics import REGISTRY
+from signconnect.services.audio_buffer import AudioBuffer
+from signconnect.services.silence_gate import SilenceGate
+
+logger = structlog.get_logger(__name__)
+
+# EBML ID of a WebM Cluster element. Everything before the first cluster is
+# the stream header (EBML header, segment info, tracks) that a decoder needs
+# before any audio; clusters are the points where decoding can (re)start.
+WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"
+
+# Finalized audio is kept this much longer in the replay buffer, to cover the
+# difference between when a chunk arrived and where the STT placed the end of
+# the final result.
+FINALIZED_MARGIN_SECONDS = 1.0
+
+# Number of words compared when removing overlap between consecutive finals.
+MAX_OVERLAP_WORDS = 12
+
+
+AUDIO_CHUNKS = REGISTRY.counter(
+    "signconnect_stt_audio_chunks_total", "Client audio chunks sent to speech-to-text."
+)
+AUDIO_REQUESTS = REGISTRY.counter(
+    "signconnect_stt_audio_requests_total",
+    "Streaming requests carrying audio; fewer than chunks when chunks are aggregated.",
+)
+
+# Returned by _next_queued when no chunk arrived in time.
+_NOTHING_QUEUED = object()
+
+
+class TranscriptResult(NamedTuple):
+    """A transcript produced by speech-to-text."""
+
+    text: str
+    is_final: bool
+
+
+def strip_overlap(previous: str, current: str, max_words: int = MAX_OVERLAP_WORDS) -> str:
+    """
+    Removes the words at the start of `current` that repeat the end of `previous`.
+
+    Used after replaying audio into a new stream, whose first final result can
+    repeat words the previous stream already finalized.
+    """
+    previous_words = previous.split()
+    current_words = current.split()
+
+    def normalise(words: List[str]) -> List[str]:
+        return [word.strip(".,!?;:").lower() for word in words]
+
+    prev_norm = normalise(previous_words[-max_words:])
+    curr_norm = normalise(current_words[:max_words])
+    for size in range(min(len(prev_norm), len(curr_norm)), 0, -1):
+        if prev_norm[-size:] == curr_norm[:size]:
+            return " ".join(current_words[size:])
+    return current
+
+
+async def _next_queued(audio_queue: AudioBuffer, wait_seconds: float):
+    """
+    Returns the next queued chunk (or None at the end of the audio), waiting up
+    to `wait_seconds` for one, or _NOTHING_QUEUED if none arrived.
+    """
+    try:
+        return audio_queue.get_nowait()
+    except asyncio.QueueEmpty:
+        if wait_seconds <= 0:
+            return _NOTHING_QUEUED
+    try:
+        return await asyncio.wait_for(audio_queue.get(), timeout=wait_seconds)
+    except asyncio.TimeoutError:
+        return _NOTHING_QUEUED
+
+
+def _split_header(first_chunk: bytes) -> bytes:
+    """
+    Returns the WebM header contained in the first chunk of a recording.
+    """
+    index = first_chunk.find(WEBM_CLUSTER_ID)
+    return first_chunk[:index] if index > 0 else first_chunk
+
+
+def _aligned_replay(replay: List[bytes], needed_from: int) -> List[bytes]:
+    """
+    Selects the chunks to replay into a new stream, starting at the last
+    cluster boundary at or before `needed_from` so the decoder can resync.
+    """
+    for index in range(min(needed_from, len(replay) - 1), -1, -1):
+        offset = replay[index].find(WEBM_CLUSTER_ID)
+        if offset >= 0:
+            return [replay[index][offset:]] + replay[index + 1 :]
+    return replay[needed_from:]
+
+
+async def stream_transcripts(
+    client: speech.SpeechAsyncClient,
+    streaming_config: speech.StreamingRecognitionConfig,
+    audio_queue: AudioBuffer,
+    max_stream_seconds: float = 280.0,
+    replay_seconds: float = 10.0,
+    max_consecutive_errors: int = 5,
+    gate: Optional[SilenceGate] = None,
+    aggregate_max_bytes: int = 64 * 1024,
+    aggregate_max_delay_seconds: float = 0.0,
+) -> AsyncIterator[TranscriptResult]:
+    """
+    Transcribes the audio queue for as long as the connection lasts.
+
+    Google caps the duration of a streaming call and occasionally fails one
+    mid-stream. This generator rotates to a new stream before the cap and
+    reconnects after errors. Recent audio is kept in a ring buffer and replayed
+    into the new stream after the WebM header, so no words are lost. Words
+    repeated by the replay are removed from the first new final result.
+
+    With a silence `gate`, no stream is open while the user is silent: the
+    current stream is ended once the gate stops forwarding, and a new one is
+    opened at the next speech, starting one chunk early so the onset is kept.
+    Suspending the whole stream, rather than skipping chunks inside it, keeps
+    the WebM byte stream the recognizer sees intact.
+
+    Chunks that queued up while a request was being sent are joined into one
+    request of at most `aggregate_max_bytes`, optionally waiting up to
+    `aggregate_max_delay_seconds` for more, to save per-message overhead.
+
+    It returns once the audio queue ends (None was put) or after too many
+    consecutive failures.
+    """
+    loop = asyncio.get_running_loop()
+    header: Optional[bytes] = None
+    # (arrival time, chunk) for recent audio, oldest first
+    replay: Deque[Tuple[float, bytes]] = deque()
+    # Chunks that arrived before this time need not be replayed
+    replay_from = float("-inf")
+    previous_final = ""
+    strip_next_final = False
+    consecutive_errors = 0
+    audio_ended = False
+    suspended = gate is not None
+
+    def remember(chunk: bytes) -> None:
+        nonlocal header
+        if header is None:
+            header = _split_header(chunk)
+        now = loop.time()
+        replay.append((now, chunk))
+        while replay and replay[0][0] < now - replay_seconds:
+            replay.popleft()
+
+    while not audio_ended:
+        if suspended:
+            # Wait for speech before opening a stream
+            while True:
+                chunk = await audio_queue.get()
+                if chunk is None:
+                    return
+                remember(chunk)
+                if gate.accept(chunk, audio_queue.last_received_at):
+                    break
+            replay_from = replay[-2][0] if len(replay) > 1 else replay[-1][0]
+            suspended = False
+
+        stream_started = loop.time()
+        replay_chunks = [chunk for _, chunk in replay]
+        needed_from = sum(1 for arrived, _ in replay if arrived < replay_from)
+        to_replay = _aligned_replay(replay_chunks, needed_from) if header is not None else []
+        # Audio offsets reported by the new stream start at the oldest replayed chunk
+        audio_origin = replay[len(replay) - len(to_replay)][0] if to_replay else stream_started
+        if to_replay and previous_final:
+            strip_next_final = True
+
+        async def requests():
+            nonlocal audio_ended, suspended
+            yield speech.StreamingRecognizeRequest(streaming_config=streaming_config)
+            if header is not None:
+                yield speech.StreamingRecognizeRequest(audio_content=header)
+                for chunk in to_replay:
+                    yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+            deadline = stream_started + max_stream_seconds
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return  # rotate before the provider's duration cap
+                try:
+                    chunk = await asyncio.wait_for(audio_queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    return
+
+                # Send everything already queued (up to the size cap) as one
+                # request, waiting at most aggregate_max_delay_seconds for more
+                batch: List[bytes] = []
+                batch_bytes = 0
+                batch_deadline = loop.time() + aggregate_max_delay_seconds
+                while True:
+                    if chunk is None:
+                        audio_ended = True
+                        break
+                    remember(chunk)
+                    if gate is not None and not gate.accept(chunk, audio_queue.last_received_at):
+                        suspended = True
+                        break
+                    batch.append(chunk)
+                    batch_bytes += len(chunk)
+                    if batch_bytes >= aggregate_max_bytes:
+                        break
+                    chunk = await _next_queued(audio_queue, batch_deadline - loop.time())
+                    if chunk is _NOTHING_QUEUED:
+                        break
+
+                if batch:
+                    AUDIO_CHUNKS.inc(len(batch))
+                    AUDIO_REQUESTS.inc()
+                    yield speech.StreamingRecognizeRequest(audio_content=b"".join(batch))
+                if audio_ended or suspended:
+                    return
+
+        try:
+            responses = await client.streaming_recognize(requests=requests())
+            async for response in responses:
+                if not response.results or not response.results[0].alternatives:
+                    continue
+                consecutive_errors = 0
+                result = response.results[0]
+                transcript = result.alternatives[0].transcript
+
+                if result.is_final:
+                    end_time = getattr(result, "result_end_time", None)
+                    if end_time is not None:
+                        replay_from = audio_origin + end_time.total_seconds() - FINALIZED_MARGIN_SECONDS
+                    if strip_next_final:
+                        transcript = strip_overlap(previous_final, transcript)
+                        strip_next_final = False
+                    if not transcript.strip():
+                        continue
+                    previous_final = transcript
+                yield TranscriptResult(transcript, result.is_final)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            consecutive_errors += 1
+            if consecutive_errors > max_consecutive_errors:
+                logger.exception(f"Speech stream failed {consecutive_errors} times in a row, giving up: {e}")
+                return
+            logger.warning(f"Speech stream failed, reconnecting: {e}", attempt=consecutive_errors)
+            # Reconnect straight away; waiting for speech could lose the replay.
+            # Audio that ended mid-stream is still replayed before finishing.
+            suspended = False
+            audio_ended = False
+            await asyncio.sleep(min(0.1 * 2**consecutive_errors, 2.0))
+            continue
+
+        if not audio_ended:
+            # The stream ended cleanly, at the rotation deadline or on silence,
+            # so everything sent to it has been finalized.
+            replay_from = loop.time()
+            if not suspended:
+                logger.info("Rotated speech stream.", stream_seconds=round(loop.time() - stream_started))
@@ -1,55 +1,293 @@
 # src/signconnect/services/websocket_manager.py
 import base64
 import json
-from typing import List, Any, Dict
+import uuid
+from typing import List, Any, Callable, Dict, Optional, Set
 from fastapi import WebSocket
 from sqlalchemy.orm import Session
 import asyncio
+import time
 import structlog
 
 # Use absolute imports for our own modules
 from signconnect import crud
+from signconnect.core.metrics import REGISTRY
+from signconnect.db import models
 from signconnect.llm.client import GeminiClient
+from signconnect.services.admission import track_llm_call
+from signconnect.services.backplane import BROADCAST, USER, Backplane
+from signconnect.services.audio_buffer import AudioBuffer
+from signconnect.services.outbound_queue import HIGH, LOW, LOW_PRIORITY_TYPES, OutboundQueue
+from signconnect.services.protocol import (
+    JSON_ENCODING,
+    PROTOCOL_V2,
+    PROTOCOL_V3,
+    MsgPackEncoding,
+    msgpack_available,
+)
+from signconnect.services.session import ConversationSession
+from signconnect.services.suggestion_fallback import (
+    GENERIC_SUGGESTIONS,
+    build_fallback_suggestions,
+)
+from signconnect.services.suggestion_pregen import question_context
 
 logger = structlog.get_logger(__name__)
 
 
+CONNECTIONS = REGISTRY.gauge(
+    "signconnect_websocket_connections", "Open websocket connections on this worker."
+)
+EVICTIONS = REGISTRY.counter(
+    "signconnect_websocket_evictions_total",
+    "Connections closed because they could not keep up with their outbound messages.",
+)
+
+
 class ConnectionManager:
-    """Manages active WebSocket connections."""
+    """
+    Manages active WebSocket connections.
+
+    Connections are indexed by connection id and by user, so adding and
+    removing one is O(1) and a user's devices can be reached together.
+    Every message to a connection goes through its OutboundQueue, whose
+    single writer task is the only code that sends on the socket. Fan-out
+    only enqueues, so a client that cannot keep up is closed by its own
+    queue instead of delaying everyone else.
 
-    def __init__(self):
+    With a backplane, per-user sends and broadcasts also reach connections
+    on other workers, and user presence is shared between workers.
+
+    Each connection has a wire encoding (JSON, or MessagePack for protocol
+    v3); fan-out encodes a message once per encoding in use.
+    """
+
+    def __init__(
+        self,
+        send_timeout_seconds: float = 1.0,
+        outbound_max_messages: int = 256,
+        outbound_max_batch: int = 16,
+        backplane: Optional[Backplane] = None,
+        msgpack_encoding: Optional[MsgPackEncoding] = None,
+    ):
         """
         Initializes the ConnectionManager.
 
+        Args:
+            send_timeout_seconds: How long a single send may take before the
+                receiving connection is evicted.
+            outbound_max_messages: Cap on messages queued per connection.
+            outbound_max_batch: Most queued messages sent in one frame to
+                clients that accept batches.
+            backplane: Links this manager to the other workers' managers;
+                without one, delivery and presence are local to this worker.
+            msgpack_encoding: Encoding for protocol v3 clients; without one,
+                protocol v3 is not offered.
+
         Post-conditions:
-        - self.active_connections is initialized as an empty list.
+        - No connections are registered.
         """
-        self.active_connections: List[WebSocket] = []
+        self.send_timeout_seconds = send_timeout_seconds
+        self.outbound_max_messages = outbound_max_messages
+        self.outbound_max_batch = outbound_max_batch
+        self._connections: Dict[str, WebSocket] = {}
+        # WebSocket objects are unhashable (they are Mappings), so the
+        # reverse index is keyed by object identity.
+        self._ids: Dict[int, str] = {}
+        self._users: Dict[str, Optional[str]] = {}
+        self._by_user: Dict[str, Dict[str, WebSocket]] = {}
+        self._outbound: Dict[str, OutboundQueue] = {}
+        self.backplane = backplane
+        self.msgpack_encoding = msgpack_encoding
+        self._background: Set[asyncio.Task] = set()
 
-    async def connect(self, websocket: WebSocket):
+    @classmethod
+    def from_settings(
+        cls, settings, backplane: Optional[Backplane] = None
+    ) -> "ConnectionManager":
         """
-        Accepts and stores a new WebSocket connection.
+        Creates a manager with the outbound queue limits and wire encodings
+        from settings.
+        """
+        msgpack_encoding = None
+        if settings.WS_MSGPACK_ENABLED and msgpack_available():
+            msgpack_encoding = MsgPackEncoding.from_settings(settings)
+        return cls(
+            send_timeout_seconds=settings.OUTBOUND_SEND_TIMEOUT_SECONDS,
+            outbound_max_messages=settings.OUTBOUND_QUEUE_MAX_MESSAGES,
+            outbound_max_batch=settings.OUTBOUND_MAX_BATCH,
+            backplane=backplane,
+            msgpack_encoding=msgpack_encoding,
+        )
+
+    @property
+    def max_protocol_version(self) -> int:
+        """
+        The newest protocol version this manager can serve.
+        """
+        return PROTOCOL_V3 if self.msgpack_encoding is not None else PROTOCOL_V2
+
+    def encoding_for(self, protocol_version: int):
+        """
+        Returns the wire encoding for a negotiated protocol version.
+        """
+        if protocol_version >= PROTOCOL_V3 and self.msgpack_encoding is not None:
+            return self.msgpack_encoding
+        return JSON_ENCODING
+
+    async def start(self) -> None:
+        """
+        Subscribes to the backplane, if any.
+        """
+        if self.backplane is not None:
+            await self.backplane.start(self._on_envelope)
+
+    async def close(self) -> None:
+        """
+        Leaves the backplane, if any, withdrawing this worker's presence.
+        """
+        if self.backplane is not None:
+            await self.backplane.close()
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        """
+        All open connections, in connection order.
+        """
+        return list(self._connections.values())
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        user_id: Optional[str] = None,
+        batching: bool = False,
+        encoding=JSON_ENCODING,
+    ) -> str:
+        """
+        Registers a new WebSocket connection and starts its outbound writer.
 
         Pre-conditions:
-        - `websocket` is a valid WebSocket object.
+        - `websocket` is a valid, accepted WebSocket object.
 
         Post-conditions:
-        - The new WebSocket connection is accepted.
-        - The WebSocket is added to the active_connections list.
+        - The connection can be reached by its id, and by `user_id` if given.
+
+        Args:
+            batching: Whether the client accepts several messages in one
+                "batch" frame.
+            encoding: The client's wire encoding, from `encoding_for`.
+
+        Returns:
+            The connection id.
         """
-        self.active_connections.append(websocket)
+        connection_id = uuid.uuid4().hex
+        self._connections[connection_id] = websocket
+        self._ids[id(websocket)] = connection_id
+        self._users[connection_id] = user_id
+        if user_id is not None:
+            self._by_user.setdefault(user_id, {})[connection_id] = websocket
+        outbound = OutboundQueue(
+            websocket,
+            max_messages=self.outbound_max_messages,
+            max_batch=self.outbound_max_batch,
+            send_timeout_seconds=self.send_timeout_seconds,
+            batching=batching,
+            on_close=self._evict,
+            encoding=encoding,
+        )
+        self._outbound[connection_id] = outbound
+        outbound.start()
+        CONNECTIONS.inc()
+        if user_id is not None and self.backplane is not None:
+            await self._update_presence(user_id)
+        return connection_id
 
     def disconnect(self, websocket: WebSocket):
         """
-        Removes a WebSocket connection from the active list.
-
-        Pre-conditions:
-        - `websocket` is a WebSocket object that is in the active_connections list.
+        Removes a WebSocket connection from the registry.
 
         Post-conditions:
-        - The WebSocket is removed from the active_connections list.
+        - The WebSocket is no longer registered and its outbound writer is
+          stopped. Removing a connection that was already removed (e.g.
+          evicted) does nothing.
+        """
+        connection_id = self._ids.pop(id(websocket), None)
+        if connection_id is None:
+            return
+        del self._connections[connection_id]
+        self._outbound.pop(connection_id).stop()
+        user_id = self._users.pop(connection_id)
+        if user_id is not None:
+            devices = self._by_user[user_id]
+            del devices[connection_id]
+            if not devices:
+                del self._by_user[user_id]
+                if self.backplane is not None:
+                    self._in_background(self._update_presence(user_id))
+        CONNECTIONS.dec()
+
+    def suspend(self, websocket: WebSocket) -> None:
+        """
+        Stops sending to a connection whose socket dropped, while keeping it
+        registered: messages for it queue up (within the outbound limits)
+        until `rebind` moves it to a new socket.
+        """
+        outbound = self.outbound(websocket)
+        if outbound is not None:
+            outbound.pause()
+
+    def rebind(
+        self, old: WebSocket, new: WebSocket, batching: bool = False, encoding=JSON_ENCODING
+    ) -> bool:
+        """
+        Moves a registered connection, with its queued messages, to a new
+        socket, e.g. when a client resumes its session.
+
+        Returns:
+            False if `old` is not registered (e.g. it was evicted).
+        """
+        connection_id = self._ids.pop(id(old), None)
+        if connection_id is None:
+            return False
+        self._ids[id(new)] = connection_id
+        self._connections[connection_id] = new
+        user_id = self._users[connection_id]
+        if user_id is not None:
+            self._by_user[user_id][connection_id] = new
+        self._outbound[connection_id].attach(new, batching=batching, encoding=encoding)
+        return True
+
+    def connection_id(self, websocket: WebSocket) -> Optional[str]:
+        """
+        Returns the id of a registered connection, or None.
         """
-        self.active_connections.remove(websocket)
+        return self._ids.get(id(websocket))
+
+    def user_connections(self, user_id: str) -> List[WebSocket]:
+        """
+        Returns every open connection (device) of a user.
+        """
+        return list(self._by_user.get(user_id, {}).values())
+
+    async def is_online(self, user_id: str) -> bool:
+        """
+        Returns whether the user is connected to this or, with a backplane,
+        any other worker.
+        """
+        if user_id in self._by_user:
+            return True
+        if self.backplane is None:
+            return False
+        return await self.backplane.is_online(user_id)
+
+    def outbound(self, websocket: WebSocket) -> Optional[OutboundQueue]:
+        """
+        Returns the outbound queue of a registered connection, or None.
+        """
+        return self._outbound.get(self._ids.get(id(websocket), ""))
 
     async def send_personal_json(self, data: Any, websocket: WebSocket):
         """
@@ -58,10 +296,29 @@ class ConnectionManager:
         Pre-conditions:
         - `data` is a JSON-serializable object (like a dict or list).
         - `websocket` is a valid, active WebSocket object.
+
+        Post-conditions:
+        - For a registered connection the message is queued for its writer
+          and this returns without waiting for the client; otherwise it is
+          sent directly.
+        """
+        outbound = self.outbound(websocket)
+        if outbound is None:
+            await websocket.send_json(data)
+        else:
+            outbound.put(data)
+
+    async def send_to_user(self, user_id: str, data: Any) -> int:
+        """
+        Queues a JSON message for all of a user's connections, on every
+        worker when there is a backplane.
+
+        Returns:
+            The number of connections on this worker it was queued for.
         """
-        await websocket.send_json(data)
+        return await self._deliver(data, USER, user_id)
 
-    async def broadcast_json(self, data: Any):
+    async def broadcast_json(self, data: Any) -> int:
         """
         Broadcasts a JSON message to all active WebSocket connections.
 
@@ -69,26 +326,261 @@ class ConnectionManager:
         - `data` is a JSON-serializable object.
 
         Post-conditions:
-        - The message is sent to every connected client.
+        - The message is queued for every connection, on every worker when
+          there is a backplane; connections whose queue cannot take it are
+          evicted.
+
+        Returns:
+            The number of connections on this worker it was queued for.
         """
-        # The frontend expects a JSON string, so we dump the data.
+        return await self._deliver(data, BROADCAST)
+
+    async def _deliver(self, data: Any, kind: str, user_id: Optional[str] = None) -> int:
+        # Serialize once, not once per connection or node
         message = json.dumps(data)
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        message_type = data.get("type", "") if isinstance(data, dict) else ""
+        delivered = self._fan_out(message, message_type, kind, user_id, data)
+        if self.backplane is not None:
+            await self.backplane.publish(
+                {
+                    "origin": self.backplane.node_id,
+                    "kind": kind,
+                    "user_id": user_id,
+                    "type": message_type,
+                    "message": message,
+                }
+            )
+        return delivered
+
+    async def _on_envelope(self, envelope: Dict[str, Any]) -> None:
+        if envelope["origin"] == self.backplane.node_id:
+            return  # already delivered locally
+        self._fan_out(
+            envelope["message"], envelope["type"], envelope["kind"], envelope["user_id"]
+        )
+
+    def _fan_out(
+        self,
+        message: str,
+        message_type: str,
+        kind: str,
+        user_id: Optional[str],
+        data: Any = None,
+    ) -> int:
+        if kind == USER:
+            connection_ids = self._by_user.get(user_id, {}).keys()
+        else:
+            connection_ids = self._connections.keys()
+        priority = LOW if message_type in LOW_PRIORITY_TYPES else HIGH
+        # Copy the queues: an overflowing queue evicts its connection mid-loop
+        queues = [self._outbound[cid] for cid in connection_ids]
+        encoded = {id(JSON_ENCODING): message}
+        delivered = 0
+        for queue in queues:
+            frame = encoded.get(id(queue.encoding))
+            if frame is None:
+                if data is None:
+                    data = json.loads(message)  # from another worker
+                frame = encoded[id(queue.encoding)] = queue.encoding.encode(data)
+            delivered += queue.put_encoded(frame, priority, message_type)
+        return delivered
+
+    async def _update_presence(self, user_id: str) -> None:
+        # Decided when it runs, so a quick reconnect is not recorded as gone
+        try:
+            if user_id in self._by_user:
+                await self.backplane.join(user_id)
+            else:
+                await self.backplane.leave(user_id)
+        except Exception as e:
+            # Presence is advisory; the connection itself still works
+            logger.warning(f"Failed to update presence for {user_id}: {e!r}")
+
+    def _in_background(self, awaitable) -> None:
+        task = asyncio.create_task(awaitable)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _evict(self, websocket: WebSocket, reason: str) -> None:
+        logger.warning(f"Evicting slow connection: {reason}")
+        EVICTIONS.inc()
+        self.disconnect(websocket)
+
+
+async def _live_suggestions(
+    session: ConversationSession,
+    llm_client: GeminiClient,
+    transcript: str,
+    user_preferences: List[str],
+    conversation_history: List[str],
+) -> List[str]:
+    """
+    Asks the LLM for suggestions within the session's latency budget.
+
+    Returns an empty list without calling the LLM when the circuit breaker is
+    open, or when the call fails or exceeds the budget.
+    """
+    breaker = session.breaker
+    if breaker is not None and not breaker.allow_request():
+        logger.info("LLM circuit open, using fallback suggestions.")
+        return []
+
+    started = time.monotonic()
+    try:
+        # The client is blocking; run it off the event loop so the budget holds
+        suggestions = await asyncio.wait_for(
+            asyncio.to_thread(
+                track_llm_call(llm_client.get_response_suggestions),
+                transcript=transcript,
+                user_preferences=user_preferences,
+                conversation_history=conversation_history,
+                prompt_cache=session.prompt_cache,
+            ),
+            timeout=session.suggestion_timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("LLM suggestions exceeded the latency budget.")
+        suggestions = []
+    except asyncio.CancelledError:
+        # Superseded or disconnected: no outcome, but a half-open breaker's
+        # probe slot must not stay taken
+        if breaker is not None:
+            breaker.release()
+        raise
+    except Exception as e:
+        logger.exception(f"Error getting LLM suggestions: {e}")
+        suggestions = []
+
+    if breaker is not None:
+        breaker.record(success=bool(suggestions), latency_seconds=time.monotonic() - started)
+    return suggestions
+
+
+def _fallback_suggestions(
+    db: Session, similar_question: Optional[models.ScenarioQuestion], user_id: uuid.UUID
+) -> List[str]:
+    # Blocking: queries the user's replies, and reloads the question after
+    # its transaction ended
+    return build_fallback_suggestions(
+        similar_question, crud.get_frequent_user_replies(db, user_id=user_id)
+    )
+
+
+async def send_suggestions(
+    manager: ConnectionManager,
+    websocket: WebSocket,
+    transcript: str,
+    db: Session,
+    user: Dict[str, Any],
+    llm_client: GeminiClient,
+    session: ConversationSession,
+):
+    """
+    Generates response suggestions for a transcript and sends them to the client.
+
+    Used both for client `get_suggestions` requests and for suggestions the
+    server pushes on final transcripts. The connection behind `db` goes back
+    to the pool while the LLM is called, so pool capacity is not tied up by
+    slow generations.
+    """
+    logger.info(f"Generating suggestions for: {transcript}")
+
+    # Embedding and queries block; they run in worker threads so the
+    # connection's audio and transcripts keep flowing meanwhile
+    db_user = await asyncio.to_thread(crud.get_user_by_email, db, email=user.get("email"))
+    if db_user:
+        # Embed the transcript once for every vector lookup below
+        query_embedding = await asyncio.to_thread(crud.embed_text, transcript)
+
+        # Use the vector search to find relevant context from scenarios
+        match = await asyncio.to_thread(
+            crud.find_similar_question_with_distance,
+            db,
+            query_text=transcript,
+            user_id=db_user.id,
+            query_embedding=query_embedding,
+        )
+        similar_question, distance = match if match else (None, None)
+
+        if (
+            similar_question is not None
+            and session.pregenerated_max_distance is not None
+            and similar_question.precomputed_suggestions
+            and distance <= session.pregenerated_max_distance
+        ):
+            # The user expected this question; skip the LLM entirely
+            logger.info("Serving pre-generated suggestions.", distance=distance)
+            await manager.send_personal_json(
+                {
+                    "type": "suggestions",
+                    "data": list(similar_question.precomputed_suggestions),
+                },
+                websocket,
+            )
+            return
+
+        await session.ensure_prompt_cache(llm_client, db, user_id=db_user.id)
+        if session.prompt_cache is not None:
+            # The full profile is already part of the cached prefix
+            preference_texts = []
+        else:
+            # Only the preferences relevant to this transcript, within budget
+            preference_texts = await asyncio.to_thread(
+                session.preferences.select,
+                db,
+                user_id=db_user.id,
+                query_embedding=query_embedding,
+            )
+
+        # Recent turns plus the rolling summary of older ones
+        conversation_history = session.memory.context(exclude_latest=transcript)
+        # Add the similar question's context to the prompt if found
+        if similar_question:
+            conversation_history.append(question_context(similar_question))
+
+        # Ends the read-only transaction; the fallback checks out a new one
+        await asyncio.to_thread(db.rollback)
+        suggestions = await _live_suggestions(
+            session,
+            llm_client,
+            transcript=transcript,
+            user_preferences=preference_texts,
+            conversation_history=conversation_history,
+        )
+        if not suggestions:
+            # LLM unavailable, slow or empty: answer locally instead
+            suggestions = await asyncio.to_thread(
+                _fallback_suggestions, db, similar_question, db_user.id
+            )
+    else:
+        # Fallback if user somehow isn't in DB
+        suggestions = list(GENERIC_SUGGESTIONS)
+
+    await manager.send_personal_json(
+        {"type": "suggestions", "data": suggestions}, websocket
+    )
 
 
 async def handle_message(
     manager: ConnectionManager,
     websocket: WebSocket,
     message: Dict[str, Any],
-    db: Session,
+    session_factory: Callable[[], Session],
     user: Dict[str, Any],
     llm_client: GeminiClient,
-    audio_queue: asyncio.Queue,
+    audio_queue: AudioBuffer,
+    session: ConversationSession | None = None,
 ):
     """
     Processes a single JSON message from a WebSocket client.
+
+    `session` carries the connection-scoped state (cached preferences, tuning).
+    When omitted, a default session is used for this message alone.
+    Messages that need the database open a session from `session_factory`
+    and close it before returning; a connection can last for hours and must
+    not hold a pooled DB connection in between.
     """
+    session = session or ConversationSession()
     msg_type = message.get("type")
 
     if msg_type == "audio":
@@ -98,41 +590,31 @@ async def handle_message(
     elif msg_type == "get_suggestions":
         transcript = message.get("transcript", "")
         if transcript:
-            logger.info(f"Received request for suggestions for: {transcript}")
-
-            db_user = crud.get_user_by_email(db, email=user.get("email"))
-            if db_user:
-                # Fetch both preferences and the most similar question
-                preferences = crud.get_user_preferences(db, user_id=db_user.id)
-                preference_texts = [pref.preference_text for pref in preferences]
-
-                # Use the vector search to find relevant context from scenarios
-                similar_question = crud.find_similar_question(
-                    db, query_text=transcript, user_id=db_user.id
+            db = session_factory()
+            try:
+                await send_suggestions(
+                    manager, websocket, transcript, db, user, llm_client, session
                 )
+            finally:
+                db.close()
 
-                # Add the similar question's context to the prompt if found
-                conversation_history = []  # Placeholder for future enhancement
-                if similar_question:
-                    history_context = (
-                        f"Recall this related question and answer: "
-                        f"Q: '{similar_question.question_text}' "
-                        f"A: '{similar_question.user_answer_text}'"
-                    )
-                    conversation_history.append(history_context)
-
-                suggestions = llm_client.get_response_suggestions(
-                    transcript=transcript,
-                    user_preferences=preference_texts,
-                    conversation_history=conversation_history,
-                )
-            else:
-                # Fallback if user somehow isn't in DB
-                suggestions = ["Yes", "No", "Can you repeat that?"]
+    elif msg_type == "session_options":
+        # Opt in to (or out of) suggestions pushed on every final transcript
+        if "server_suggestions" in message:
+            session.server_suggestions = bool(message["server_suggestions"])
+        await manager.send_personal_json(
+            {
+                "type": "session_options",
+                "server_suggestions": session.server_suggestions,
+            },
+            websocket,
+        )
 
-            await manager.send_personal_json(
-                {"type": "suggestions", "data": suggestions}, websocket
-            )
+    elif msg_type == "user_reply":
+        # A reply the user sent (picked suggestion or typed text)
+        text = message.get("text", "")
+        if text:
+            session.memory.add_turn("user", text)
 
     elif msg_type == "ping":
         await manager.send_personal_json(
@@ -0,0 +1,226 @@
+# src/signconnect/stt/backends.py
+import asyncio
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, NamedTuple, Optional, Sequence
+
+import structlog
+from google.cloud import speech
+
+from signconnect.services.audio_buffer import AudioBuffer
+from signconnect.services.silence_gate import SilenceGate
+from signconnect.services.speech_pool import SpeechClientPool
+from signconnect.services.transcription import TranscriptResult, stream_transcripts
+
+logger = structlog.get_logger(__name__)
+
+GOOGLE = "google"
+LOCAL = "local"
+FAKE = "fake"
+
+
+class SpeechBackend(ABC):
+    """
+    Interface for a speech-to-text engine.
+
+    A backend is created once per worker and shared by every connection;
+    `transcribe` is called once per connection with that connection's audio.
+    """
+
+    name = "base"
+
+    async def start(self) -> None:
+        """
+        Prepares shared resources (channels, models) before the first session.
+        """
+
+    async def close(self) -> None:
+        """
+        Releases shared resources at shutdown.
+        """
+
+    @abstractmethod
+    def transcribe(
+        self, audio_queue: AudioBuffer, gate: Optional[SilenceGate] = None
+    ) -> AsyncIterator[TranscriptResult]:
+        """
+        Transcribes WebM/Opus audio chunks from the queue until it ends (None).
+
+        `gate` keeps silence from a billed engine; engines that run locally
+        may ignore it.
+
+        Returns:
+            An async iterator of interim and final transcripts.
+        """
+
+
+class GoogleSpeechBackend(SpeechBackend):
+    """
+    Google Cloud Speech-to-Text streaming recognition.
+    """
+
+    name = GOOGLE
+
+    def __init__(
+        self,
+        pool: Optional[SpeechClientPool] = None,
+        language_code: str = "en-US",
+        max_stream_seconds: float = 280.0,
+        replay_seconds: float = 10.0,
+        max_consecutive_errors: int = 5,
+        aggregate_max_bytes: int = 64 * 1024,
+        aggregate_max_delay_seconds: float = 0.0,
+    ):
+        """
+        Args:
+            pool: Shared Speech clients; a single-client pool is created if omitted.
+            language_code: BCP-47 language of the speech.
+            max_stream_seconds, replay_seconds, max_consecutive_errors:
+                Stream rotation and recovery options, see stream_transcripts.
+            aggregate_max_bytes, aggregate_max_delay_seconds:
+                Bounds for joining queued chunks into one request.
+        """
+        self.pool = pool or SpeechClientPool(size=1)
+        self.streaming_config = speech.StreamingRecognitionConfig(
+            config=speech.RecognitionConfig(
+                encoding=speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
+                sample_rate_hertz=48000,
+                language_code=language_code,
+                enable_automatic_punctuation=True,
+                model="latest_long",
+            ),
+            interim_results=True,
+        )
+        self._stream_options = {
+            "max_stream_seconds": max_stream_seconds,
+            "replay_seconds": replay_seconds,
+            "max_consecutive_errors": max_consecutive_errors,
+            "aggregate_max_bytes": aggregate_max_bytes,
+            "aggregate_max_delay_seconds": aggregate_max_delay_seconds,
+        }
+
+    async def start(self) -> None:
+        await self.pool.start()
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+    def transcribe(
+        self, audio_queue: AudioBuffer, gate: Optional[SilenceGate] = None
+    ) -> AsyncIterator[TranscriptResult]:
+        return stream_transcripts(
+            self.pool.acquire(), self.streaming_config, audio_queue, gate=gate, **self._stream_options
+        )
+
+
+class ScriptedEvent(NamedTuple):
+    """A transcript the scripted backend emits `delay` seconds after the previous one."""
+
+    delay: float
+    text: str
+    is_final: bool
+
+
+class ScriptedSpeechBackend(SpeechBackend):
+    """
+    A fake engine that ignores the audio content and emits a fixed script.
+
+    The script starts when the first audio chunk arrives and repeats while
+    audio keeps coming, so load tests and benchmarks get reproducible
+    transcripts and timings without network access.
+    """
+
+    name = FAKE
+
+    def __init__(self, script: Sequence[ScriptedEvent], repeat: bool = True):
+        """
+        Args:
+            script: The transcripts to emit, in order.
+            repeat: Restart the script when it finishes while audio is still flowing.
+        """
+        if not script:
+            raise ValueError("A scripted speech backend needs at least one event")
+        self.script = list(script)
+        self.repeat = repeat
+
+    @classmethod
+    def from_text(cls, text: str, word_interval_seconds: float = 0.2, repeat: bool = True):
+        """
+        Builds a script that reveals `text` one word per interval as interim
+        transcripts, followed by the full text as a final transcript.
+        """
+        words = text.split()
+        script = [
+            ScriptedEvent(word_interval_seconds, " ".join(words[: i + 1]), False)
+            for i in range(len(words) - 1)
+        ]
+        script.append(ScriptedEvent(word_interval_seconds, text, True))
+        return cls(script, repeat=repeat)
+
+    async def transcribe(
+        self, audio_queue: AudioBuffer, gate: Optional[SilenceGate] = None
+    ) -> AsyncIterator[TranscriptResult]:
+        started = asyncio.Event()
+        ended = asyncio.Event()
+
+        async def drain():
+            # Consume audio like a real engine, so buffering behaves the same
+            while True:
+                chunk = await audio_queue.get()
+                if chunk is None:
+                    break
+                started.set()
+            started.set()
+            ended.set()
+
+        drainer = asyncio.create_task(drain())
+        try:
+            await started.wait()
+            while not ended.is_set():
+                for event in self.script:
+                    try:
+                        await asyncio.wait_for(ended.wait(), timeout=event.delay)
+                        return
+                    except asyncio.TimeoutError:
+                        pass
+                    yield TranscriptResult(event.text, event.is_final)
+                if not self.repeat:
+                    break
+        finally:
+            drainer.cancel()
+
+
+def create_speech_backend(settings, pool: Optional[SpeechClientPool] = None) -> SpeechBackend:
+    """
+    Creates the speech-to-text backend selected by settings.STT_BACKEND.
+
+    Args:
+        settings: The application settings.
+        pool: Shared Speech clients for the Google backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if settings.STT_BACKEND == GOOGLE:
+        return GoogleSpeechBackend(
+            pool=pool or SpeechClientPool(size=settings.SPEECH_CLIENT_POOL_SIZE),
+            language_code=settings.STT_LANGUAGE_CODE,
+            max_stream_seconds=settings.STT_STREAM_MAX_SECONDS,
+            replay_seconds=settings.STT_REPLAY_SECONDS,
+            max_consecutive_errors=settings.STT_MAX_CONSECUTIVE_ERRORS,
+            aggregate_max_bytes=settings.STT_AGGREGATE_MAX_BYTES,
+            aggregate_max_delay_seconds=settings.STT_AGGREGATE_MAX_DELAY_SECONDS,
+        )
+    if settings.STT_BACKEND == LOCAL:
+        # Imported lazily: the offline engine's dependencies are optional
+        from signconnect.stt.local import LocalSpeechBackend
+
+        return LocalSpeechBackend(
+            model_path=settings.STT_LOCAL_MODEL_PATH,
+            sample_rate=settings.STT_LOCAL_SAMPLE_RATE,
+        )
+    if settings.STT_BACKEND == FAKE:
+        return ScriptedSpeechBackend.from_text(
+            settings.STT_FAKE_TRANSCRIPT,
+            word_interval_seconds=settings.STT_FAKE_WORD_INTERVAL_SECONDS,
+        )
+    raise ValueError(f"Unknown speech-to-text backend: {settings.STT_BACKEND}")
@@ -0,0 +1,170 @@
+# src/signconnect/stt/local.py
+import asyncio
+import json
+import shutil
+from typing import AsyncIterator, Optional
+
+import structlog
+
+from signconnect.services.audio_buffer import AudioBuffer
+from signconnect.services.silence_gate import SilenceGate
+from signconnect.services.transcription import TranscriptResult
+from signconnect.stt.backends import LOCAL, SpeechBackend
+
+logger = structlog.get_logger(__name__)
+
+# Bytes of 16-bit mono PCM handed to the recognizer at a time (125 ms at 16 kHz).
+PCM_BLOCK_BYTES = 4000
+
+
+class OpusDecoder:
+    """
+    Decodes a WebM/Opus byte stream to 16-bit mono PCM with an ffmpeg process.
+
+    The browser's MediaRecorder output is a single WebM container split into
+    arbitrary chunks, so it is fed to one long-lived decoder per connection
+    rather than decoded chunk by chunk.
+    """
+
+    def __init__(self, sample_rate: int = 16000, ffmpeg_path: str = "ffmpeg"):
+        self.sample_rate = sample_rate
+        self.ffmpeg_path = ffmpeg_path
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+    async def start(self) -> None:
+        """
+        Starts the decoder process.
+
+        Raises:
+            RuntimeError: If ffmpeg is not installed.
+        """
+        if shutil.which(self.ffmpeg_path) is None:
+            raise RuntimeError(f"The local speech backend needs {self.ffmpeg_path} on PATH")
+        self._process = await asyncio.create_subprocess_exec(
+            self.ffmpeg_path,
+            "-loglevel", "error",
+            "-i", "pipe:0",
+            "-f", "s16le",
+            "-ac", "1",
+            "-ar", str(self.sample_rate),
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+
+    async def write(self, chunk: bytes) -> None:
+        """
+        Feeds encoded audio to the decoder.
+        """
+        self._process.stdin.write(chunk)
+        await self._process.stdin.drain()
+
+    def end_input(self) -> None:
+        """
+        Signals the end of the encoded stream; `read` returns b"" once drained.
+        """
+        if not self._process.stdin.is_closing():
+            self._process.stdin.close()
+
+    async def read(self, size: int = PCM_BLOCK_BYTES) -> bytes:
+        """
+        Returns up to `size` bytes of decoded PCM, or b"" at the end of the stream.
+        """
+        return await self._process.stdout.read(size)
+
+    async def close(self) -> None:
+        """
+        Stops the decoder process.
+        """
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+
+
+class LocalSpeechBackend(SpeechBackend):
+    """
+    Offline recognition on the CPU with Vosk, fed by an Opus decode stage.
+
+    Requires the optional `vosk` package, a downloaded Vosk model and ffmpeg.
+    Transcripts come without punctuation or capitalization.
+    """
+
+    name = LOCAL
+
+    def __init__(self, model_path: Optional[str], sample_rate: int = 16000, ffmpeg_path: str = "ffmpeg"):
+        """
+        Args:
+            model_path: Directory of the Vosk model.
+            sample_rate: PCM sample rate the model expects.
+            ffmpeg_path: ffmpeg executable used to decode WebM/Opus.
+        """
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.ffmpeg_path = ffmpeg_path
+        self._vosk = None
+        self._model = None
+
+    async def start(self) -> None:
+        """
+        Loads the model once for all connections.
+
+        Raises:
+            RuntimeError: If vosk is not installed or no model path is configured.
+        """
+        if self._model is not None:
+            return
+        try:
+            import vosk
+        except ImportError as e:
+            raise RuntimeError("The local speech backend needs the optional 'vosk' package") from e
+        if not self.model_path:
+            raise RuntimeError("STT_LOCAL_MODEL_PATH must be set for the local speech backend")
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self._model = await asyncio.to_thread(vosk.Model, self.model_path)
+        logger.info("Local speech model loaded.", model_path=self.model_path)
+
+    async def transcribe(
+        self, audio_queue: AudioBuffer, gate: Optional[SilenceGate] = None
+    ) -> AsyncIterator[TranscriptResult]:
+        # Local recognition is not billed, so every chunk is decoded
+        await self.start()
+        recognizer = self._vosk.KaldiRecognizer(self._model, self.sample_rate)
+        decoder = OpusDecoder(self.sample_rate, self.ffmpeg_path)
+        await decoder.start()
+
+        async def feed():
+            try:
+                while True:
+                    chunk = await audio_queue.get()
+                    if chunk is None:
+                        break
+                    await decoder.write(chunk)
+            finally:
+                decoder.end_input()
+
+        feeder = asyncio.create_task(feed())
+        last_partial = ""
+        try:
+            while True:
+                pcm = await decoder.read()
+                if not pcm:
+                    break
+                # Recognition is CPU-bound; keep it off the event loop
+                if await asyncio.to_thread(recognizer.AcceptWaveform, pcm):
+                    text = json.loads(recognizer.Result()).get("text", "")
+                    last_partial = ""
+                    if text:
+                        yield TranscriptResult(text, True)
+                else:
+                    partial = json.loads(recognizer.PartialResult()).get("partial", "")
+                    if partial and partial != last_partial:
+                        last_partial = partial
+                        yield TranscriptResult(partial, False)
+
+            text = json.loads(recognizer.FinalResult()).get("text", "")
+            if text:
+                yield TranscriptResult(text, True)
+        finally:
+            feeder.cancel()
+            await decoder.close()
@@ -0,0 +1,101 @@
+# src/signconnect/tools/bench_connection_manager.py
+"""
+Benchmarks ConnectionManager with simulated connections.
+
+    python -m signconnect.tools.bench_connection_manager --connections 10000
+
+Each simulated client's send takes a random time up to --send-delay-ms; a
+--slow-fraction of them never complete. A broadcast only enqueues; the
+per-connection writers deliver it and evict the stalled clients on timeout.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from signconnect.services.websocket_manager import ConnectionManager
+
+
+class SimulatedWebSocket:
+    """A websocket whose sends take a configurable time."""
+
+    def __init__(self, delay_seconds: float, stalled: bool):
+        self.delay_seconds = delay_seconds
+        self.stalled = stalled
+        self.received = 0
+
+    async def send_text(self, message: str) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        self.received += 1
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+async def run(args: argparse.Namespace) -> None:
+    manager = ConnectionManager(send_timeout_seconds=args.send_timeout)
+    sockets = [
+        SimulatedWebSocket(
+            delay_seconds=random.uniform(0, args.send_delay_ms / 1000),
+            stalled=random.random() < args.slow_fraction,
+        )
+        for _ in range(args.connections)
+    ]
+    users = max(1, args.connections // args.devices_per_user)
+
+    started = time.perf_counter()
+    for i, ws in enumerate(sockets):
+        await manager.connect(ws, user_id=f"user-{i % users}")
+    # Let the writer tasks start and park, as they would between real connects
+    await asyncio.sleep(0)
+    connect_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await manager.broadcast_json({"type": "notice", "data": "benchmark"})
+    broadcast_seconds = time.perf_counter() - started
+    # Poll rather than wait on every queue: thousands of waiters would load
+    # the event loop and skew the send timings being measured
+    deadline = time.perf_counter() + args.send_timeout * 4
+    while time.perf_counter() < deadline:
+        delivered = sum(ws.received for ws in sockets)
+        evicted = args.connections - len(manager)
+        if delivered + evicted == args.connections:
+            break
+        await asyncio.sleep(0.01)
+    delivered_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(manager.send_to_user(f"user-{i}", {"type": "notice", "data": "per-user"}) for i in range(users))
+    )
+    user_fan_out_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for ws in sockets:
+        manager.disconnect(ws)
+    disconnect_seconds = time.perf_counter() - started
+
+    print(f"connections:         {args.connections} ({users} users)")
+    print(f"connect all:         {connect_seconds * 1000:.1f} ms")
+    print(f"broadcast enqueue:   {broadcast_seconds * 1000:.1f} ms")
+    print(f"broadcast delivered: {delivered_seconds * 1000:.1f} ms, "
+          f"{delivered} delivered, {evicted} evicted")
+    print(f"per-user fan-out:    {user_fan_out_seconds * 1000:.1f} ms, all {users} users at once")
+    print(f"disconnect all:      {disconnect_seconds * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--devices-per-user", type=int, default=2)
+    parser.add_argument("--send-delay-ms", type=float, default=5.0)
+    parser.add_argument("--slow-fraction", type=float, default=0.01)
+    parser.add_argument("--send-timeout", type=float, default=2.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
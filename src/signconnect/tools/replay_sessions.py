@@ -0,0 +1,217 @@
+# src/signconnect/tools/replay_sessions.py
+"""
+Replays recorded websocket sessions against a server as a load test.
+
+Start the server with the stand-ins so the results measure the pipeline
+rather than the providers, and with load-test authentication enabled:
+
+    STT_BACKEND=fake LLM_BACKEND=fake LOAD_TEST_AUTH_TOKEN=secret \\
+        uvicorn signconnect.main:app --app-dir src
+
+Then drive N concurrent sessions from recordings made with
+SESSION_RECORDING_DIR:
+
+    python -m signconnect.tools.replay_sessions --token-secret secret \\
+        --sessions 50 --speed 2 recordings/*.screc
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from typing import Dict, List, Optional
+
+import websockets
+
+from signconnect.services.protocol import (
+    JSON_ENCODING,
+    PROTOCOL_V3,
+    SUBPROTOCOLS,
+    MsgPackEncoding,
+    msgpack_available,
+)
+from signconnect.services.session_recording import AUDIO, RecordedFrame, read_recording
+
+# Client-observed stages, in the order they are reported.
+STAGES = [
+    "connect",
+    "first_interim",
+    "audio_to_final",
+    "final_to_suggestions",
+    "request_to_suggestions",
+    "ping_rtt",
+]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of `values` (fraction between 0 and 1).
+    """
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(samples: Dict[str, List[float]]) -> str:
+    """
+    Formats per-stage latency percentiles, in milliseconds, as a table.
+    """
+    lines = [f"{'stage':<24}{'count':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"]
+    for stage in STAGES:
+        values = samples.get(stage)
+        if not values:
+            continue
+        row = [percentile(values, q) * 1000 for q in (0.5, 0.9, 0.99)] + [max(values) * 1000]
+        lines.append(f"{stage:<24}{len(values):>7}" + "".join(f"{v:>9.1f}" for v in row))
+    return "\n".join(lines)
+
+
+class SessionTimeline:
+    """
+    Turns the frames one replayed session sends and receives into stage latencies.
+    """
+
+    def __init__(self, samples: Dict[str, List[float]]):
+        self.samples = samples
+        self.utterance_started: Optional[float] = None
+        self.interim_seen = False
+        self.final_at: Optional[float] = None
+        self.requested_at: Optional[float] = None
+        self.ping_at: Optional[float] = None
+
+    def sent(self, frame: RecordedFrame, now: float) -> None:
+        if frame.kind == AUDIO:
+            if self.utterance_started is None:
+                self.utterance_started = now
+            return
+        message_type = json.loads(frame.payload).get("type")
+        if message_type == "get_suggestions":
+            self.requested_at = now
+        elif message_type == "ping":
+            self.ping_at = now
+
+    def received(self, message: dict, now: float) -> None:
+        message_type = message.get("type")
+        if message_type in ("interim_transcript", "interim_transcript_delta"):
+            if self.utterance_started is not None and not self.interim_seen:
+                self._add("first_interim", now - self.utterance_started)
+                self.interim_seen = True
+        elif message_type == "final_transcript":
+            if self.utterance_started is not None:
+                self._add("audio_to_final", now - self.utterance_started)
+            self.utterance_started = None
+            self.interim_seen = False
+            self.final_at = now
+        elif message_type == "suggestions":
+            if self.requested_at is not None:
+                self._add("request_to_suggestions", now - self.requested_at)
+                self.requested_at = None
+            elif self.final_at is not None:
+                self._add("final_to_suggestions", now - self.final_at)
+            self.final_at = None
+        elif message_type == "pong" and self.ping_at is not None:
+            self._add("ping_rtt", now - self.ping_at)
+            self.ping_at = None
+
+    def _add(self, stage: str, seconds: float) -> None:
+        self.samples.setdefault(stage, []).append(seconds)
+
+
+async def replay_session(
+    url: str,
+    token: str,
+    frames: List[RecordedFrame],
+    speed: float,
+    drain_seconds: float,
+    samples: Dict[str, List[float]],
+) -> None:
+    """
+    Replays one recording over a new connection.
+
+    Args:
+        url: The server's websocket URL.
+        token: Authentication token sent as the first frame.
+        frames: The recorded frames to send.
+        speed: Playback speed relative to the recording; 0 sends as fast as possible.
+        drain_seconds: How long to keep listening after the last frame.
+        samples: Stage latencies are appended here.
+    """
+    timeline = SessionTimeline(samples)
+    started = time.monotonic()
+    # Offer every protocol this process can decode, like a real client would
+    offered = [
+        name
+        for name, version in SUBPROTOCOLS.items()
+        if version < PROTOCOL_V3 or msgpack_available()
+    ]
+    async with websockets.connect(url, subprotocols=offered) as ws:
+        await ws.send(token)
+        samples.setdefault("connect", []).append(time.monotonic() - started)
+        if SUBPROTOCOLS.get(ws.subprotocol) == PROTOCOL_V3:
+            encoding = MsgPackEncoding()
+        else:
+            encoding = JSON_ENCODING
+
+        async def receive():
+            async for raw in ws:
+                now = time.monotonic()
+                for item in encoding.decode(raw):
+                    timeline.received(item, now)
+
+        receiver = asyncio.create_task(receive())
+        playback_started = time.monotonic()
+        for frame in frames:
+            if speed > 0:
+                delay = playback_started + frame.offset_seconds / speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if frame.kind == AUDIO:
+                await ws.send(frame.payload)
+            else:
+                await ws.send(frame.payload.decode("utf-8"))
+            timeline.sent(frame, time.monotonic())
+        await asyncio.sleep(drain_seconds)
+        receiver.cancel()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, List[float]]:
+    recordings = [list(read_recording(path)) for path in args.recordings]
+    samples: Dict[str, List[float]] = {}
+    results = await asyncio.gather(
+        *(
+            replay_session(
+                args.url,
+                f"{args.token_secret}:{i}",
+                recordings[i % len(recordings)],
+                args.speed,
+                args.drain_seconds,
+                samples,
+            )
+            for i in range(args.sessions)
+        ),
+        return_exceptions=True,
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        print(f"{len(failures)} of {args.sessions} sessions failed, e.g.: {failures[0]!r}")
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("recordings", nargs="+", help="Session recordings (.screc)")
+    parser.add_argument("--url", default="ws://localhost:8000/api/ws")
+    parser.add_argument("--token-secret", required=True, help="The server's LOAD_TEST_AUTH_TOKEN")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent sessions")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed; 0 = no pacing")
+    parser.add_argument("--drain-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    samples = asyncio.run(run(args))
+    print(f"Replayed {args.sessions} sessions in {time.monotonic() - started:.1f}s")
+    print(summarize(samples))
+
+
+if __name__ == "__main__":
+    main()
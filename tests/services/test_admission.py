@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from signconnect.services.admission import (
+    LLM_REQUESTS,
+    LOOP_LAG,
+    SESSIONS,
+    AdmissionController,
+    track_llm_call,
+)
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+async def test_new_sessions_are_refused_at_the_session_limit():
+    """
+    Test the session limit and the load score.
+
+    **Pre-conditions:**
+    - The worker allows 4 sessions and has 3, then 4.
+
+    **Post-conditions:**
+    - The fourth session is admitted, the fifth refused with a jittered
+      retry hint; the score reflects the fraction in use.
+    """
+    sessions = [3]
+    admission = AdmissionController(
+        lambda: sessions[0], max_sessions=4, retry_after_seconds=5
+    )
+
+    assert admission.load()["score"] == 0.75
+    assert admission.check() is None
+
+    sessions[0] = 4
+    refusal = admission.check()
+    assert refusal.reason == SESSIONS
+    assert 5 <= refusal.retry_after_seconds <= 10
+    load = admission.load()
+    assert (load["score"], load["accepting"], load["limiting"]) == (1.0, False, SESSIONS)
+
+
+async def test_pending_llm_calls_count_until_they_return():
+    """
+    Test that LLM calls running in worker threads count against the limit,
+    and stop counting when they return.
+    """
+    admission = AdmissionController(lambda: 0, max_pending_llm_requests=1)
+    release = threading.Event()
+    call = asyncio.create_task(asyncio.to_thread(track_llm_call(release.wait)))
+    await asyncio.sleep(0.05)
+
+    assert admission.pending_llm_requests == 1
+    assert admission.check().reason == LLM_REQUESTS
+
+    release.set()
+    await call
+    assert admission.pending_llm_requests == 0
+    assert admission.check() is None
+
+
+async def test_a_blocked_event_loop_refuses_new_sessions():
+    """
+    Test the event-loop lag limit.
+
+    **Pre-conditions:**
+    - Something blocks the loop for longer than the allowed lag.
+
+    **Post-conditions:**
+    - New sessions are refused for loop lag until it is sampled out.
+    """
+    admission = AdmissionController(
+        lambda: 0, max_loop_lag_seconds=0.05, lag_sample_interval_seconds=0.01, lag_window=2
+    )
+    await admission.start()
+    await asyncio.sleep(0.02)
+    assert admission.check() is None
+
+    time.sleep(0.1)  # blocks the loop
+    await asyncio.sleep(0.005)
+    assert admission.check().reason == LOOP_LAG
+
+    await asyncio.sleep(0.1)
+    assert admission.check() is None
+    await admission.close()
@@ -0,0 +1,92 @@
+import pytest
+
+from signconnect.services.audio_buffer import AudioBuffer, DROP_OLDEST, PAUSE
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_drop_oldest_bounds_bytes_and_keeps_header():
+    """
+    Test that overflowing the byte limit drops the oldest audio, but never the
+    unconsumed first (header) chunk.
+
+    **Post-conditions:**
+    - The buffer stays within max_bytes.
+    - The header chunk and the newest chunk survive.
+    - Drop counters reflect the dropped chunk.
+    """
+    buffer = AudioBuffer(max_bytes=10, max_seconds=60, policy=DROP_OLDEST)
+
+    await buffer.put(b"head")
+    await buffer.put(b"aaaa")
+    await buffer.put(b"bbbb")
+
+    assert buffer.buffered_bytes <= 10
+    assert buffer.dropped_chunks == 1
+    assert await buffer.get() == b"head"
+    assert await buffer.get() == b"bbbb"
+    buffer.discard()
+
+
+async def test_stale_audio_is_dropped():
+    """
+    Test that chunks waiting longer than max_seconds are dropped.
+    """
+    clock = FakeClock()
+    buffer = AudioBuffer(max_bytes=1000, max_seconds=5, policy=DROP_OLDEST, clock=clock)
+
+    await buffer.put(b"head")
+    assert await buffer.get() == b"head"
+    await buffer.put(b"old")
+    clock.now = 10.0
+    await buffer.put(b"new")
+
+    assert await buffer.get() == b"new"
+    assert buffer.dropped_chunks == 1
+    buffer.discard()
+
+
+async def test_pause_policy_signals_pause_and_resume():
+    """
+    Test that the pause policy asks the client to pause when the buffer fills
+    and to resume once it has drained.
+    """
+    signals = []
+    buffer = AudioBuffer(
+        max_bytes=8, max_seconds=60, policy=PAUSE, on_flow_control=signals.append
+    )
+
+    await buffer.put(b"head")
+    await buffer.put(b"aaaa")
+    await buffer.put(b"bbbb")
+    assert signals == ["pause"]
+    assert buffer.dropped_chunks == 0  # still under the hard limit
+
+    await buffer.get()
+    await buffer.get()
+    assert signals == ["pause", "resume"]
+    buffer.discard()
+
+
+async def test_get_returns_none_after_end_of_stream():
+    """
+    Test that putting None ends the stream once buffered audio is drained.
+    """
+    buffer = AudioBuffer(max_bytes=100, max_seconds=60)
+
+    await buffer.put(b"chunk")
+    await buffer.put(None)
+
+    assert await buffer.get() == b"chunk"
+    assert await buffer.get() is None
@@ -0,0 +1,197 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from signconnect.services.backplane import (
+    Backplane,
+    InMemoryBackplane,
+    InMemoryHub,
+    RedisBackplane,
+)
+from signconnect.services.websocket_manager import ConnectionManager
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClock:
+    """A manually advanced wall clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedisServer:
+    """
+    A local stand-in for the Redis commands the backplane uses: pub/sub and
+    hashes, shared by every client connected to it.
+    """
+
+    def __init__(self):
+        self.hashes = {}
+        self.subscribers = {}
+
+    def client(self):
+        return FakeRedisClient(self)
+
+
+class FakeRedisClient:
+    def __init__(self, server):
+        self.server = server
+
+    async def publish(self, channel, data):
+        for queue in self.server.subscribers.get(channel, []):
+            queue.put_nowait({"type": "message", "channel": channel, "data": data})
+
+    def pubsub(self):
+        return FakePubSub(self.server)
+
+    async def hset(self, key, field, value):
+        self.server.hashes.setdefault(key, {})[field] = str(value)
+
+    async def hdel(self, key, field):
+        self.server.hashes.get(key, {}).pop(field, None)
+
+    async def hgetall(self, key):
+        return dict(self.server.hashes.get(key, {}))
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def aclose(self):
+        pass
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.server.subscribers.setdefault(channel, []).append(self.queue)
+        self.queue.put_nowait({"type": "subscribe", "channel": channel, "data": 1})
+
+    async def unsubscribe(self, channel):
+        self.server.subscribers[channel].remove(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        pass
+
+
+def _socket():
+    websocket = MagicMock()
+    websocket.send_text = AsyncMock()
+    websocket.close = AsyncMock()
+    return websocket
+
+
+async def _cluster(backplanes):
+    managers = [ConnectionManager(backplane=backplane) for backplane in backplanes]
+    for manager in managers:
+        await manager.start()
+    return managers
+
+
+async def test_user_sends_and_broadcasts_reach_every_node_once():
+    """
+    Test delivery across two workers sharing an in-memory hub.
+
+    **Pre-conditions:**
+    - Alice has a device on each node; Bob is connected to node B only.
+
+    **Post-conditions:**
+    - A send to Alice from node B reaches both her devices, exactly once each.
+    - A broadcast from node A reaches everyone, exactly once each.
+    """
+    hub = InMemoryHub()
+    node_a, node_b = await _cluster([InMemoryBackplane(hub), InMemoryBackplane(hub)])
+    alice_phone, alice_laptop, bob = _socket(), _socket(), _socket()
+    await node_a.connect(alice_phone, user_id="alice")
+    await node_b.connect(alice_laptop, user_id="alice")
+    await node_b.connect(bob, user_id="bob")
+
+    assert await node_b.send_to_user("alice", {"type": "notice"}) == 1
+    assert await node_a.broadcast_json({"type": "news"}) == 1
+    await asyncio.sleep(0.01)
+
+    for device in (alice_phone, alice_laptop):
+        sent = [json.loads(call.args[0])["type"] for call in device.send_text.await_args_list]
+        assert sent == ["notice", "news"]
+    bob.send_text.assert_awaited_once_with('{"type": "news"}')
+
+
+async def test_incomplete_backplane_cannot_be_created():
+    """
+    Test that a backplane missing part of the interface fails when it is
+    created; only `close` is optional.
+    """
+
+    class PublishOnly(Backplane):
+        async def start(self, on_envelope):
+            pass
+
+        async def publish(self, envelope):
+            pass
+
+    with pytest.raises(TypeError):
+        PublishOnly()
+
+
+async def test_presence_spans_nodes_and_ends_with_the_last_device():
+    """
+    Test that a user is online while connected to any node.
+    """
+    hub = InMemoryHub()
+    node_a, node_b = await _cluster([InMemoryBackplane(hub), InMemoryBackplane(hub)])
+    phone, laptop = _socket(), _socket()
+    await node_a.connect(phone, user_id="alice")
+    await node_b.connect(laptop, user_id="alice")
+
+    node_a.disconnect(phone)
+    await asyncio.sleep(0)
+    assert await node_a.is_online("alice")
+
+    node_b.disconnect(laptop)
+    await asyncio.sleep(0)
+    assert not await node_a.is_online("alice")
+
+
+async def test_redis_backplane_delivers_and_tracks_presence_with_expiry():
+    """
+    Test the Redis backplane against a local stand-in server.
+
+    **Pre-conditions:**
+    - Two nodes share the stand-in; node B's user is present.
+
+    **Post-conditions:**
+    - Envelopes published by node A reach node B, not node A again.
+    - Presence expires when node B stops refreshing it (e.g. it crashed).
+    """
+    server, clock = FakeRedisServer(), FakeClock()
+    backplanes = [
+        RedisBackplane(client=server.client(), presence_ttl_seconds=30, clock=clock)
+        for _ in range(2)
+    ]
+    node_a, node_b = await _cluster(backplanes)
+    laptop = _socket()
+    await node_b.connect(laptop, user_id="alice")
+
+    assert await node_a.send_to_user("alice", {"type": "notice"}) == 0
+    await asyncio.sleep(0.01)
+    laptop.send_text.assert_awaited_once_with('{"type": "notice"}')
+
+    assert await node_a.is_online("alice")
+    clock.now += 31
+    assert not await node_a.is_online("alice")
+
+    await node_a.close()
+    await node_b.close()
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from signconnect.llm.circuit_breaker import CircuitBreaker
+from signconnect.services.session import ConversationSession
+from signconnect.services.websocket_manager import _live_suggestions
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _open_breaker(clock: FakeClock) -> CircuitBreaker:
+    breaker = CircuitBreaker(
+        window_size=4,
+        min_calls=4,
+        failure_rate_threshold=0.5,
+        latency_slo_seconds=1.0,
+        open_seconds=10.0,
+        probe_interval_seconds=2.0,
+        probes_to_close=2,
+        clock=clock,
+    )
+    for _ in range(4):
+        assert breaker.allow_request()
+        breaker.record(success=False, latency_seconds=0.1)
+    return breaker
+
+
+def test_breaker_opens_on_error_rate():
+    """
+    Tests that the breaker opens once the failure rate reaches the threshold
+    and then rejects calls.
+    """
+    breaker = _open_breaker(FakeClock())
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_slow_calls_count_as_failures():
+    """
+    Tests that successful calls slower than the latency SLO open the breaker.
+    """
+    breaker = CircuitBreaker(window_size=2, min_calls=2, latency_slo_seconds=1.0)
+
+    breaker.record(success=True, latency_seconds=3.0)
+    breaker.record(success=True, latency_seconds=3.0)
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_probes_trickle_and_close_on_success():
+    """
+    Tests that after the cool-down only one probe is allowed per interval and
+    that enough successful probes close the breaker.
+    """
+    clock = FakeClock()
+    breaker = _open_breaker(clock)
+
+    clock.now = 10.0
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # probe already in flight
+    breaker.record(success=True, latency_seconds=0.2)
+    assert not breaker.allow_request()  # probe interval not yet elapsed
+
+    clock.now = 12.0
+    assert breaker.allow_request()
+    breaker.record(success=True, latency_seconds=0.2)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_breaker():
+    """
+    Tests that a failed probe sends the breaker back to the open state.
+    """
+    clock = FakeClock()
+    breaker = _open_breaker(clock)
+
+    clock.now = 10.0
+    assert breaker.allow_request()
+    breaker.record(success=False, latency_seconds=0.2)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_the_probe_slot():
+    """
+    Tests that a half-open probe cancelled mid-call (e.g. superseded by a
+    newer transcript) does not leave the breaker waiting for it forever.
+
+    **Pre-conditions:**
+    - The breaker is half-open and the probe's LLM call is still running.
+
+    **Post-conditions:**
+    - Once the probe is cancelled, the next call may probe again.
+    """
+    clock = FakeClock()
+    breaker = _open_breaker(clock)
+    clock.now = 10.0
+    session = ConversationSession(breaker=breaker)
+    release = threading.Event()
+    llm_client = MagicMock()
+    llm_client.get_response_suggestions.side_effect = lambda **kwargs: release.wait()
+
+    probe = asyncio.create_task(
+        _live_suggestions(session, llm_client, "hello", [], [])
+    )
+    await asyncio.sleep(0.05)
+    assert not breaker.allow_request()  # probe in flight
+
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    release.set()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from signconnect.services.conversation_memory import ConversationMemory
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+async def test_context_keeps_only_recent_turns():
+    """
+    Test that the verbatim context is bounded by max_turns.
+
+    **Post-conditions:**
+    - Only the newest `max_turns` turns remain, oldest first.
+    """
+    memory = ConversationMemory(max_turns=2)
+
+    memory.add_turn("other", "Hello there.")
+    memory.add_turn("user", "Hi!")
+    memory.add_turn("other", "What can I get you?")
+
+    assert memory.context() == ["user: Hi!", "other: What can I get you?"]
+    await memory.close()
+
+
+async def test_evicted_turns_are_folded_into_summary():
+    """
+    Test that turns leaving the ring buffer are summarized in the background.
+
+    **Post-conditions:**
+    - The summarizer receives the evicted turn.
+    - The summary is prepended to the context.
+    """
+    summarizer = MagicMock(return_value="They greeted each other.")
+    memory = ConversationMemory(max_turns=1, summary_batch_turns=1, summarizer=summarizer)
+
+    memory.add_turn("other", "Hello there.")
+    memory.add_turn("user", "Hi!")
+    await asyncio.sleep(0.05)
+
+    summarizer.assert_called_once_with("", ["other: Hello there."], memory.summary_max_tokens)
+    assert memory.context() == ["Summary of earlier conversation: They greeted each other.", "user: Hi!"]
+    await memory.close()
+
+
+async def test_close_flushes_turns_to_store():
+    """
+    Test that every recorded turn reaches the store by the time the memory closes.
+    """
+    store = MagicMock()
+    memory = ConversationMemory(store=store)
+
+    memory.add_turn("other", "Hello there.")
+    memory.add_turn("user", "Hi!")
+    await memory.close()
+
+    stored = [turn for call in store.call_args_list for turn in call.args[0]]
+    assert stored == [("other", "Hello there."), ("user", "Hi!")]
+
+
+async def test_evicted_turns_are_summarized_in_batches():
+    """
+    Test that the summarizer runs once per batch of evicted turns rather than
+    once per turn, and that turns awaiting their batch stay in the context.
+
+    **Post-conditions:**
+    - 10 evicted turns in batches of 4 cost 2 summarizer calls.
+    - The 2 evicted turns not yet summarized are still in the context verbatim.
+    """
+    summarizer = MagicMock(return_value="They chatted.")
+    memory = ConversationMemory(max_turns=2, summary_batch_turns=4, summarizer=summarizer)
+
+    for i in range(12):
+        memory.add_turn("other", f"Turn {i}.")
+        await asyncio.sleep(0.01)
+
+    assert summarizer.call_count == 2
+    assert [len(call.args[1]) for call in summarizer.call_args_list] == [4, 4]
+    assert memory.context() == [
+        "Summary of earlier conversation: They chatted.",
+        "other: Turn 8.",
+        "other: Turn 9.",
+        "other: Turn 10.",
+        "other: Turn 11.",
+    ]
+    await memory.close()
+
+
+async def test_close_waits_for_the_store_already_running():
+    """
+    Test that closing while a store is in flight waits for it instead of
+    running a second store beside it.
+
+    **Pre-conditions:**
+    - The first store blocks until released.
+
+    **Post-conditions:**
+    - Stores never overlap and every turn is persisted exactly once.
+    """
+    started = threading.Event()
+    release = threading.Event()
+    running = []
+    overlapped = []
+    stored = []
+
+    def store(turns):
+        overlapped.append(bool(running))
+        running.append(True)
+        started.set()
+        release.wait()
+        stored.extend(turns)
+        running.pop()
+
+    memory = ConversationMemory(store=store)
+    memory.add_turn("other", "Hello there.")
+    await asyncio.to_thread(started.wait)
+    memory.add_turn("user", "Hi!")
+
+    closing = asyncio.create_task(memory.close())
+    await asyncio.sleep(0.05)
+    release.set()
+    await closing
+
+    assert overlapped == [False, False]
+    assert stored == [("other", "Hello there."), ("user", "Hi!")]
+
+
+async def test_context_excludes_transcript_being_answered():
+    """
+    Test that the newest turn is omitted when it is the transcript being answered.
+    """
+    memory = ConversationMemory()
+
+    memory.add_turn("user", "Hi!")
+    memory.add_turn("other", "Are you ready to order?")
+
+    assert memory.context(exclude_latest="Are you ready to order?") == ["user: Hi!"]
+    await memory.close()
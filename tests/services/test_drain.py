@@ -0,0 +1,96 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from signconnect.services.admission import DRAINING, AdmissionController
+from signconnect.services.drain import ShutdownDrain
+from signconnect.services.message_dispatch import MessageDispatcher
+from signconnect.services.session_resume import LiveSession, ResumeRegistry
+from signconnect.services.websocket_manager import ConnectionManager
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+def _socket():
+    websocket = MagicMock()
+    websocket.send_text = AsyncMock()
+    websocket.close = AsyncMock()
+    return websocket
+
+
+def _drain(manager, resumes=None, timeout_seconds=1.0):
+    admission = AdmissionController(lambda: len(manager), max_sessions=10)
+    drain = ShutdownDrain(
+        manager, resumes or ResumeRegistry(), admission, timeout_seconds=timeout_seconds
+    )
+    return drain, admission
+
+
+async def test_drain_refuses_sessions_and_waits_for_connections_to_hand_over():
+    """
+    Test the worker-wide part of a drain.
+
+    **Pre-conditions:**
+    - One connection is open and one session is parked.
+
+    **Post-conditions:**
+    - New and resumed sessions are refused as soon as the drain starts.
+    - The parked session is expired right away.
+    - The drain returns once the open connection has gone.
+    """
+    manager, resumes = ConnectionManager(), ResumeRegistry(grace_seconds=30)
+    websocket = _socket()
+    await manager.connect(websocket, user_id="alice")
+    parked = LiveSession({"email": "bob@example.com"}, MagicMock(), MagicMock())
+    resumes.issue(parked)
+    on_expire = AsyncMock()
+    resumes.park(parked, on_expire)
+    drain, admission = _drain(manager, resumes)
+
+    draining = asyncio.create_task(drain.drain())
+    await asyncio.sleep(0.01)
+    assert drain.draining
+    assert admission.check().reason == DRAINING
+    assert admission.check(new_session=False).reason == DRAINING
+    on_expire.assert_awaited_once()
+    assert not draining.done()
+
+    manager.disconnect(websocket)  # the endpoint handed its client over
+    await asyncio.wait_for(draining, 1)
+    assert admission.load()["accepting"] is False
+
+
+async def test_drain_gives_up_at_the_deadline():
+    """
+    Test that a connection that does not go away cannot hold up shutdown.
+    """
+    manager = ConnectionManager()
+    await manager.connect(_socket())
+    drain, _ = _drain(manager, timeout_seconds=0.2)
+
+    await asyncio.wait_for(drain.drain(), 1)
+
+    assert drain.remaining() == 0
+    assert len(manager) == 1
+
+
+async def test_dispatcher_join_lets_running_handlers_finish():
+    """
+    Test that in-flight handlers (e.g. a suggestion request) are waited
+    for, not cancelled, within the timeout.
+    """
+    finished = []
+
+    async def handler(message):
+        await asyncio.sleep(0.05)
+        finished.append(message["type"])
+
+    dispatcher = MessageDispatcher(handler)
+    await dispatcher.dispatch({"type": "get_suggestions"})
+    await dispatcher.dispatch({"type": "user_reply"})
+
+    assert not await dispatcher.join(0.01)
+    assert await dispatcher.join(1)
+    assert sorted(finished) == ["get_suggestions", "user_reply"]
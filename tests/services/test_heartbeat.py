@@ -0,0 +1,89 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from signconnect.services.heartbeat import HEARTBEAT_TIMEOUT, IDLE, ConnectionMonitor
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _tick(clock, seconds):
+    """Advances the clock, then lets the monitor run one check."""
+    clock.now += seconds
+    await asyncio.sleep(0.02)
+
+
+async def test_heartbeat_is_sent_only_when_the_line_is_quiet():
+    """
+    Test when heartbeats go out.
+
+    **Pre-conditions:**
+    - The client sends a frame during the first interval, then nothing.
+
+    **Post-conditions:**
+    - No heartbeat follows the busy interval; one follows the quiet one.
+    """
+    clock, send = FakeClock(), AsyncMock()
+    monitor = ConnectionMonitor(send, interval_seconds=0.01, timeout_seconds=100, clock=clock)
+    task = asyncio.create_task(monitor.run())
+
+    clock.now += 5
+    monitor.frame_received()
+    await asyncio.sleep(0.02)
+    send.assert_not_awaited()
+
+    await _tick(clock, 10)
+    send.assert_awaited()
+    task.cancel()
+
+
+async def test_silent_client_is_reaped_after_the_timeout():
+    """
+    Test that a client heard from for longer than the timeout is presumed gone.
+    """
+    clock = FakeClock()
+    monitor = ConnectionMonitor(AsyncMock(), interval_seconds=0.01, timeout_seconds=45, clock=clock)
+    clock.now += 46
+
+    assert await asyncio.wait_for(monitor.run(), 1) == HEARTBEAT_TIMEOUT
+
+
+async def test_heartbeat_acks_keep_a_session_alive_but_not_active():
+    """
+    Test the idle policy.
+
+    **Pre-conditions:**
+    - The client only acknowledges heartbeats past the idle timeout.
+
+    **Post-conditions:**
+    - The session is closed as idle, unless the idle policy is disabled.
+    """
+    clock = FakeClock()
+    monitor = ConnectionMonitor(
+        AsyncMock(), interval_seconds=0.01, timeout_seconds=45, idle_timeout_seconds=600, clock=clock
+    )
+    clock.now += 601
+    monitor.frame_received(activity=False)
+    assert await asyncio.wait_for(monitor.run(), 1) == IDLE
+
+    monitor = ConnectionMonitor(
+        AsyncMock(), interval_seconds=0.01, timeout_seconds=45, idle_timeout_seconds=0, clock=clock
+    )
+    task = asyncio.create_task(monitor.run())
+    clock.now += 601
+    monitor.frame_received(activity=False)
+    await asyncio.sleep(0.02)
+    assert not task.done()
+    task.cancel()
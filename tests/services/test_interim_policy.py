@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from signconnect.services.interim_policy import InterimCoalescer, encode_delta
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _recorder():
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    return sent, send
+
+
+async def test_encode_delta_sends_common_prefix_length_and_suffix():
+    """
+    Test the delta encoding of a growing interim.
+    """
+    assert encode_delta("how are", "how are you") == {
+        "type": "interim_transcript_delta",
+        "prefix": 7,
+        "data": " you",
+    }
+    assert encode_delta("how or", "how are") == {
+        "type": "interim_transcript_delta",
+        "prefix": 4,
+        "data": "are",
+    }
+
+
+async def test_interims_are_rate_limited_and_coalesced():
+    """
+    Test that interims arriving within the interval are coalesced into the
+    newest one, which is still delivered once the interval passes.
+
+    **Post-conditions:**
+    - Superseded interims and unchanged text are never sent.
+    """
+    sent, send = _recorder()
+    coalescer = InterimCoalescer(send, min_interval_seconds=0.05)
+
+    await coalescer.interim("how")
+    await coalescer.interim("how are")
+    await coalescer.interim("how are you")
+    await asyncio.sleep(0.1)
+    await coalescer.interim("how are you")
+    await asyncio.sleep(0.1)
+
+    assert [m["data"] for m in sent] == ["how", "how are you"]
+
+
+async def test_final_flushes_immediately_and_supersedes_pending_interim():
+    """
+    Test that a final is sent at once and a waiting interim is discarded.
+    """
+    sent, send = _recorder()
+    clock = FakeClock()
+    coalescer = InterimCoalescer(send, min_interval_seconds=10, clock=clock)
+
+    await coalescer.interim("good")
+    await coalescer.interim("good morning")
+    await coalescer.final("Good morning.")
+
+    assert sent == [
+        {"type": "interim_transcript", "data": "good"},
+        {"type": "final_transcript", "data": "Good morning."},
+    ]
@@ -0,0 +1,148 @@
+import asyncio
+import base64
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from signconnect.services import websocket_manager
+from signconnect.services.message_dispatch import MessageDispatcher
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+class RecordingHandler:
+    """Records handled messages; get_suggestions blocks until released."""
+
+    def __init__(self):
+        self.handled = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, message):
+        if message["type"] == "get_suggestions":
+            await self.release.wait()
+        self.handled.append(message.get("n", message["type"]))
+
+
+async def test_slow_suggestions_do_not_block_audio_or_control_messages():
+    """
+    Test that while a suggestion request is being handled, audio is handled
+    inline and control messages still run, in order.
+
+    **Pre-conditions:**
+    - The suggestion handler blocks until released.
+
+    **Post-conditions:**
+    - Audio and control messages are handled before the suggestions finish.
+    """
+    handler = RecordingHandler()
+    dispatcher = MessageDispatcher(handler)
+
+    await dispatcher.dispatch({"type": "get_suggestions", "n": "suggest"})
+    await dispatcher.dispatch({"type": "audio", "n": "audio"})
+    assert handler.handled == ["audio"]
+
+    for n in range(3):
+        await dispatcher.dispatch({"type": "user_reply", "n": n})
+    await asyncio.sleep(0.01)
+    assert handler.handled == ["audio", 0, 1, 2]
+
+    handler.release.set()
+    await asyncio.sleep(0.01)
+    assert handler.handled[-1] == "suggest"
+    await dispatcher.close()
+
+
+async def test_full_lane_drops_the_oldest_waiting_message():
+    """
+    Test that a lane keeps at most `max_pending` waiting messages, dropping
+    the stalest suggestion requests first.
+    """
+    handler = RecordingHandler()
+    dispatcher = MessageDispatcher(handler, max_pending=2)
+
+    await dispatcher.dispatch({"type": "get_suggestions", "n": 0})
+    await asyncio.sleep(0)  # the first request is now running
+    for n in range(1, 5):
+        await dispatcher.dispatch({"type": "get_suggestions", "n": n})
+    assert dispatcher.pending == 2
+
+    handler.release.set()
+    await asyncio.sleep(0.01)
+    assert handler.handled == [0, 3, 4]
+    await dispatcher.close()
+
+
+async def test_failing_handler_does_not_stop_its_lane():
+    """
+    Test that an error in one message is logged and the next one is handled.
+    """
+    handled = []
+
+    async def handler(message):
+        if message["n"] == 0:
+            raise ValueError("bad message")
+        handled.append(message["n"])
+
+    dispatcher = MessageDispatcher(handler)
+    await dispatcher.dispatch({"type": "user_reply", "n": 0})
+    await dispatcher.dispatch({"type": "user_reply", "n": 1})
+    await asyncio.sleep(0.01)
+
+    assert handled == [1]
+    await dispatcher.close()
+
+
+async def test_audio_keeps_flowing_while_suggestions_are_computed(monkeypatch):
+    """
+    Test that the blocking work behind a suggestion request (embedding,
+    vector search) runs off the event loop.
+
+    **Pre-conditions:**
+    - Embedding the transcript blocks for 0.3 s.
+    - Audio arrives while the suggestion request is being handled.
+
+    **Post-conditions:**
+    - Every audio chunk is consumed before the suggestions are sent.
+    """
+    monkeypatch.setattr(
+        websocket_manager.crud, "embed_text", lambda text: time.sleep(0.3) or [0.0]
+    )
+    events = []
+    manager = MagicMock()
+    manager.send_personal_json = AsyncMock(
+        side_effect=lambda message, websocket: events.append(message["type"])
+    )
+    llm_client = MagicMock()
+    llm_client.get_response_suggestions.return_value = ["Sure"]
+    audio_queue = asyncio.Queue()
+    dispatcher = MessageDispatcher(
+        lambda message: websocket_manager.handle_message(
+            manager=manager,
+            websocket=MagicMock(),
+            message=message,
+            session_factory=MagicMock,
+            user={"email": "test@example.com"},
+            llm_client=llm_client,
+            audio_queue=audio_queue,
+        )
+    )
+
+    async def transcribe():
+        while True:
+            await audio_queue.get()
+            events.append("audio")
+
+    transcribing = asyncio.create_task(transcribe())
+    await dispatcher.dispatch({"type": "get_suggestions", "transcript": "hello"})
+    for _ in range(5):
+        await asyncio.sleep(0.02)
+        await dispatcher.dispatch(
+            {"type": "audio", "data": base64.b64encode(b"chunk").decode("ascii")}
+        )
+
+    assert await dispatcher.join(1)
+    assert events == ["audio"] * 5 + ["suggestions"]
+    transcribing.cancel()
+
@@ -0,0 +1,124 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from signconnect.services.outbound_queue import OutboundQueue
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+class FakeSocket:
+    """Records sent frames; sends block while `stalled` is set."""
+
+    def __init__(self, stalled=False):
+        self.frames = []
+        self.stalled = stalled
+        self.closed_with = None
+
+    async def send_text(self, text):
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.frames.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+async def _flush(queue):
+    queue.start()
+    assert await queue.drain(1.0)
+    queue.stop()
+
+
+async def test_finals_and_suggestions_are_sent_before_interims():
+    """
+    Test the priority order, and that a newer interim replaces a queued one.
+
+    **Pre-conditions:**
+    - Messages are queued before the writer starts.
+
+    **Post-conditions:**
+    - High-priority messages go first, in order; only the newest interim is sent.
+    """
+    socket = FakeSocket()
+    queue = OutboundQueue(socket)
+    queue.put({"type": "interim_transcript", "data": "how"})
+    queue.put({"type": "suggestions", "data": ["Hi"]})
+    queue.put({"type": "interim_transcript", "data": "how are"})
+    queue.put({"type": "pong"})
+
+    await _flush(queue)
+
+    assert [frame["type"] for frame in socket.frames] == ["suggestions", "pong", "interim_transcript"]
+    assert socket.frames[-1]["data"] == "how are"
+
+
+async def test_final_discards_queued_interims_and_deltas_stay_consistent():
+    """
+    Test that a final supersedes queued interims, and that once a delta has
+    been dropped no later delta is sent until the client's state is reset.
+    """
+    socket = FakeSocket()
+    queue = OutboundQueue(socket, max_messages=2)
+    queue.put({"type": "interim_transcript_delta", "prefix": 0, "data": "how"})
+    queue.put({"type": "suggestions", "data": []})
+    queue.put({"type": "suggestions", "data": []})  # overflows: the delta is dropped
+    queue.put({"type": "interim_transcript_delta", "prefix": 3, "data": " are"})
+    await _flush(queue)
+    assert [frame["type"] for frame in socket.frames] == ["suggestions", "suggestions"]
+
+    socket = FakeSocket()
+    queue = OutboundQueue(socket)
+    queue.put({"type": "interim_transcript", "data": "how are"})
+    queue.put({"type": "final_transcript", "data": "how are you"})
+    await _flush(queue)
+    assert socket.frames == [{"type": "final_transcript", "data": "how are you"}]
+
+
+async def test_waiting_messages_are_batched_for_clients_that_accept_it():
+    """
+    Test that several queued messages leave in one "batch" frame.
+    """
+    socket = FakeSocket()
+    queue = OutboundQueue(socket, max_batch=2, batching=True)
+    for i in range(3):
+        queue.put({"type": "notice", "n": i})
+
+    await _flush(queue)
+
+    assert socket.frames == [
+        {"type": "batch", "messages": [{"type": "notice", "n": 0}, {"type": "notice", "n": 1}]},
+        {"type": "notice", "n": 2},
+    ]
+
+
+async def test_slow_consumer_is_closed():
+    """
+    Test that a client is closed when a send times out, and when its queue
+    overflows with messages that cannot be dropped.
+
+    **Post-conditions:**
+    - The socket is closed with 1013 and `on_close` is told why.
+    - Nothing more is accepted.
+    """
+    socket = FakeSocket(stalled=True)
+    on_close = MagicMock()
+    queue = OutboundQueue(socket, send_timeout_seconds=0.05, on_close=on_close)
+    queue.start()
+    queue.put({"type": "suggestions", "data": []})
+    await asyncio.sleep(0.1)
+
+    on_close.assert_called_once_with(socket, "send timed out")
+    assert socket.closed_with == 1013
+    assert queue.put({"type": "suggestions", "data": []}) is False
+
+    socket = FakeSocket()
+    on_close = MagicMock()
+    queue = OutboundQueue(socket, max_messages=1, on_close=on_close)
+    assert queue.put({"type": "suggestions", "data": []}) is True
+    assert queue.put({"type": "suggestions", "data": []}) is False
+    on_close.assert_called_once_with(socket, "outbound queue full")
+    assert len(queue) == 0
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from signconnect.services import preference_selector
+from signconnect.services.preference_selector import PreferenceSelector
+
+
+def _unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture
+def mock_crud(monkeypatch):
+    """
+    Replaces crud with a mock returning three preferences pointing in
+    different directions of a tiny embedding space.
+    """
+    preferences = [
+        SimpleNamespace(preference_text="I am vegetarian.", preference_embedding=_unit(1, 0, 0)),
+        SimpleNamespace(preference_text="I use a wheelchair.", preference_embedding=_unit(0, 1, 0)),
+        SimpleNamespace(preference_text="I prefer short answers.", preference_embedding=_unit(0, 0, 1)),
+    ]
+    mock = MagicMock()
+    mock.get_user_preferences_with_embeddings.return_value = preferences
+    monkeypatch.setattr(preference_selector, "crud", mock)
+    return mock
+
+
+def test_select_ranks_by_relevance_and_limits_to_top_k(mock_crud):
+    """
+    Test that only the top-k preferences closest to the transcript are returned,
+    most relevant first.
+    """
+    selector = PreferenceSelector(top_k=2, token_budget=1000)
+
+    selected = selector.select(MagicMock(), user_id="user", query_embedding=_unit(0.9, 0, 0.4))
+
+    assert selected == ["I am vegetarian.", "I prefer short answers."]
+
+
+def test_select_respects_token_budget(mock_crud):
+    """
+    Test that preferences which would overflow the token budget are skipped.
+    """
+    selector = PreferenceSelector(top_k=3, token_budget=5)
+
+    selected = selector.select(MagicMock(), user_id="user", query_embedding=_unit(1, 0, 0))
+
+    assert selected == ["I am vegetarian."]
+
+
+def test_select_reuses_loaded_preferences_within_connection(mock_crud):
+    """
+    Test that preferences are loaded once per connection, not once per transcript.
+    """
+    selector = PreferenceSelector(refresh_seconds=60.0)
+
+    selector.select(MagicMock(), user_id="user", query_embedding=_unit(1, 0, 0))
+    selector.select(MagicMock(), user_id="user", query_embedding=_unit(0, 1, 0))
+
+    mock_crud.get_user_preferences_with_embeddings.assert_called_once()
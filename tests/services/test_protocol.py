@@ -0,0 +1,148 @@
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import WebSocketDisconnect
+
+from signconnect.services.protocol import (
+    JSON_ENCODING,
+    PROTOCOL_V1,
+    PROTOCOL_V2,
+    PROTOCOL_V3,
+    MsgPackEncoding,
+    negotiate_protocol,
+    receive_frame,
+)
+from signconnect.services.websocket_manager import ConnectionManager
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+async def test_negotiate_protocol_defaults_to_v1_for_old_clients():
+    """
+    Test that a client offering no subprotocol keeps the JSON-only protocol.
+    """
+    assert negotiate_protocol([]) == (None, PROTOCOL_V1)
+
+
+async def test_negotiate_protocol_accepts_binary_audio():
+    """
+    Test that a client offering the binary audio subprotocol gets it echoed back.
+    """
+    assert negotiate_protocol(["signconnect.v2"]) == ("signconnect.v2", PROTOCOL_V2)
+
+
+async def test_negotiate_protocol_prefers_msgpack_unless_disabled():
+    """
+    Test that the MessagePack protocol wins when offered and allowed.
+    """
+    offered = ["signconnect.v3", "signconnect.v2"]
+    assert negotiate_protocol(offered) == ("signconnect.v3", PROTOCOL_V3)
+    assert negotiate_protocol(offered, max_version=PROTOCOL_V2) == ("signconnect.v2", PROTOCOL_V2)
+
+
+async def test_receive_frame_returns_binary_frames_as_audio():
+    """
+    Test that binary frames are returned untouched as audio.
+    """
+    mock_websocket = MagicMock()
+    mock_websocket.receive = AsyncMock(
+        return_value={"type": "websocket.receive", "bytes": b"opus", "text": None}
+    )
+
+    assert await receive_frame(mock_websocket) == (b"opus", None)
+
+
+async def test_receive_frame_parses_text_frames_as_json():
+    """
+    Test that text frames are parsed as JSON control messages.
+    """
+    mock_websocket = MagicMock()
+    mock_websocket.receive = AsyncMock(
+        return_value={"type": "websocket.receive", "text": '{"type": "ping"}'}
+    )
+
+    assert await receive_frame(mock_websocket) == (None, {"type": "ping"})
+
+
+async def test_receive_frame_raises_on_disconnect():
+    """
+    Test that a disconnect frame surfaces as WebSocketDisconnect.
+    """
+    mock_websocket = MagicMock()
+    mock_websocket.receive = AsyncMock(
+        return_value={"type": "websocket.disconnect", "code": 1001}
+    )
+
+    with pytest.raises(WebSocketDisconnect):
+        await receive_frame(mock_websocket)
+
+
+async def test_msgpack_encoding_uses_short_codes_and_round_trips():
+    """
+    Test the protocol v3 encoding of known and unknown message types.
+
+    **Post-conditions:**
+    - An interim is far smaller than its JSON form.
+    - Single messages and batches decode back to the original messages.
+    """
+    encoding = MsgPackEncoding()
+    interim = {"type": "interim_transcript", "data": "hello"}
+    other = {"type": "notice", "data": {"level": 1}}
+    encoded = [(m["type"], encoding.encode(m)) for m in (interim, other)]
+
+    assert len(encoded[0][1]) < len(json.dumps(interim)) / 3
+    assert encoding.decode(encoding.frame(encoded[:1])) == [interim]
+    assert encoding.decode(encoding.frame(encoded)) == [interim, other]
+
+
+async def test_msgpack_encoding_compresses_only_large_frames_of_configured_classes():
+    """
+    Test per-class compression.
+
+    **Pre-conditions:**
+    - Suggestions are compressed from 64 bytes; control messages are not.
+
+    **Post-conditions:**
+    - Large suggestions are sent compressed and still decode.
+    - Small suggestions and large control messages are sent as they are.
+    """
+    encoding = MsgPackEncoding(compressed_classes=["suggestions"], compression_min_bytes=64)
+    large = {"type": "suggestions", "data": ["Sounds good, see you then."] * 4}
+    small = {"type": "suggestions", "data": ["Yes"]}
+    control = {"type": "session_resume", "token": "t" * 80, "grace_seconds": 30.0}
+
+    frame = encoding.frame([("suggestions", encoding.encode(large))])
+    assert len(frame) < len(encoding.encode(large))
+    assert encoding.decode(frame) == [large]
+    for message in (small, control):
+        encoded = encoding.encode(message)
+        assert encoding.frame([(message["type"], encoded)]) == encoded
+
+
+async def test_fan_out_sends_each_client_its_own_encoding():
+    """
+    Test a broadcast to a JSON client and a MessagePack client.
+
+    **Post-conditions:**
+    - The JSON client gets a text frame; the v3 client a binary frame
+      holding the same message.
+    """
+    encoding = MsgPackEncoding()
+    manager = ConnectionManager(msgpack_encoding=encoding)
+    json_client, msgpack_client = MagicMock(), MagicMock()
+    for client in (json_client, msgpack_client):
+        client.send_text = AsyncMock()
+        client.send_bytes = AsyncMock()
+    await manager.connect(json_client, encoding=manager.encoding_for(PROTOCOL_V2))
+    await manager.connect(msgpack_client, encoding=manager.encoding_for(PROTOCOL_V3))
+
+    assert await manager.broadcast_json({"type": "notice", "data": "hi"}) == 2
+    await asyncio.sleep(0.01)
+
+    json_client.send_text.assert_awaited_once_with('{"type": "notice", "data": "hi"}')
+    msgpack_client.send_text.assert_not_awaited()
+    frame = msgpack_client.send_bytes.await_args.args[0]
+    assert encoding.decode(frame) == JSON_ENCODING.decode(json_client.send_text.await_args.args[0])
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from signconnect.services.session_recording import (
+    AUDIO,
+    CONTROL,
+    RecordedFrame,
+    SessionRecorder,
+    read_recording,
+)
+from signconnect.tools.replay_sessions import SessionTimeline, percentile
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_recording_round_trip(tmp_path):
+    """
+    Test that recorded frames, written in the background as the buffer
+    fills and on close, are read back in order with their kind, offset and
+    payload, and that a record truncated by a crash is skipped.
+    """
+    clock = FakeClock()
+    recorder = SessionRecorder(str(tmp_path), clock=clock, flush_bytes=16)
+    recorder.audio(b"\x00\x01")
+    clock.now = 1.25
+    recorder.control(json.dumps({"type": "ping"}))  # passes flush_bytes
+    recorder.audio(b"\x02")
+    await recorder.close()
+
+    with open(recorder.path, "ab") as f:
+        f.write(b"\x01\x00")  # half a record header
+
+    frames = list(read_recording(recorder.path))
+
+    assert [(f.kind, f.offset_seconds, f.payload) for f in frames] == [
+        (AUDIO, 0.0, b"\x00\x01"),
+        (CONTROL, 1.25, b'{"type": "ping"}'),
+        (AUDIO, 1.25, b"\x02"),
+    ]
+
+
+async def test_timeline_measures_stage_latencies():
+    """
+    Test that a replayed session's traffic is turned into stage latencies.
+    """
+    samples = {}
+    timeline = SessionTimeline(samples)
+    audio = RecordedFrame(AUDIO, 0.0, b"")
+
+    timeline.sent(audio, now=0.0)
+    timeline.received({"type": "interim_transcript"}, now=0.4)
+    timeline.received({"type": "interim_transcript"}, now=0.6)
+    timeline.received({"type": "final_transcript"}, now=1.0)
+    timeline.received({"type": "suggestions"}, now=1.5)
+
+    assert samples == {
+        "first_interim": [0.4],
+        "audio_to_final": [1.0],
+        "final_to_suggestions": [0.5],
+    }
+    assert percentile([0.1, 0.2, 0.3, 0.4], 0.5) == 0.2
@@ -0,0 +1,93 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from signconnect.services.session_resume import LiveSession, ResumeRegistry
+from signconnect.services.websocket_manager import ConnectionManager
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+def _live():
+    return LiveSession({"email": "test@example.com"}, MagicMock(), MagicMock())
+
+
+def _socket():
+    websocket = MagicMock()
+    websocket.send_text = AsyncMock()
+    websocket.close = AsyncMock()
+    return websocket
+
+
+async def test_parked_session_can_be_claimed_once_with_its_latest_token():
+    """
+    Test the token lifecycle.
+
+    **Pre-conditions:**
+    - A session was issued two tokens, then parked.
+
+    **Post-conditions:**
+    - Only the latest token resumes it, exactly once, and the expiry is cancelled.
+    """
+    registry = ResumeRegistry(grace_seconds=0.05)
+    live = _live()
+    old_token = registry.issue(live)
+    token = registry.issue(live)
+    on_expire = AsyncMock()
+    registry.park(live, on_expire)
+
+    assert registry.claim(old_token) is None
+    assert registry.claim(token) is live
+    assert registry.claim(token) is None
+    assert not live.parked
+
+    await asyncio.sleep(0.1)
+    on_expire.assert_not_awaited()
+
+
+async def test_unclaimed_session_expires_after_the_grace_period():
+    """
+    Test that a parked session nobody resumes is closed.
+    """
+    registry = ResumeRegistry(grace_seconds=0.05)
+    live = _live()
+    token = registry.issue(live)
+    on_expire = AsyncMock()
+    registry.park(live, on_expire)
+
+    await asyncio.sleep(0.1)
+
+    on_expire.assert_awaited_once()
+    assert registry.claim(token) is None
+    assert len(registry) == 0
+
+
+async def test_messages_queued_while_suspended_go_to_the_new_socket():
+    """
+    Test that a resumed connection keeps its registration and outbound queue.
+
+    **Pre-conditions:**
+    - The connection is suspended and messages are sent to it.
+
+    **Post-conditions:**
+    - After rebinding, the new socket receives them; the old one nothing more.
+    """
+    manager = ConnectionManager()
+    old, new = _socket(), _socket()
+    await manager.connect(old, user_id="alice")
+    manager.suspend(old)
+
+    await manager.send_personal_json({"type": "final_transcript", "data": "hi"}, old)
+    await manager.send_to_user("alice", {"type": "notice"})
+    assert manager.rebind(old, new)
+    await asyncio.sleep(0.01)
+
+    old.send_text.assert_not_awaited()
+    assert [call.args[0] for call in new.send_text.await_args_list] == [
+        '{"type": "final_transcript", "data": "hi"}',
+        '{"type": "notice"}',
+    ]
+    assert manager.user_connections("alice") == [new]
+    assert not manager.rebind(old, new)
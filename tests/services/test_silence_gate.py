@@ -0,0 +1,88 @@
+import pytest
+from types import SimpleNamespace
+
+from signconnect.services.audio_buffer import AudioBuffer
+from signconnect.services.silence_gate import SilenceGate
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _feed(gate, clock, sizes):
+    decisions = []
+    for size in sizes:
+        decisions.append(gate.accept(b"x" * size))
+        clock.now += 1.0
+    return decisions
+
+
+async def test_gate_suppresses_silence_after_hangover():
+    """
+    Test that silence is held back until speech, and forwarded for the
+    hangover period after speech before being suppressed again.
+
+    **Post-conditions:**
+    - The suppressed fraction reflects the time suppressed.
+    """
+    clock = FakeClock()
+    gate = SilenceGate(threshold_bytes_per_second=1000, hangover_seconds=1.5, clock=clock)
+
+    decisions = _feed(gate, clock, [200, 4000, 300, 300, 300])
+
+    assert decisions == [False, True, True, False, False]
+    assert gate.suppressed_fraction == pytest.approx(3 / 5)
+
+
+async def test_gate_measures_a_backlog_by_arrival_times():
+    """
+    Test that chunks read in a burst after the consumer stalled are classified
+    by when they arrived, not by the gap between reads.
+
+    **Pre-conditions:**
+    - Silent chunks arrive one second apart but are all read at the same time.
+
+    **Post-conditions:**
+    - None of them is mistaken for speech.
+    """
+    clock = FakeClock()
+    buffer = AudioBuffer(max_bytes=10_000, max_seconds=10, clock=clock)
+    gate = SilenceGate(threshold_bytes_per_second=1000, hangover_seconds=1.5, clock=clock)
+    for _ in range(4):
+        await buffer.put(b"x" * 300)
+        clock.now += 1.0
+
+    decisions = []
+    for _ in range(4):
+        chunk = await buffer.get()
+        decisions.append(gate.accept(chunk, buffer.last_received_at))
+
+    assert decisions == [False, False, False, False]
+    assert gate.suppressed_seconds == pytest.approx(4.0)
+
+
+async def test_user_settings_override_server_defaults():
+    """
+    Test that a user's stored settings override the server's, and that a user
+    who turned gating off gets no gate.
+    """
+    settings = SimpleNamespace(
+        STT_SILENCE_GATING_ENABLED=True,
+        STT_SILENCE_THRESHOLD_BYTES_PER_SECOND=1500.0,
+        STT_SILENCE_HANGOVER_SECONDS=1.5,
+    )
+    tuned = SimpleNamespace(silence_gating_enabled=None, silence_threshold_bytes_per_second=800.0)
+    opted_out = SimpleNamespace(silence_gating_enabled=False, silence_threshold_bytes_per_second=None)
+
+    assert SilenceGate.for_user(settings).threshold_bytes_per_second == 1500.0
+    assert SilenceGate.for_user(settings, tuned).threshold_bytes_per_second == 800.0
+    assert SilenceGate.for_user(settings, opted_out) is None
@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from signconnect.services.speech_pool import SpeechClientPool
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+
+def _fake_client():
+    client = MagicMock()
+    client.transport.grpc_channel.channel_ready = AsyncMock()
+    client.transport.close = AsyncMock()
+    return client
+
+
+async def test_pool_creates_clients_once_and_shares_them():
+    """
+    Test that the pool creates its clients at startup and hands them out
+    round-robin instead of creating one per session.
+
+    **Post-conditions:**
+    - The factory is called exactly `size` times.
+    - Channels are warmed up at startup.
+    """
+    factory = MagicMock(side_effect=_fake_client)
+    pool = SpeechClientPool(size=2, client_factory=factory)
+
+    await pool.start()
+    borrowed = [pool.acquire() for _ in range(4)]
+
+    assert factory.call_count == 2
+    assert borrowed[0] is borrowed[2]
+    assert borrowed[1] is borrowed[3]
+    assert borrowed[0] is not borrowed[1]
+    borrowed[0].transport.grpc_channel.channel_ready.assert_awaited_once()
+
+
+async def test_close_closes_every_channel():
+    """
+    Test that closing the pool closes every client's transport.
+    """
+    pool = SpeechClientPool(size=2, client_factory=_fake_client)
+    await pool.start()
+    clients = [pool.acquire(), pool.acquire()]
+
+    await pool.close()
+
+    for client in clients:
+        client.transport.close.assert_awaited_once()
@@ -0,0 +1,164 @@
+import asyncio
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from signconnect.services import suggestion_pregen
+from signconnect.services.suggestion_pregen import SuggestionPregenerator
+
+
+@pytest.fixture
+def fake_question():
+    """
+    A stored scenario question with no pre-generated suggestions yet.
+    """
+    question = MagicMock()
+    question.id = uuid.uuid4()
+    question.question_text = "What would you like to order?"
+    question.user_answer_text = "A coffee, please."
+    question.precomputed_suggestions = None
+    return question
+
+
+def test_enqueue_coalesces_duplicate_ids():
+    """
+    Test that queueing the same question twice only schedules it once.
+
+    **Post-conditions:**
+    - The queue holds a single entry for the question.
+    """
+    pregenerator = SuggestionPregenerator(
+        session_factory=MagicMock(), llm_client=MagicMock(), requests_per_minute=0
+    )
+    question_id = uuid.uuid4()
+
+    pregenerator.enqueue(question_id)
+    pregenerator.enqueue(question_id)
+
+    assert pregenerator._queue.qsize() == 1
+
+
+def test_generate_stores_suggestions(monkeypatch, fake_question):
+    """
+    Test that generating a question's suggestions stores the LLM output on it.
+
+    **Post-conditions:**
+    - The LLM is called with the question text as the transcript.
+    - The suggestions are persisted through crud.set_precomputed_suggestions.
+    """
+    mock_crud = MagicMock()
+    mock_crud.get_question_for_pregeneration.return_value = fake_question
+    mock_crud.lock_question_for_pregeneration.return_value = fake_question
+    mock_crud.get_user_preferences.return_value = []
+    monkeypatch.setattr(suggestion_pregen, "crud", mock_crud)
+
+    mock_llm_client = MagicMock()
+    mock_llm_client.get_response_suggestions.return_value = ["One", "Two", "Three"]
+    pregenerator = SuggestionPregenerator(
+        session_factory=MagicMock(), llm_client=mock_llm_client, requests_per_minute=0
+    )
+
+    pregenerator._generate(fake_question.id)
+
+    assert (
+        mock_llm_client.get_response_suggestions.call_args.kwargs["transcript"]
+        == fake_question.question_text
+    )
+    mock_crud.set_precomputed_suggestions.assert_called_once()
+    assert mock_crud.set_precomputed_suggestions.call_args.kwargs["suggestions"] == [
+        "One",
+        "Two",
+        "Three",
+    ]
+
+
+def test_generate_discards_results_invalidated_mid_flight(monkeypatch, fake_question):
+    """
+    Test that suggestions are not stored when the question was re-queued
+    (edited, or its owner's preferences changed) during generation.
+
+    **Post-conditions:**
+    - crud.set_precomputed_suggestions is never called.
+    """
+    mock_crud = MagicMock()
+    mock_crud.get_question_for_pregeneration.return_value = fake_question
+    mock_crud.get_user_preferences.return_value = []
+    monkeypatch.setattr(suggestion_pregen, "crud", mock_crud)
+
+    pregenerator = SuggestionPregenerator(
+        session_factory=MagicMock(), llm_client=MagicMock(), requests_per_minute=0
+    )
+
+    def requeue_during_generation(**kwargs):
+        pregenerator.enqueue(fake_question.id)
+        return ["Stale suggestion"]
+
+    pregenerator._llm_client.get_response_suggestions.side_effect = (
+        requeue_during_generation
+    )
+
+    pregenerator._generate(fake_question.id)
+
+    mock_crud.set_precomputed_suggestions.assert_not_called()
+
+
+def test_generate_discards_results_for_a_question_edited_before_the_store(
+    monkeypatch, fake_question
+):
+    """
+    Test that suggestions are not stored over an edit committed between the
+    LLM call and the store, even before the edit's re-queue arrives.
+
+    **Pre-conditions:**
+    - The question's text changes while the LLM is generating.
+
+    **Post-conditions:**
+    - The locked re-read sees the new text, so crud.set_precomputed_suggestions
+      is never called and the cleared column stays cleared.
+    """
+    edited = MagicMock()
+    edited.question_text = "What size would you like?"
+    edited.user_answer_text = fake_question.user_answer_text
+    edited.precomputed_suggestions = None
+    mock_crud = MagicMock()
+    mock_crud.get_question_for_pregeneration.return_value = fake_question
+    mock_crud.lock_question_for_pregeneration.return_value = edited
+    mock_crud.get_user_preferences.return_value = []
+    monkeypatch.setattr(suggestion_pregen, "crud", mock_crud)
+
+    mock_llm_client = MagicMock()
+    mock_llm_client.get_response_suggestions.return_value = ["A coffee, please."]
+    pregenerator = SuggestionPregenerator(
+        session_factory=MagicMock(), llm_client=mock_llm_client, requests_per_minute=0
+    )
+
+    pregenerator._generate(fake_question.id)
+
+    mock_crud.set_precomputed_suggestions.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_from_a_threadpool_thread_wakes_the_worker(monkeypatch):
+    """
+    Test that a question queued by a sync endpoint, which runs in a
+    threadpool thread, reaches the worker waiting on the event loop.
+
+    **Post-conditions:**
+    - The worker generates the question.
+    """
+    monkeypatch.setattr(suggestion_pregen, "crud", MagicMock())
+    pregenerator = SuggestionPregenerator(
+        session_factory=MagicMock(), llm_client=MagicMock(), requests_per_minute=0
+    )
+    generated = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    monkeypatch.setattr(
+        pregenerator, "_generate", lambda question_id: loop.call_soon_threadsafe(generated.set)
+    )
+    await pregenerator.start()
+
+    await asyncio.to_thread(pregenerator.enqueue, uuid.uuid4())
+
+    await asyncio.wait_for(generated.wait(), 1)
+    await pregenerator.stop()
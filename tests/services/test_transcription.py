@@ -0,0 +1,209 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from google.cloud import speech
+
+from signconnect.services.audio_buffer import AudioBuffer
+from signconnect.services.transcription import (
+    WEBM_CLUSTER_ID,
+    TranscriptResult,
+    stream_transcripts,
+    strip_overlap,
+)
+
+# Mark all tests in this file as asynchronous
+pytestmark = pytest.mark.asyncio
+
+HEADER = b"HDR"
+FIRST_CHUNK = HEADER + WEBM_CLUSTER_ID + b"a1"
+
+
+def _response(text, is_final=True, end_seconds=0.0):
+    result = SimpleNamespace(
+        alternatives=[SimpleNamespace(transcript=text)],
+        is_final=is_final,
+        result_end_time=timedelta(seconds=end_seconds),
+    )
+    return SimpleNamespace(results=[result])
+
+
+class ScriptedClient:
+    """
+    A fake Speech client. Each call to streaming_recognize runs the next
+    script, which receives the request iterator and yields responses.
+    """
+
+    def __init__(self, *scripts):
+        self._scripts = list(scripts)
+        self.audio_sent = []
+
+    async def streaming_recognize(self, requests):
+        script = self._scripts.pop(0)
+        audio = []
+        self.audio_sent.append(audio)
+
+        async def audio_requests():
+            async for request in requests:
+                if request.audio_content:
+                    audio.append(request.audio_content)
+                    yield request.audio_content
+
+        return script(audio_requests())
+
+
+def _config():
+    return speech.StreamingRecognitionConfig(config=speech.RecognitionConfig())
+
+
+async def _collect(client, queue, **options):
+    return [result async for result in stream_transcripts(client, _config(), queue, **options)]
+
+
+async def test_strip_overlap_removes_repeated_words():
+    """
+    Test that words repeated at the start of a final are removed, ignoring
+    case and punctuation, and that unrelated text is left alone.
+    """
+    assert strip_overlap("Good morning, everyone.", "everyone how are you") == "how are you"
+    assert strip_overlap("see you later", "Nice to meet you") == "Nice to meet you"
+
+
+async def test_error_reconnects_and_replays_header_and_unfinalized_audio():
+    """
+    Test that a failed stream is replaced by a new one that first receives
+    the WebM header and then the audio the failed stream never finalized.
+
+    **Post-conditions:**
+    - The new stream's audio starts with the header, then resyncs at a cluster.
+    - Transcription continues after the failure.
+    """
+
+    async def failing(audio):
+        await audio.__anext__()
+        raise RuntimeError("stream reset")
+        yield  # pragma: no cover
+
+    async def recovered(audio):
+        async for _ in audio:
+            pass
+        yield _response("hello world")
+
+    client = ScriptedClient(failing, recovered)
+    queue = AudioBuffer(max_bytes=10_000, max_seconds=10)
+    for chunk in (FIRST_CHUNK, WEBM_CLUSTER_ID + b"a2", b"a3", None):
+        await queue.put(chunk)
+
+    results = await _collect(client, queue)
+
+    assert results == [TranscriptResult("hello world", True)]
+    assert client.audio_sent[1] == [
+        HEADER,
+        WEBM_CLUSTER_ID + b"a1",
+        WEBM_CLUSTER_ID + b"a2",
+        b"a3",
+    ]
+
+
+async def test_rotation_replays_partial_cluster_and_dedupes_final():
+    """
+    Test that a stream is rotated at the configured age and the first final of
+    the new stream does not repeat words the previous stream finalized.
+    """
+
+    queue = AudioBuffer(max_bytes=10_000, max_seconds=10)
+
+    async def first(audio):
+        async for _ in audio:
+            pass
+        yield _response("Good morning everyone", end_seconds=0.01)
+
+    async def second(audio):
+        # The user keeps talking once the new stream is open
+        await queue.put(b"a2")
+        await queue.put(None)
+        async for _ in audio:
+            pass
+        yield _response("everyone how are you")
+
+    client = ScriptedClient(first, second)
+    await queue.put(FIRST_CHUNK)
+
+    results = await _collect(client, queue, max_stream_seconds=0.05)
+
+    assert [r.text for r in results] == ["Good morning everyone", "how are you"]
+    assert client.audio_sent[0] == [FIRST_CHUNK]
+    assert client.audio_sent[1] == [HEADER, WEBM_CLUSTER_ID + b"a1", b"a2"]
+
+
+async def test_gives_up_after_consecutive_errors():
+    """
+    Test that transcription stops instead of reconnecting forever.
+    """
+
+    async def broken(audio):
+        raise RuntimeError("unavailable")
+        yield  # pragma: no cover
+
+    client = ScriptedClient(broken, broken)
+    queue = AudioBuffer(max_bytes=10_000, max_seconds=10)
+
+    results = await _collect(client, queue, max_consecutive_errors=1)
+
+    assert results == []
+
+
+class KeywordGate:
+    """A silence gate that treats chunks containing b"speech" as speech."""
+
+    def accept(self, chunk, received_at=None):
+        return b"speech" in chunk
+
+
+async def test_silence_gate_opens_stream_at_speech_and_ends_it_at_silence():
+    """
+    Test that no stream is open during silence: the first stream opens at
+    speech, including the chunk before it, and ends when silence returns.
+
+    **Post-conditions:**
+    - Exactly one stream is opened for one burst of speech.
+    - The silent chunk after the speech is not sent.
+    """
+
+    async def one_utterance(audio):
+        async for _ in audio:
+            pass
+        yield _response("hi")
+
+    client = ScriptedClient(one_utterance)
+    queue = AudioBuffer(max_bytes=10_000, max_seconds=10)
+    for chunk in (FIRST_CHUNK, WEBM_CLUSTER_ID + b"speech", b"quiet", None):
+        await queue.put(chunk)
+
+    results = await _collect(client, queue, gate=KeywordGate())
+
+    assert [r.text for r in results] == ["hi"]
+    assert client.audio_sent == [
+        [HEADER, WEBM_CLUSTER_ID + b"a1", WEBM_CLUSTER_ID + b"speech"]
+    ]
+
+
+async def test_queued_chunks_are_aggregated_up_to_the_size_cap():
+    """
+    Test that chunks already waiting in the queue are sent as one request,
+    split once a request reaches the size cap.
+    """
+
+    async def listen(audio):
+        async for _ in audio:
+            pass
+        yield _response("done")
+
+    client = ScriptedClient(listen)
+    queue = AudioBuffer(max_bytes=10_000, max_seconds=10)
+    for chunk in (FIRST_CHUNK, b"b" * 8, b"c" * 8, b"d" * 8, None):
+        await queue.put(chunk)
+
+    await _collect(client, queue, aggregate_max_bytes=len(FIRST_CHUNK) + 8)
+
+    assert client.audio_sent == [[FIRST_CHUNK + b"b" * 8, b"c" * 8 + b"d" * 8]]
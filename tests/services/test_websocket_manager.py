@@ -1,7 +1,10 @@
 import pytest
+import asyncio
 import base64
+import threading
 from unittest.mock import AsyncMock, MagicMock
-from src.signconnect.services.websocket_manager import handle_message
+from src.signconnect.services.session import ConversationSession
+from src.signconnect.services.websocket_manager import ConnectionManager, handle_message
 
 # Mark all tests in this file as asynchronous
 pytestmark = pytest.mark.asyncio
@@ -26,7 +29,7 @@ async def test_handle_message_unknown_type():
     mock_websocket = MagicMock()
     # Use AsyncMock for coroutine functions
     mock_websocket.send_json = AsyncMock()
-    mock_db = AsyncMock()
+    mock_session_factory = MagicMock()
     mock_llm_client = MagicMock()
     mock_audio_queue = MagicMock()
     mock_user = MagicMock()
@@ -39,7 +42,7 @@ async def test_handle_message_unknown_type():
         message=test_message,
         websocket=mock_websocket,
         manager=mock_manager,
-        db=mock_db,
+        session_factory=mock_session_factory,
         llm_client=mock_llm_client,
         audio_queue=mock_audio_queue,
         user=mock_user,
@@ -49,6 +52,7 @@ async def test_handle_message_unknown_type():
     mock_llm_client.get_response_suggestions.assert_not_called()
     mock_manager.send_personal_json.assert_not_called()
     mock_audio_queue.put.assert_not_called()
+    mock_session_factory.assert_not_called()
 
 
 async def test_handle_message_get_suggestions():
@@ -63,6 +67,7 @@ async def test_handle_message_get_suggestions():
     **Post-conditions:**
     - The llm_client's get_response_suggestions method is called once.
     - The connection manager's send_personal_json method is called once.
+    - The DB session opened for the message is closed again.
     """
     # Arrange: Create mocks
     mock_manager = MagicMock()
@@ -89,7 +94,7 @@ async def test_handle_message_get_suggestions():
         manager=mock_manager,
         websocket=mock_websocket,
         message=test_message,
-        db=mock_db,
+        session_factory=lambda: mock_db,
         user=mock_firebase_user,  # Pass the firebase user dict here
         llm_client=mock_llm_client,
         audio_queue=mock_audio_queue,
@@ -108,6 +113,44 @@ async def test_handle_message_get_suggestions():
         expected_response, mock_websocket
     )
     mock_audio_queue.put.assert_not_called()
+    mock_db.close.assert_called_once()
+
+
+async def test_get_suggestions_releases_the_db_connection_during_the_llm_call():
+    """
+    Test that a get_suggestions message does not hold a pooled DB
+    connection while it waits for the LLM.
+
+    **Post-conditions:**
+    - The DB transaction ends before the LLM is called.
+    - The DB session is closed once the suggestions are sent.
+    """
+    mock_manager = MagicMock()
+    mock_manager.send_personal_json = AsyncMock()
+    mock_db = MagicMock()
+    mock_db.query.return_value.filter.return_value.first.return_value = MagicMock()
+    calls = []
+    mock_db.rollback.side_effect = lambda: calls.append("rollback")
+    mock_db.close.side_effect = lambda: calls.append("close")
+    mock_llm_client = MagicMock()
+
+    def get_response_suggestions(*args, **kwargs):
+        calls.append("llm")
+        return ["Sure"]
+
+    mock_llm_client.get_response_suggestions.side_effect = get_response_suggestions
+
+    await handle_message(
+        manager=mock_manager,
+        websocket=MagicMock(),
+        message={"type": "get_suggestions", "transcript": "a test transcript"},
+        session_factory=lambda: mock_db,
+        user={"email": "test@example.com"},
+        llm_client=mock_llm_client,
+        audio_queue=MagicMock(),
+    )
+
+    assert calls == ["rollback", "llm", "close"]
 
 
 # ... (rest of the file) ...
@@ -146,7 +189,7 @@ async def test_handle_message_audio():
         manager=mock_manager,
         websocket=mock_websocket,
         message=test_message,
-        db=mock_db,
+        session_factory=lambda: mock_db,
         user=mock_firebase_user,  # 2. Pass the correct user dictionary
         llm_client=mock_llm_client,
         audio_queue=mock_audio_queue,
@@ -159,3 +202,151 @@ async def test_handle_message_audio():
     # Verify other services were not used
     mock_llm_client.get_response_suggestions.assert_not_called()
     mock_manager.send_personal_json.assert_not_called()
+
+
+async def test_handle_message_session_options_enables_server_suggestions():
+    """
+    Test that a client can opt in to server-pushed suggestions.
+
+    **Post-conditions:**
+    - The session's server_suggestions flag is set.
+    - The client receives the resulting options as an acknowledgement.
+    """
+    mock_manager = MagicMock()
+    mock_manager.send_personal_json = AsyncMock()
+    mock_websocket = MagicMock()
+    session = ConversationSession()
+
+    await handle_message(
+        manager=mock_manager,
+        websocket=mock_websocket,
+        message={"type": "session_options", "server_suggestions": True},
+        session_factory=MagicMock(),
+        user=MagicMock(),
+        llm_client=MagicMock(),
+        audio_queue=MagicMock(),
+        session=session,
+    )
+
+    assert session.server_suggestions is True
+    mock_manager.send_personal_json.assert_awaited_once_with(
+        {"type": "session_options", "server_suggestions": True}, mock_websocket
+    )
+
+
+async def test_server_suggestions_for_newer_transcript_supersede_older():
+    """
+    Test that pushing suggestions for a new final transcript cancels the
+    generation still running for the previous one.
+    """
+    session = ConversationSession(server_suggestions=True)
+    first_started = asyncio.Event()
+
+    async def slow():
+        first_started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        pass
+
+    session.start_suggestions(slow())
+    first = session._suggestion_task
+    await first_started.wait()
+    session.start_suggestions(fast())
+    await asyncio.sleep(0)
+
+    assert first.cancelled()
+    await session.close()
+
+
+async def test_prompt_cache_created_after_close_is_deleted():
+    """
+    Test that a provider-side prompt cache whose creation was still running
+    when the session closed is deleted rather than left billed until its TTL.
+
+    **Pre-conditions:**
+    - Creating the cache blocks until released.
+
+    **Post-conditions:**
+    - Once creation returns after close(), the cache is deleted and never
+      attached to the session.
+    """
+    created = threading.Event()
+    release = threading.Event()
+    cache = MagicMock()
+    llm_client = MagicMock()
+
+    def create_prompt_cache(*args):
+        created.set()
+        release.wait()
+        return cache
+
+    llm_client.create_prompt_cache.side_effect = create_prompt_cache
+    preferences = MagicMock()
+    preferences.all.return_value = ["I like dogs."]
+    session = ConversationSession(preferences=preferences, prompt_cache_min_tokens=1)
+
+    await session.ensure_prompt_cache(llm_client, MagicMock(), user_id="user")
+    await asyncio.to_thread(created.wait)
+    await session.close()
+    release.set()
+    await asyncio.sleep(0.05)
+
+    cache.delete.assert_called_once()
+    assert session.prompt_cache is None
+
+
+async def _never_completes(message):
+    await asyncio.Event().wait()
+
+
+def _socket(stalled=False):
+    websocket = MagicMock()
+    if stalled:
+        websocket.send_text = AsyncMock(side_effect=_never_completes)
+    else:
+        websocket.send_text = AsyncMock()
+    websocket.close = AsyncMock()
+    return websocket
+
+
+async def test_connection_manager_indexes_connections_by_user():
+    """
+    Test that connections are reachable by id and by user, and that removing
+    one (twice, even) leaves the others intact.
+    """
+    manager = ConnectionManager()
+    phone, laptop, other = _socket(), _socket(), _socket()
+    phone_id = await manager.connect(phone, user_id="alice")
+    await manager.connect(laptop, user_id="alice")
+    await manager.connect(other, user_id="bob")
+
+    assert manager.connection_id(phone) == phone_id
+    assert await manager.send_to_user("alice", {"type": "notice"}) == 2
+    other.send_text.assert_not_awaited()
+
+    manager.disconnect(phone)
+    manager.disconnect(phone)
+
+    assert manager.user_connections("alice") == [laptop]
+    assert len(manager) == 2
+
+
+async def test_broadcast_evicts_clients_that_are_too_slow():
+    """
+    Test that a broadcast is not held up by a stalled client: it is queued for
+    everyone, then the stalled client's writer times out and it is evicted
+    while everyone else receives the message.
+    """
+    manager = ConnectionManager(send_timeout_seconds=0.05)
+    fast, stalled = _socket(), _socket(stalled=True)
+    await manager.connect(fast)
+    await manager.connect(stalled)
+
+    queued = await manager.broadcast_json({"type": "notice"})
+    await asyncio.sleep(0.1)
+
+    assert queued == 2
+    fast.send_text.assert_awaited_once_with('{"type": "notice"}')
+    assert manager.active_connections == [fast]
+    stalled.close.assert_awaited_once()
@@ -79,3 +79,52 @@ def test_get_response_suggestions_api_error(monkeypatch):
     # Assert: Ensure it returns an empty list as designed.
     assert suggestions == []
 
+
+
+def test_prompt_sends_only_per_turn_suffix(mock_gemini_model):
+    """
+    Tests that the static instructions are not resent with every turn, so the
+    stable prefix can be reused by the provider.
+    """
+    client = GeminiClient(api_key=FAKE_API_KEY)
+
+    client.get_response_suggestions(
+        transcript="How are you?", user_preferences=["I like dogs."], conversation_history=[]
+    )
+
+    prompt = mock_gemini_model.generate_content.call_args.args[0]
+    assert "How are you?" in prompt
+    assert "I like dogs." in prompt
+    assert "You are an AI assistant" not in prompt
+
+
+def test_create_prompt_cache_skips_small_prefix(mock_gemini_model, monkeypatch):
+    """
+    Tests that no provider cache is created when the prefix is below the
+    provider's minimum cacheable size.
+    """
+    mock_create = MagicMock()
+    monkeypatch.setattr("google.generativeai.caching.CachedContent.create", mock_create)
+    client = GeminiClient(api_key=FAKE_API_KEY)
+
+    cache = client.create_prompt_cache(["I like dogs."], min_tokens=4096, ttl_seconds=60)
+
+    assert cache is None
+    mock_create.assert_not_called()
+
+
+def test_get_response_suggestions_uses_prompt_cache(mock_gemini_model):
+    """
+    Tests that a session's prompt cache model is used when provided.
+    """
+    client = GeminiClient(api_key=FAKE_API_KEY)
+    cached_model = MagicMock()
+    cached_model.generate_content.return_value.text = "Cached 1\nCached 2"
+    prompt_cache = MagicMock(model=cached_model)
+
+    suggestions = client.get_response_suggestions(
+        transcript="Hi", user_preferences=[], conversation_history=[], prompt_cache=prompt_cache
+    )
+
+    assert suggestions == ["Cached 1", "Cached 2"]
+    mock_gemini_model.generate_content.assert_not_called()
@@ -0,0 +1,98 @@
+# tests/test_stt_backends.py
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from src.signconnect.services.audio_buffer import AudioBuffer
+from src.signconnect.stt.backends import (
+    GoogleSpeechBackend,
+    ScriptedEvent,
+    SpeechBackend,
+    ScriptedSpeechBackend,
+    create_speech_backend,
+)
+from src.signconnect.stt.local import LocalSpeechBackend
+
+
+def _settings(backend):
+    return SimpleNamespace(
+        STT_BACKEND=backend,
+        STT_LANGUAGE_CODE="en-US",
+        SPEECH_CLIENT_POOL_SIZE=1,
+        STT_STREAM_MAX_SECONDS=280.0,
+        STT_REPLAY_SECONDS=10.0,
+        STT_MAX_CONSECUTIVE_ERRORS=5,
+        STT_AGGREGATE_MAX_BYTES=64 * 1024,
+        STT_AGGREGATE_MAX_DELAY_SECONDS=0.0,
+        STT_LOCAL_MODEL_PATH="/models/vosk",
+        STT_LOCAL_SAMPLE_RATE=16000,
+        STT_FAKE_TRANSCRIPT="hello there",
+        STT_FAKE_WORD_INTERVAL_SECONDS=0.01,
+    )
+
+
+def test_backend_is_selected_by_settings():
+    """
+    Test that each STT_BACKEND value creates the matching engine.
+    """
+    assert isinstance(create_speech_backend(_settings("google")), GoogleSpeechBackend)
+    assert isinstance(create_speech_backend(_settings("fake")), ScriptedSpeechBackend)
+    # Imported lazily by the factory, so compare by name rather than class
+    assert create_speech_backend(_settings("local")).name == LocalSpeechBackend.name
+    with pytest.raises(ValueError):
+        create_speech_backend(_settings("unknown"))
+
+
+def test_incomplete_backend_cannot_be_created():
+    """
+    Test that a backend without `transcribe` fails when it is created, not
+    on its first session.
+    """
+
+    class Incomplete(SpeechBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+async def test_scripted_backend_reveals_words_then_final():
+    """
+    Test that the fake engine emits word-by-word interims followed by a final,
+    once audio starts flowing.
+    """
+    backend = ScriptedSpeechBackend.from_text("hello there", word_interval_seconds=0.01, repeat=False)
+    queue = AudioBuffer(max_bytes=10_000, max_seconds=10)
+    await queue.put(b"audio")
+
+    results = [(r.text, r.is_final) async for r in backend.transcribe(queue)]
+
+    assert results == [("hello", False), ("hello there", True)]
+
+
+async def test_scripted_backend_stops_when_audio_ends():
+    """
+    Test that a repeating script stops once the connection's audio ends.
+    """
+    backend = ScriptedSpeechBackend([ScriptedEvent(0.05, "hi", True)])
+    queue = AudioBuffer(max_bytes=10_000, max_seconds=10)
+    await queue.put(b"audio")
+    await queue.put(None)
+
+    results = [r async for r in backend.transcribe(queue)]
+
+    assert results == []
+
+
+async def test_local_backend_requires_vosk(monkeypatch):
+    """
+    Test that the offline engine fails with a clear error when its optional
+    dependency is missing.
+    """
+    monkeypatch.setitem(sys.modules, "vosk", None)
+    backend = LocalSpeechBackend(model_path="/models/vosk")
+
+    with pytest.raises(RuntimeError, match="vosk"):
+        await backend.start()
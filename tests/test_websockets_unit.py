@@ -0,0 +1,54 @@
+# tests/test_websockets_unit.py
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import WebSocketDisconnect
+from pydantic import SecretStr
+
+from src.signconnect.routers.websockets import _load_test_user, _receive_frames
+
+
+def test_load_test_token_is_checked_against_the_secret():
+    """
+    Tests that only "<secret>:<n>" tokens authenticate as load-test users,
+    and that arbitrary (including non-ASCII) tokens are rejected, not errors.
+    """
+    settings = SimpleNamespace(LOAD_TEST_AUTH_TOKEN=SecretStr("secret"))
+
+    assert _load_test_user("secret:7", settings)["uid"] == "loadtest-7"
+    assert _load_test_user("wrong:7", settings) is None
+    assert _load_test_user("sécret:7", settings) is None
+    assert _load_test_user("secret:7", SimpleNamespace(LOAD_TEST_AUTH_TOKEN=None)) is None
+
+
+def _client_frames(*texts):
+    websocket = MagicMock()
+    websocket.receive = AsyncMock(
+        side_effect=[{"type": "websocket.receive", "text": text} for text in texts]
+        + [{"type": "websocket.disconnect", "code": 1000}]
+    )
+    return websocket
+
+
+@pytest.mark.asyncio
+async def test_reconnect_ack_ends_the_receive_loop_only_while_draining():
+    """
+    Tests that a reconnect_ack the server never asked for is ignored, while
+    one sent during a drain ends the connection's receive loop.
+    """
+    live = SimpleNamespace(recorder=None, audio_queue=MagicMock())
+    ack = '{"type": "reconnect_ack"}'
+
+    unsolicited = _client_frames(ack)
+    with pytest.raises(WebSocketDisconnect):
+        await _receive_frames(
+            unsolicited, live, MagicMock(), MagicMock(), SimpleNamespace(draining=False)
+        )
+
+    draining = _client_frames(ack)
+    await _receive_frames(
+        draining, live, MagicMock(), MagicMock(), SimpleNamespace(draining=True)
+    )
+    assert draining.receive.await_count == 1